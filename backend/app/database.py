@@ -3,12 +3,16 @@ Database configuration and session management
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from app.pool_metrics import MeteredAsyncAdaptedQueuePool, MeteredQueuePool
+
 # Load .env file
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path, override=True)
@@ -23,17 +27,111 @@ if not DATABASE_URL:
 else:
     print(f"✓ Using database: {DATABASE_URL.split('@')[-1] if '@' in DATABASE_URL else DATABASE_URL}")
 
+def _env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+# Engine profile; see .env.example for sizing against the PostgreSQL
+# connection limit. SQL echo is off unless DB_ECHO is set.
+DB_ECHO = _env_flag("DB_ECHO")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+# The sync engine only serves startup, scripts and the trend refresher thread
+DB_SYNC_POOL_SIZE = int(os.getenv("DB_SYNC_POOL_SIZE", "2"))
+DB_SYNC_MAX_OVERFLOW = int(os.getenv("DB_SYNC_MAX_OVERFLOW", "2"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Recycle before managed PostgreSQL / proxies drop idle connections
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Server-side statement timeout in milliseconds, 0 disables it
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+def _pool_options(pool_size: int, max_overflow: int) -> dict:
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
 # Create engine with connection pool settings
 # For SQLite, use different settings
 if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, echo=True, connect_args={"check_same_thread": False})
+    engine = create_engine(
+        DATABASE_URL,
+        echo=DB_ECHO,
+        poolclass=MeteredQueuePool,
+        connect_args={"check_same_thread": False}
+    )
 else:
-    engine = create_engine(DATABASE_URL, echo=True, pool_pre_ping=True)
+    sync_connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS:
+        sync_connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    engine = create_engine(
+        DATABASE_URL,
+        echo=DB_ECHO,
+        pool_pre_ping=True,
+        poolclass=MeteredQueuePool,
+        connect_args=sync_connect_args,
+        **_pool_options(DB_SYNC_POOL_SIZE, DB_SYNC_MAX_OVERFLOW)
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def to_async_url(url: str) -> str:
+    """
+    Map a sync DATABASE_URL onto its async driver
+
+    sqlite -> aiosqlite, postgres/postgresql -> asyncpg. asyncpg does not
+    understand libpq's sslmode query parameter, so it is passed on as ssl.
+    """
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return str(parsed.set(drivername="sqlite+aiosqlite"))
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+    return url
+
+# Request handlers use the async engine; scripts, migrations and the trend
+# refresher thread keep using the sync engine above
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+if DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, echo=DB_ECHO, poolclass=MeteredAsyncAdaptedQueuePool
+    )
+else:
+    async_connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS:
+        async_connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=DB_ECHO,
+        pool_pre_ping=True,
+        poolclass=MeteredAsyncAdaptedQueuePool,
+        connect_args=async_connect_args,
+        **_pool_options(DB_POOL_SIZE, DB_MAX_OVERFLOW)
+    )
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 Base = declarative_base()
 
+def upsert_insert(db: Session):
+    """Dialect-specific INSERT construct supporting ON CONFLICT"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert
+
 def get_db():
     """Dependency for getting database session"""
     db = SessionLocal()
@@ -41,3 +139,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
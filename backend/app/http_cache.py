@@ -0,0 +1,103 @@
+"""
+Conditional GET support for read-mostly endpoints
+
+conditional_get(...) is a route dependency that derives an ETag and
+Last-Modified from the change counters of the tables an endpoint reads
+(see app/services/table_versions.py). A request whose If-None-Match (or
+If-Modified-Since) still matches is answered 304 before the endpoint runs.
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.services.skill_catalog import observe_skill_catalog_version
+from app.services.table_versions import load_table_versions
+
+# How long browsers and shared caches (CDNs) may reuse public responses
+# before revalidating them
+HTTP_CACHE_MAX_AGE_SECONDS = int(os.getenv("HTTP_CACHE_MAX_AGE_SECONDS", "60"))
+HTTP_CACHE_SHARED_MAX_AGE_SECONDS = int(os.getenv("HTTP_CACHE_SHARED_MAX_AGE_SECONDS", "300"))
+# Changes with each deploy, so responses cached under an older response shape are not reused
+ETAG_SALT = os.getenv("HTTP_CACHE_ETAG_SALT") or os.getenv("RENDER_GIT_COMMIT", "")
+
+PUBLIC = "public"
+PRIVATE = "private"
+
+def cache_control(visibility: str) -> str:
+    """Cache-Control for public (shared) or private (per-user) responses"""
+    if visibility == PUBLIC:
+        return (
+            f"public, max-age={HTTP_CACHE_MAX_AGE_SECONDS}, s-maxage={HTTP_CACHE_SHARED_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={HTTP_CACHE_MAX_AGE_SECONDS}"
+        )
+    # Per-user data: browsers keep it but revalidate every time, CDNs do not store it
+    return "private, no-cache"
+
+def compute_etag(request: Request, versions: Dict[str, int]) -> str:
+    """Weak ETag over the request path, query string and table versions"""
+    raw = "|".join([
+        ETAG_SALT,
+        request.url.path,
+        "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items())),
+        ",".join(f"{name}:{version}" for name, version in sorted(versions.items())),
+    ])
+    return f'W/"{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]}"'
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison: W/ prefixes are ignored on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+def _not_modified_since(if_modified_since: str, last_modified: Optional[datetime]) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since is None or since.tzinfo is None:
+        return False
+    # HTTP dates have one-second resolution
+    return int(last_modified.timestamp()) <= int(since.timestamp())
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Whether the request's validators still match; If-None-Match takes precedence"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        return _not_modified_since(if_modified_since, last_modified)
+    return False
+
+def conditional_get(*table_names: str, visibility: str = PUBLIC):
+    """
+    Route dependency adding validators and Cache-Control to a GET endpoint
+
+    Usage: @router.get("/", dependencies=[conditional_get("skills")])
+    The table names must cover every table the endpoint's response reads.
+    """
+    async def check(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+        versions, last_modified = await db.run_sync(load_table_versions, table_names)
+        if "skills" in versions:
+            # A new ETag must not be sent with a body from an older catalog
+            observe_skill_catalog_version(versions["skills"])
+        headers = {
+            "ETag": compute_etag(request, versions),
+            "Cache-Control": cache_control(visibility),
+        }
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+        if is_not_modified(request, headers["ETag"], last_modified):
+            # Ends the request before the endpoint (and its query) runs
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return Depends(check)
@@ -0,0 +1,81 @@
+"""
+Versioned schema migrations
+
+Base.metadata.create_all only creates missing tables, so changes to tables
+that already exist (new indexes, backfills) are shipped as numbered
+migrations. Each one runs once, in order, inside its own transaction and is
+recorded in the schema_migrations table. Migrations must be idempotent:
+on a fresh database create_all has already built the latest schema.
+
+A migration spells out its own DDL and data changes instead of importing
+models or services, which keep changing; replayed later, it still does
+what it did when it was written.
+"""
+
+import os
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import func
+
+from app.migrations import (
+    m0001_skill_trends_unique_date,
+    m0002_backfill_profile_skills,
+    m0003_hot_filter_indexes,
+)
+
+MIGRATIONS = [
+    (1, "skill_trends_unique_date", m0001_skill_trends_unique_date.upgrade),
+    (2, "backfill_profile_skills", m0002_backfill_profile_skills.upgrade),
+    (3, "hot_filter_indexes", m0003_hot_filter_indexes.upgrade),
+]
+
+# Arbitrary key serializing migration runs across workers on PostgreSQL
+MIGRATION_LOCK_KEY = 724_310_001
+# Index builds and backfills outlast DB_STATEMENT_TIMEOUT_MS, and so may the
+# wait for another worker's migrations; 0 disables the timeout
+MIGRATION_STATEMENT_TIMEOUT_MS = int(os.getenv("MIGRATION_STATEMENT_TIMEOUT_MS", "0"))
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Apply pending migrations
+
+    Returns:
+        Number of migrations applied
+    """
+    _metadata.create_all(bind=engine)
+    is_postgres = engine.dialect.name == "postgresql"
+
+    applied_count = 0
+    with engine.connect() as lock_conn:
+        if is_postgres:
+            # Several workers start at once; only one applies migrations. The
+            # timeout is reset when the lock is released and this transaction commits
+            lock_conn.execute(text("SET LOCAL statement_timeout = 0"))
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            with engine.connect() as conn:
+                applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+            for version, name, upgrade in MIGRATIONS:
+                if version in applied:
+                    continue
+                with engine.begin() as conn:
+                    if is_postgres:
+                        conn.execute(text(f"SET LOCAL statement_timeout = {MIGRATION_STATEMENT_TIMEOUT_MS}"))
+                    upgrade(conn)
+                    conn.execute(schema_migrations.insert().values(version=version, name=name))
+                print(f"  ✓ Applied migration {version:04d}_{name}")
+                applied_count += 1
+        finally:
+            if is_postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+                lock_conn.commit()
+    return applied_count
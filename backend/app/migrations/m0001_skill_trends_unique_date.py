@@ -0,0 +1,11 @@
+"""
+Unique (skill_id, date) index on skill_trends, required by trend upserts
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+def upgrade(conn: Connection):
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_skill_trends_skill_id_date ON skill_trends (skill_id, date)"
+    ))
@@ -0,0 +1,56 @@
+"""
+Backfill profile_skills from the JSON current_skills column
+
+Names are matched to the catalog case-insensitively, as sync_profile_skills
+did when this migration was written.
+"""
+
+from sqlalchemy import JSON, Integer, String, column, delete, insert, select, table, text
+from sqlalchemy.engine import Connection
+
+BATCH_SIZE = 1000
+
+skills = table("skills", column("id", Integer), column("name", String))
+user_profiles = table("user_profiles", column("id", Integer), column("current_skills", JSON))
+profile_skills = table("profile_skills", column("profile_id", Integer), column("skill_id", Integer))
+
+def _normalize(name):
+    if not isinstance(name, str) or not name.strip():
+        return None
+    return name.strip().lower()
+
+def upgrade(conn: Connection):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS profile_skills ("
+        " profile_id INTEGER NOT NULL REFERENCES user_profiles (id) ON DELETE CASCADE,"
+        " skill_id INTEGER NOT NULL REFERENCES skills (id) ON DELETE CASCADE,"
+        " PRIMARY KEY (profile_id, skill_id))"
+    ))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_profile_skills_skill_id ON profile_skills (skill_id)"))
+
+    catalog = {_normalize(name): skill_id for skill_id, name in conn.execute(select(skills.c.id, skills.c.name))}
+    written = 0
+    last_id = 0
+    while True:
+        batch = conn.execute(
+            select(user_profiles.c.id, user_profiles.c.current_skills)
+            .where(user_profiles.c.id > last_id)
+            .order_by(user_profiles.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+
+        profile_ids = [profile_id for profile_id, _ in batch]
+        rows = [
+            {"profile_id": profile_id, "skill_id": skill_id}
+            for profile_id, skill_names in batch
+            for skill_id in {catalog.get(_normalize(name)) for name in (skill_names or [])} - {None}
+        ]
+        conn.execute(delete(profile_skills).where(profile_skills.c.profile_id.in_(profile_ids)))
+        if rows:
+            conn.execute(insert(profile_skills), rows)
+
+        written += len(rows)
+        last_id = profile_ids[-1]
+    print(f"    linked {written} profile skills")
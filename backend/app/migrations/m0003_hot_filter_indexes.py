@@ -0,0 +1,20 @@
+"""
+Secondary indexes for the filters and orderings used by the routers
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_skills_domain_future_demand ON skills (domain, future_demand_score DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_skills_trend_status_future_demand ON skills (trend_status, future_demand_score DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_skills_future_demand ON skills (future_demand_score DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_user_profiles_user_id ON user_profiles (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_skill_gaps_profile_id ON skill_gaps (profile_id)",
+    "CREATE INDEX IF NOT EXISTS ix_roadmaps_user_id_id ON roadmaps (user_id, id)",
+    "CREATE INDEX IF NOT EXISTS ix_curricula_institution_id_id ON curricula (institution_id, id)",
+]
+
+def upgrade(conn: Connection):
+    for statement in INDEXES:
+        conn.execute(text(statement))
@@ -2,8 +2,8 @@
 Database models for SGIP
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON, Boolean, Index
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -27,8 +27,8 @@ class UserProfile(Base):
     __tablename__ = "user_profiles"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    resume_text = Column(Text)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    resume_text = deferred(Column(Text))  # large; only written, never listed
     resume_file_path = Column(String)
     domain = Column(String)  # AI, Healthcare, FinTech, etc.
     current_skills = Column(JSON)  # List of skills
@@ -38,6 +38,7 @@ class UserProfile(Base):
     # Relationships
     user = relationship("User", back_populates="profiles")
     skill_gaps = relationship("SkillGap", back_populates="profile", cascade="all, delete-orphan")
+    profile_skills = relationship("ProfileSkill", cascade="all, delete-orphan")
 
 class Skill(Base):
     __tablename__ = "skills"
@@ -62,11 +63,24 @@ class Skill(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+# Access paths for the skill filters used by the routers: domain listings and
+# /trending order by future demand, dashboards filter on trend status
+Index("ix_skills_domain_future_demand", Skill.domain, Skill.future_demand_score.desc())
+Index("ix_skills_trend_status_future_demand", Skill.trend_status, Skill.future_demand_score.desc())
+Index("ix_skills_future_demand", Skill.future_demand_score.desc())
+
+class ProfileSkill(Base):
+    """Catalog skills held by a profile; the supply side of demand-vs-supply"""
+    __tablename__ = "profile_skills"
+    
+    profile_id = Column(Integer, ForeignKey("user_profiles.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True, index=True)
+
 class SkillGap(Base):
     __tablename__ = "skill_gaps"
     
     id = Column(Integer, primary_key=True, index=True)
-    profile_id = Column(Integer, ForeignKey("user_profiles.id"), nullable=False)
+    profile_id = Column(Integer, ForeignKey("user_profiles.id"), nullable=False, index=True)
     skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False)
     gap_score = Column(Float)  # 0-1, higher = bigger gap
     priority = Column(String)  # high, medium, low
@@ -89,6 +103,11 @@ class Roadmap(Base):
     
     # Relationships
     user = relationship("User", back_populates="roadmaps")
+    
+    __table_args__ = (
+        # Per-user listing in id order
+        Index("ix_roadmaps_user_id_id", "user_id", "id"),
+    )
 
 class Curriculum(Base):
     __tablename__ = "curricula"
@@ -97,7 +116,7 @@ class Curriculum(Base):
     institution_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
     program = Column(String)  # B.Tech, M.Tech, etc.
-    curriculum_text = Column(Text)
+    curriculum_text = deferred(Column(Text))  # large; only written, never listed
     curriculum_file_path = Column(String)
     extracted_skills = Column(JSON)
     alignment_score = Column(Float)  # 0-1, how aligned with industry
@@ -105,6 +124,11 @@ class Curriculum(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    __table_args__ = (
+        # Per-institution listing in id order
+        Index("ix_curricula_institution_id_id", "institution_id", "id"),
+    )
 
 class SkillTrend(Base):
     __tablename__ = "skill_trends"
@@ -117,3 +141,57 @@ class SkillTrend(Base):
     demand_score = Column(Float)
     
     skill = relationship("Skill")
+    
+    __table_args__ = (
+        # One point per skill per date; also serves per-skill date range scans
+        Index("ix_skill_trends_skill_id_date", "skill_id", "date", unique=True),
+    )
+
+class AnalyticsSnapshot(Base):
+    """Precomputed dashboard payload; see app/services/analytics_snapshots.py"""
+    __tablename__ = "analytics_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # skill_heatmap, trend_growth, employability_readiness, institution_readiness
+    scope = Column(String, nullable=False)  # domain, user or institution id, or "all"
+    payload = Column(JSON)
+    dirty = Column(Boolean, nullable=False, default=False)
+    version = Column(Integer, nullable=False, default=0)  # bumped by every invalidation
+    computed_at = Column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        # One row per dashboard view; the refresher scans dirty rows
+        Index("ix_analytics_snapshots_kind_scope", "kind", "scope", unique=True),
+        Index("ix_analytics_snapshots_dirty", "dirty"),
+    )
+
+class TableVersion(Base):
+    """Change counter per table, bumped by each committed write; drives HTTP ETags"""
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True))
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    kind = Column(String, nullable=False)  # resume_upload, gap_analysis, roadmap, curriculum_upload
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    payload = Column(JSON)
+    result = Column(JSON)
+    error = Column(Text)
+    progress = Column(Integer, default=0)  # 0-100
+    progress_message = Column(String)
+    attempts = Column(Integer, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Workers claim the oldest queued job
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
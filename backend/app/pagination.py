@@ -0,0 +1,63 @@
+"""
+Keyset pagination and field projection for list endpoints
+
+List endpoints page through rows in id order: the client passes the id of
+the last item it has as ?cursor= and reads the next cursor from the
+X-Next-Cursor response header (absent on the last page). ?fields= selects
+the columns to return, so listings can leave out large JSON columns; only
+the requested columns are read from the database.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> List[str]:
+    """
+    Requested response fields, validated against the schema
+
+    All of the schema's fields when none are requested; id is always included.
+    """
+    allowed = list(schema.model_fields)
+    if not fields:
+        return allowed
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed)}"
+        )
+    return ["id", *(name for name in requested if name != "id")]
+
+async def keyset_page(
+    db: AsyncSession,
+    model,
+    fields: Sequence[str],
+    filters: Sequence[Any],
+    cursor: Optional[int],
+    limit: int,
+    response: Response
+) -> List[Dict[str, Any]]:
+    """
+    One page of model rows after cursor, in id order, as dicts of the given fields
+
+    Reads one row past the page to tell whether another page follows, and
+    sets X-Next-Cursor when it does. filters should match an index that
+    ends in id, e.g. (user_id, id).
+    """
+    query = select(*(getattr(model, name) for name in fields)).where(*filters)
+    if cursor is not None:
+        query = query.where(model.id > cursor)
+    rows = (await db.execute(query.order_by(model.id).limit(limit + 1))).all()
+    page = [dict(row._mapping) for row in rows[:limit]]
+    if len(rows) > limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(page[-1]["id"])
+    return page
@@ -0,0 +1,95 @@
+"""
+Connection pool instrumentation
+
+QueuePool subclasses that time every checkout and count the ones that had to
+wait for a connection, so pool pressure can be watched from /metrics.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class PoolMetrics:
+    """Thread-safe checkout counters for one pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_checkout_ms = 0.0
+        self.max_checkout_ms = 0.0
+
+    def record(self, elapsed_ms: float, waited: bool, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.waits += waited
+            self.total_checkout_ms += elapsed_ms
+            self.max_checkout_ms = max(self.max_checkout_ms, elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "avg_checkout_ms": round(self.total_checkout_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_checkout_ms": round(self.max_checkout_ms, 3),
+            }
+
+class _MeteredPoolMixin:
+    """Times QueuePool._do_get; a checkout waited if no idle or overflow slot was free"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self._metered_max_overflow = kwargs.get("max_overflow", 10)
+
+    def _do_get(self):
+        saturated = (
+            self.checkedin() == 0
+            and self._metered_max_overflow > -1
+            and self.overflow() >= self._metered_max_overflow
+        )
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(0.0, saturated, timed_out=True)
+            raise
+        self.metrics.record((time.perf_counter() - started) * 1000, saturated)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            "max_overflow": self._metered_max_overflow,
+            **self.metrics.snapshot(),
+        }
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+class MeteredAsyncAdaptedQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Pool gauges and checkout counters for a sync or async engine"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    if isinstance(pool, _MeteredPoolMixin):
+        return pool.stats()
+    return {"status": pool.status()}
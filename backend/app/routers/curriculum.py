@@ -2,84 +2,42 @@
 Curriculum router - Institution curriculum analysis and alignment
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List
-import io
-import PyPDF2
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional, Tuple
 
-from app.database import get_db
-from app.models import Curriculum, Skill
-from app.schemas import CurriculumCreate, CurriculumResponse
+from app.database import get_async_db
+from app.http_cache import PRIVATE, conditional_get
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, parse_fields
+from app.models import Curriculum
+from app.schemas import CurriculumCreate, CurriculumListItem, CurriculumResponse
 # Authentication removed for now
-from app.services.ai_service import AIService
-from app.services.trends_service import TrendsService
+from app.services.registry import get_ai_service
+from app.services.document_service import extract_upload_text
+from app.services.skill_catalog import SkillCatalog, get_skill_catalog_async
+from app.services.job_queue import enqueue_job, job_accepted_response, register_job_handler
 
 router = APIRouter()
-trends_service = TrendsService()
 
-# Lazy initialization of AI service
-_ai_service = None
+def market_skill_names(catalog: SkillCatalog) -> Tuple[List[str], List[str]]:
+    """Top in-demand industry skills and top future skills, by future demand"""
+    industry = catalog.ranked(trend_statuses=["high-growth", "saturated"], limit=30)
+    future = catalog.ranked(trend_statuses=["emerging", "high-growth"], limit=20)
+    return [skill.name for skill in industry], [skill.name for skill in future]
 
-def get_ai_service():
-    """Get or create AI service instance"""
-    global _ai_service
-    if _ai_service is None:
-        _ai_service = AIService()
-    return _ai_service
-
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file"""
-    try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
-
-@router.post("/upload", response_model=CurriculumResponse)
-async def upload_curriculum(
-    name: str,
-    program: str = None,
-    file: UploadFile = File(None),
-    curriculum_text: str = None,
-    db: Session = Depends(get_db)
-):
-    """Upload curriculum for analysis"""
-    
-    # Get curriculum text
-    if file:
-        file_content = await file.read()
-        if file.filename.endswith('.pdf'):
-            text = extract_text_from_pdf(file_content)
-        else:
-            text = file_content.decode('utf-8')
-    elif curriculum_text:
-        text = curriculum_text
-    else:
-        raise HTTPException(status_code=400, detail="Either file or curriculum_text must be provided")
-    
+async def create_curriculum(db: AsyncSession, name: str, program: str, text: str) -> Curriculum:
+    """Extract skills from curriculum text, generate recommendations and save it"""
     # Extract skills from curriculum
     ai_service = get_ai_service()
-    extracted_skills = ai_service.extract_skills_from_curriculum(text)
+    extracted_skills = await ai_service.extract_skills_from_curriculum_async(text)
     
     # Get industry and future skills for comparison
-    industry_skills = db.query(Skill).filter(
-        Skill.trend_status.in_(["high-growth", "saturated"])
-    ).limit(30).all()
-    industry_skill_names = [s.name for s in industry_skills]
-    
-    future_skills = db.query(Skill).filter(
-        Skill.trend_status.in_(["emerging", "high-growth"])
-    ).limit(20).all()
-    future_skill_names = [s.name for s in future_skills]
+    industry_skill_names, future_skill_names = market_skill_names(await get_skill_catalog_async())
     
     # Generate recommendations
     ai_service = get_ai_service()
-    recommendations = ai_service.generate_curriculum_recommendations(
+    recommendations = await ai_service.generate_curriculum_recommendations_async(
         current_curriculum_skills=extracted_skills,
         industry_skills=industry_skill_names,
         future_skills=future_skill_names
@@ -97,31 +55,82 @@ async def upload_curriculum(
         recommendations=recommendations
     )
     db.add(curriculum)
-    db.commit()
-    db.refresh(curriculum)
+    await db.commit()
+    await db.refresh(curriculum)
     
     return curriculum
 
-@router.get("/", response_model=List[CurriculumResponse])
+@register_job_handler("curriculum_upload")
+async def run_curriculum_upload_job(db: AsyncSession, payload: dict, report) -> dict:
+    await report(10, "Analyzing curriculum")
+    curriculum = await create_curriculum(db, **payload)
+    return CurriculumResponse.model_validate(curriculum).model_dump(mode="json")
+
+@router.post("/upload", response_model=CurriculumResponse)
+async def upload_curriculum(
+    name: str,
+    program: str = None,
+    file: UploadFile = File(None),
+    curriculum_text: str = None,
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Upload curriculum for analysis
+    
+    With background=true the AI analysis runs as a job and a 202 with the
+    job id is returned immediately.
+    """
+    
+    # Get curriculum text
+    if file:
+        text = await extract_upload_text(file)
+    elif curriculum_text:
+        text = curriculum_text
+    else:
+        raise HTTPException(status_code=400, detail="Either file or curriculum_text must be provided")
+    
+    if background:
+        job = await enqueue_job(db, "curriculum_upload", {"name": name, "program": program, "text": text})
+        return job_accepted_response(job)
+    
+    return await create_curriculum(db, name, program, text)
+
+@router.get(
+    "/", response_model=List[CurriculumListItem], response_model_exclude_unset=True,
+    dependencies=[conditional_get("curricula", visibility=PRIVATE)]
+)
 async def get_institution_curricula(
-    db: Session = Depends(get_db)
+    response: Response,
+    cursor: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all curricula"""
+    """
+    Get curricula, one keyset page at a time
+
+    Pass the X-Next-Cursor header of a page as ?cursor= to get the next one;
+    ?fields=id,name,... returns only those fields (e.g. without
+    recommendations). curriculum_text is never read.
+    """
     default_user_id = 1
-    curricula = db.query(Curriculum).filter(Curriculum.institution_id == default_user_id).all()
-    return curricula
+    return await keyset_page(
+        db, Curriculum, parse_fields(fields, CurriculumListItem),
+        [Curriculum.institution_id == default_user_id], cursor, limit, response
+    )
 
-@router.get("/{curriculum_id}", response_model=CurriculumResponse)
+@router.get("/{curriculum_id}", response_model=CurriculumResponse, dependencies=[conditional_get("curricula", visibility=PRIVATE)])
 async def get_curriculum(
     curriculum_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get specific curriculum by ID"""
     default_user_id = 1
-    curriculum = db.query(Curriculum).filter(
+    curriculum = (await db.execute(select(Curriculum).where(
         Curriculum.id == curriculum_id,
         Curriculum.institution_id == default_user_id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not curriculum:
         raise HTTPException(status_code=404, detail="Curriculum not found")
@@ -131,32 +140,24 @@ async def get_curriculum(
 @router.post("/{curriculum_id}/analyze")
 async def analyze_curriculum(
     curriculum_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Re-analyze curriculum with latest market data"""
     default_user_id = 1
-    curriculum = db.query(Curriculum).filter(
+    curriculum = (await db.execute(select(Curriculum).where(
         Curriculum.id == curriculum_id,
         Curriculum.institution_id == default_user_id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not curriculum:
         raise HTTPException(status_code=404, detail="Curriculum not found")
     
     # Get latest industry and future skills
-    industry_skills = db.query(Skill).filter(
-        Skill.trend_status.in_(["high-growth", "saturated"])
-    ).limit(30).all()
-    industry_skill_names = [s.name for s in industry_skills]
-    
-    future_skills = db.query(Skill).filter(
-        Skill.trend_status.in_(["emerging", "high-growth"])
-    ).limit(20).all()
-    future_skill_names = [s.name for s in future_skills]
+    industry_skill_names, future_skill_names = market_skill_names(await get_skill_catalog_async())
     
     # Regenerate recommendations
     ai_service = get_ai_service()
-    recommendations = ai_service.generate_curriculum_recommendations(
+    recommendations = await ai_service.generate_curriculum_recommendations_async(
         current_curriculum_skills=curriculum.extracted_skills or [],
         industry_skills=industry_skill_names,
         future_skills=future_skill_names
@@ -165,7 +166,7 @@ async def analyze_curriculum(
     # Update curriculum
     curriculum.alignment_score = recommendations.get("alignment_score", 0.0)
     curriculum.recommendations = recommendations
-    db.commit()
-    db.refresh(curriculum)
+    await db.commit()
+    await db.refresh(curriculum)
     
     return curriculum
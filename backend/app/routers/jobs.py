@@ -0,0 +1,76 @@
+"""
+Jobs router - Status of background AI analyses
+"""
+
+import asyncio
+import json
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal, get_async_db
+from app.schemas import JobResponse
+from app.services.job_queue import TERMINAL_STATUSES, get_job, job_to_dict
+
+router = APIRouter()
+
+JOB_EVENTS_POLL_SECONDS = float(os.getenv("JOB_EVENTS_POLL_SECONDS", "1"))
+# Comment lines keep proxies from closing an idle event stream
+JOB_EVENTS_HEARTBEAT_SECONDS = 15
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job_status(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a job's status, progress and, once finished, its result"""
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """
+    Stream a job's progress as Server-Sent Events
+
+    Emits a progress event whenever status or progress changes and a final
+    done event carrying the result or error, then closes the stream.
+    """
+    async with AsyncSessionLocal() as db:
+        if not await get_job(db, job_id):
+            raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last_state = None
+        idle_seconds = 0.0
+        while not await request.is_disconnected():
+            async with AsyncSessionLocal() as db:
+                job = await get_job(db, job_id)
+            if job is None:
+                return
+            state = job_to_dict(job)
+            if state["status"] in TERMINAL_STATUSES:
+                yield _sse("done", state)
+                return
+            if (state["status"], state["progress"], state["progress_message"]) != last_state:
+                last_state = (state["status"], state["progress"], state["progress_message"])
+                idle_seconds = 0.0
+                yield _sse("progress", {key: value for key, value in state.items() if key != "result"})
+            elif idle_seconds >= JOB_EVENTS_HEARTBEAT_SECONDS:
+                idle_seconds = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+            idle_seconds += JOB_EVENTS_POLL_SECONDS
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
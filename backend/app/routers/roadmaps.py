@@ -2,42 +2,33 @@
 Roadmaps router - Personalized learning roadmap generation
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional
 
-from app.database import get_db
+from app.database import get_async_db
+from app.http_cache import PRIVATE, conditional_get
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, parse_fields
 from app.models import UserProfile, Roadmap
-from app.schemas import RoadmapCreate, RoadmapResponse
+from app.schemas import RoadmapCreate, RoadmapListItem, RoadmapResponse
 # Authentication removed for now
-from app.services.ai_service import AIService
+from app.services.registry import get_ai_service
+from app.services.job_queue import enqueue_job, job_accepted_response, register_job_handler
 
 router = APIRouter()
 
-# Lazy initialization of AI service
-_ai_service = None
-
-def get_ai_service():
-    """Get or create AI service instance"""
-    global _ai_service
-    if _ai_service is None:
-        _ai_service = AIService()
-    return _ai_service
-
-@router.post("/generate", response_model=RoadmapResponse)
-async def generate_roadmap(
-    roadmap_data: RoadmapCreate,
-    db: Session = Depends(get_db)
-):
-    """Generate personalized learning roadmap"""
+async def create_roadmap(db: AsyncSession, roadmap_data: RoadmapCreate) -> Roadmap:
+    """Generate a roadmap with AI and save it for the default user"""
     # Get user profile (using default user_id for now)
     default_user_id = 1
-    profile = db.query(UserProfile).filter(UserProfile.user_id == default_user_id).first()
-    current_skills = profile.current_skills if profile else []
+    current_skills = (await db.execute(
+        select(UserProfile.current_skills).where(UserProfile.user_id == default_user_id).limit(1)
+    )).scalar_one_or_none() or []
     
     # Generate roadmap using AI
     ai_service = get_ai_service()
-    roadmap_content = ai_service.generate_skill_roadmap(
+    roadmap_content = await ai_service.generate_skill_roadmap_async(
         current_skills=current_skills,
         target_role=roadmap_data.target_role,
         timeline_months=roadmap_data.target_timeline_months,
@@ -53,31 +44,63 @@ async def generate_roadmap(
         roadmap_data=roadmap_content
     )
     db.add(roadmap)
-    db.commit()
-    db.refresh(roadmap)
+    await db.commit()
+    await db.refresh(roadmap)
     
     return roadmap
 
-@router.get("/", response_model=List[RoadmapResponse])
+@register_job_handler("roadmap")
+async def run_roadmap_job(db: AsyncSession, payload: dict, report) -> dict:
+    await report(10, "Generating roadmap")
+    roadmap = await create_roadmap(db, RoadmapCreate(**payload))
+    return RoadmapResponse.model_validate(roadmap).model_dump(mode="json")
+
+@router.post("/generate", response_model=RoadmapResponse)
+async def generate_roadmap(
+    roadmap_data: RoadmapCreate,
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Generate personalized learning roadmap; with background=true returns a job id (202)"""
+    if background:
+        job = await enqueue_job(db, "roadmap", roadmap_data.model_dump())
+        return job_accepted_response(job)
+    return await create_roadmap(db, roadmap_data)
+
+@router.get(
+    "/", response_model=List[RoadmapListItem], response_model_exclude_unset=True,
+    dependencies=[conditional_get("roadmaps", visibility=PRIVATE)]
+)
 async def get_user_roadmaps(
-    db: Session = Depends(get_db)
+    response: Response,
+    cursor: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all roadmaps"""
+    """
+    Get roadmaps, one keyset page at a time
+
+    Pass the X-Next-Cursor header of a page as ?cursor= to get the next one;
+    ?fields=id,title,... returns only those fields (e.g. without roadmap_data).
+    """
     default_user_id = 1
-    roadmaps = db.query(Roadmap).filter(Roadmap.user_id == default_user_id).all()
-    return roadmaps
+    return await keyset_page(
+        db, Roadmap, parse_fields(fields, RoadmapListItem),
+        [Roadmap.user_id == default_user_id], cursor, limit, response
+    )
 
-@router.get("/{roadmap_id}", response_model=RoadmapResponse)
+@router.get("/{roadmap_id}", response_model=RoadmapResponse, dependencies=[conditional_get("roadmaps", visibility=PRIVATE)])
 async def get_roadmap(
     roadmap_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get specific roadmap by ID"""
     default_user_id = 1
-    roadmap = db.query(Roadmap).filter(
+    roadmap = (await db.execute(select(Roadmap).where(
         Roadmap.id == roadmap_id,
         Roadmap.user_id == default_user_id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not roadmap:
         raise HTTPException(status_code=404, detail="Roadmap not found")
@@ -3,71 +3,53 @@ Skills router - Skill gap analysis and skill management
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import datetime, timedelta, timezone
 from typing import List
-import PyPDF2
-import io
+import time
+import numpy as np
 
-from app.database import get_db
-from app.models import UserProfile, Skill, SkillGap
+from app.database import get_async_db
+from app.http_cache import conditional_get
+from app.models import UserProfile
 from app.schemas import (
-    ProfileCreate, ProfileResponse, SkillGapAnalysisResponse,
-    SkillGapResponse, SkillResponse
+    BulkResumeUploadResponse, GapReanalysisRequest, GapReanalysisResponse, ProfileCreate,
+    ProfileResponse, SkillGapAnalysisResponse, SkillResponse
 )
 # Authentication removed for now
-from app.services.ai_service import AIService
-from app.services.trends_service import TrendsService
+from app.services.registry import get_ai_service
+from app.services.bulk_resumes import ingest_resumes
+from app.services.document_service import extract_upload_text, extract_upload_texts
+from app.services.job_queue import enqueue_job, job_accepted_response, register_job_handler
+from app.services.trends_service import growth_rate
+from app.services.trend_refresh import trend_refresher, is_stale
+from app.services.trend_store import load_series
+from app.services.forecasting import FORECAST_HISTORY_DAYS, HORIZONS, forecast_one
+from app.services.profile_skills import sync_profile_skills, profile_skill_names
+from app.services.skill_catalog import get_skill_catalog_async
+from app.services.skill_gaps import (
+    merge_current_skills, reanalyze_skill_gaps, required_skills_for_domains, save_skill_gaps
+)
 
 router = APIRouter()
-trends_service = TrendsService()
-
-# Lazy initialization of AI service to avoid errors if .env is not loaded yet
-_ai_service = None
-
-def get_ai_service():
-    """Get or create AI service instance"""
-    global _ai_service
-    if _ai_service is None:
-        _ai_service = AIService()
-    return _ai_service
-
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file"""
-    try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
 
-@router.post("/upload-resume", response_model=ProfileResponse)
-async def upload_resume(
-    file: UploadFile = File(...),
+async def process_resume(
+    db: AsyncSession,
+    resume_text: str,
     domain: str = None,
-    target_role: str = None,
-    db: Session = Depends(get_db)
-):
-    """Upload resume and extract skills"""
-    
-    # Read file content
-    file_content = await file.read()
-    
-    # Extract text
-    if file.filename.endswith('.pdf'):
-        resume_text = extract_text_from_pdf(file_content)
-    else:
-        resume_text = file_content.decode('utf-8')
-    
+    target_role: str = None
+) -> UserProfile:
+    """Extract skills from resume text and store them on the default profile"""
     # Extract skills using AI
     ai_service = get_ai_service()
-    extracted_skills = ai_service.extract_skills_from_resume(resume_text)
+    extracted_skills = await ai_service.extract_skills_from_resume_async(resume_text)
     
     # Get or create user profile (using default user_id since auth is disabled)
     default_user_id = 1
-    profile = db.query(UserProfile).filter(UserProfile.user_id == default_user_id).first()
+    profile = (await db.execute(
+        select(UserProfile).where(UserProfile.user_id == default_user_id).limit(1)
+    )).scalar_one_or_none()
     if not profile:
         profile = UserProfile(
             user_id=default_user_id,
@@ -83,37 +65,97 @@ async def upload_resume(
         profile.target_role = target_role
         profile.current_skills = extracted_skills
     
-    db.commit()
-    db.refresh(profile)
+    # Keep the supply index in step with the profile's skills
+    await db.flush()
+    catalog = await get_skill_catalog_async()
+    await db.run_sync(sync_profile_skills, profile.id, extracted_skills, catalog)
+    await db.commit()
+    await db.refresh(profile)
     
     return profile
 
-@router.post("/analyze-gaps", response_model=SkillGapAnalysisResponse)
-async def analyze_skill_gaps(
-    db: Session = Depends(get_db)
+@register_job_handler("resume_upload")
+async def run_resume_upload_job(db: AsyncSession, payload: dict, report) -> dict:
+    await report(10, "Extracting skills")
+    profile = await process_resume(db, **payload)
+    return ProfileResponse.model_validate(profile).model_dump(mode="json")
+
+@router.post("/upload-resume", response_model=ProfileResponse)
+async def upload_resume(
+    file: UploadFile = File(...),
+    domain: str = None,
+    target_role: str = None,
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Analyze skill gaps"""
-    default_user_id = 1
-    profile = db.query(UserProfile).filter(UserProfile.user_id == default_user_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found. Please upload a resume first.")
+    """
+    Upload resume and extract skills
+    
+    With background=true the AI extraction runs as a job and a 202 with the
+    job id is returned immediately.
+    """
+    # Extract text (PDFs are parsed off the event loop)
+    resume_text = await extract_upload_text(file)
     
-    current_skills = profile.current_skills or []
+    if background:
+        job = await enqueue_job(db, "resume_upload", {
+            "resume_text": resume_text, "domain": domain, "target_role": target_role
+        })
+        return job_accepted_response(job)
     
-    # Get trending skills for the domain
-    domain_skills = []
-    if profile.domain:
-        domain_skills = db.query(Skill).filter(Skill.domain == profile.domain).all()
+    return await process_resume(db, resume_text, domain, target_role)
+
+@register_job_handler("bulk_resume_upload")
+async def run_bulk_resume_upload_job(db: AsyncSession, payload: dict, report) -> dict:
+    await report(5, f"Extracting skills from {len(payload['documents'])} resumes")
+    return await ingest_resumes(db, get_ai_service(), report=report, **payload)
+
+@router.post("/upload-resumes", response_model=BulkResumeUploadResponse)
+async def upload_resumes(
+    files: List[UploadFile] = File(...),
+    domain: str = None,
+    target_role: str = None,
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Upload a cohort of resumes (several files and/or zip archives)
     
-    if not domain_skills:
-        # If no domain skills, get all high-demand skills
-        domain_skills = db.query(Skill).filter(Skill.trend_status.in_(["emerging", "high-growth"])).limit(20).all()
+    Creates a student profile per resume. Text is extracted concurrently,
+    several resumes share each AI call and profiles are stored with bulk
+    inserts; the response reports per-file results and resumes per minute.
+    With background=true the AI extraction runs as a job (202 + job id).
+    """
+    started_at = time.perf_counter()
+    documents = [document._asdict() for document in await extract_upload_texts(files)]
     
-    if not domain_skills:
-        # If still no skills, get any skills
-        domain_skills = db.query(Skill).limit(20).all()
+    if background:
+        job = await enqueue_job(db, "bulk_resume_upload", {
+            "documents": documents, "domain": domain, "target_role": target_role
+        })
+        return job_accepted_response(job)
     
-    required_skills = [skill.name for skill in domain_skills]
+    return await ingest_resumes(
+        db, get_ai_service(), documents, domain, target_role, started_at=started_at
+    )
+
+async def run_gap_analysis(db: AsyncSession) -> SkillGapAnalysisResponse:
+    """Analyze the default profile's skill gaps and store them"""
+    default_user_id = 1
+    profile = (await db.execute(
+        select(UserProfile).where(UserProfile.user_id == default_user_id).limit(1)
+    )).scalar_one_or_none()
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found. Please upload a resume first.")
+    
+    # Catalog skills from the profile_skills index, plus any extracted names
+    # that are not in the catalog
+    catalog = await get_skill_catalog_async()
+    catalog_skills = await db.run_sync(profile_skill_names, profile.id, catalog)
+    current_skills = merge_current_skills(catalog_skills, profile.current_skills)
+    
+    # Domain skills, or trending/any skills when the domain has none
+    required_skills = required_skills_for_domains(catalog, [profile.domain])[profile.domain]
     
     # If no skills in database at all, return a helpful message
     if not required_skills:
@@ -127,7 +169,7 @@ async def analyze_skill_gaps(
     
     # Use AI to analyze gaps
     ai_service = get_ai_service()
-    gap_analysis = ai_service.analyze_skill_gaps(
+    gap_analysis = await ai_service.analyze_skill_gaps_async(
         current_skills,
         required_skills,
         profile.target_role or "Professional"
@@ -136,42 +178,8 @@ async def analyze_skill_gaps(
     # Calculate overall gap score
     overall_gap_score = gap_analysis.get("gap_score", 0.0)
     
-    # Create skill gap records
-    skill_gaps = []
-    for skill_name in gap_analysis.get("missing_skills", []):
-        skill = db.query(Skill).filter(Skill.name == skill_name).first()
-        if skill:
-            # Determine priority and timeframe
-            priority = "high" if skill_name in gap_analysis.get("priority_skills_short_term", []) else "medium"
-            timeframe = "short-term" if skill_name in gap_analysis.get("priority_skills_short_term", []) else "long-term"
-            
-            gap = SkillGap(
-                profile_id=profile.id,
-                skill_id=skill.id,
-                gap_score=1.0,  # Missing skill = full gap
-                priority=priority,
-                timeframe=timeframe
-            )
-            skill_gaps.append(gap)
-    
-    # Clear existing gaps and add new ones
-    db.query(SkillGap).filter(SkillGap.profile_id == profile.id).delete()
-    db.add_all(skill_gaps)
-    db.commit()
-    
-    # Build response
-    gap_responses = []
-    for gap in skill_gaps:
-        skill = db.query(Skill).filter(Skill.id == gap.skill_id).first()
-        gap_responses.append(SkillGapResponse(
-            skill_id=skill.id,
-            skill_name=skill.name,
-            gap_score=gap.gap_score,
-            priority=gap.priority,
-            timeframe=gap.timeframe,
-            current_demand_score=skill.current_demand_score,
-            future_demand_score=skill.future_demand_score
-        ))
+    gap_responses = await db.run_sync(save_skill_gaps, profile.id, gap_analysis, catalog)
+    await db.commit()
     
     return SkillGapAnalysisResponse(
         profile_id=profile.id,
@@ -181,43 +189,109 @@ async def analyze_skill_gaps(
         priority_skills_long_term=gap_analysis.get("priority_skills_long_term", [])
     )
 
-@router.get("/trending", response_model=List[SkillResponse])
+@register_job_handler("gap_analysis")
+async def run_gap_analysis_job(db: AsyncSession, payload: dict, report) -> dict:
+    await report(10, "Analyzing skill gaps")
+    analysis = await run_gap_analysis(db)
+    return analysis.model_dump(mode="json")
+
+@router.post("/analyze-gaps", response_model=SkillGapAnalysisResponse)
+async def analyze_skill_gaps(
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Analyze skill gaps; with background=true returns a job id (202) instead"""
+    if background:
+        job = await enqueue_job(db, "gap_analysis", {})
+        return job_accepted_response(job)
+    return await run_gap_analysis(db)
+
+@register_job_handler("gap_reanalysis")
+async def run_gap_reanalysis_job(db: AsyncSession, payload: dict, report) -> dict:
+    await report(1, "Re-analyzing skill gaps")
+    return await reanalyze_skill_gaps(db, get_ai_service(), report=report, **payload)
+
+@router.post("/analyze-gaps/batch", response_model=GapReanalysisResponse)
+async def reanalyze_cohort_gaps(
+    request: GapReanalysisRequest,
+    background: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Re-analyze skill gaps for many profiles, e.g. after a catalog refresh
+    
+    Selects the given profile ids and/or domain (all profiles when neither
+    is set). Profiles sharing a required-skills list are analyzed many per
+    AI call. With background=true returns a job id (202) instead.
+    """
+    payload = request.model_dump()
+    if background:
+        job = await enqueue_job(db, "gap_reanalysis", payload)
+        return job_accepted_response(job)
+    return await reanalyze_skill_gaps(db, get_ai_service(), **payload)
+
+@router.get("/trending", response_model=List[SkillResponse], dependencies=[conditional_get("skills")])
 async def get_trending_skills(
     domain: str = None,
-    limit: int = 20,
-    db: Session = Depends(get_db)
+    limit: int = 20
 ):
-    """Get trending skills based on demand and forecasts"""
-    query = db.query(Skill)
-    if domain:
-        query = query.filter(Skill.domain == domain)
-    
-    skills = query.order_by(Skill.future_demand_score.desc()).limit(limit).all()
-    return skills
+    """Get trending skills based on demand and forecasts, from the in-process catalog"""
+    catalog = await get_skill_catalog_async()
+    return catalog.ranked(domain=domain, limit=limit)
 
 @router.get("/forecast/{skill_name}")
 async def get_skill_forecast(
     skill_name: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get detailed forecast for a specific skill"""
-    skill = db.query(Skill).filter(Skill.name == skill_name).first()
+    """
+    Get detailed forecast for a specific skill
+    
+    Served from stored trend history; when it is older than the refresh
+    horizon a background refresh is queued and the stale data is returned.
+    Point forecasts and their bands come from one fit over the same
+    FORECAST_HISTORY_DAYS window the stored forecasts use, so the bands
+    always bracket the points shown with them.
+    """
+    skill = (await get_skill_catalog_async()).find(skill_name)
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
     
-    # Get trend data
-    trend_data = trends_service.get_trend_data([skill_name])
-    skill_trend = trend_data.get(skill_name, {})
+    dates, raw_values = await db.run_sync(load_series, skill.id)
+    values = np.nan_to_num(raw_values)
+    
+    stale = len(dates) == 0 or is_stale(skill)
+    if stale:
+        trend_refresher.enqueue([skill.name])
+    
+    points = {key: getattr(skill, f"forecast_{key}") for key in HORIZONS}
+    future_demand = skill.future_demand_score
+    forecast_bands = {}
+    # Fitted like recompute_catalog_forecasts: same window, gaps interpolated rather than zeroed
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=FORECAST_HISTORY_DAYS)
+    window = raw_values[dates >= np.datetime64(since, "s")]
+    if len(window) and not np.isnan(window).all():
+        forecast = forecast_one(window)
+        points = {key: forecast[f"forecast_{key}"] for key in HORIZONS}
+        future_demand = points["1y"]
+        forecast_bands = {
+            key: {"lower": forecast[f"lower_{key}"], "upper": forecast[f"upper_{key}"]}
+            for key in HORIZONS
+        }
     
     return {
         "skill": skill_name,
         "current_demand": skill.current_demand_score,
-        "future_demand": skill.future_demand_score,
+        "future_demand": future_demand,
         "trend_status": skill.trend_status,
-        "forecast_6m": skill.forecast_6m,
-        "forecast_1y": skill.forecast_1y,
-        "forecast_3y": skill.forecast_3y,
+        "forecast_6m": points["6m"],
+        "forecast_1y": points["1y"],
+        "forecast_3y": points["3y"],
+        "forecast_bands": forecast_bands,
         "google_trends_score": skill.google_trends_score,
-        "growth_rate": skill_trend.get("growth_rate", 0.0),
-        "trend_data": skill_trend.get("trend_data", {})
+        "growth_rate": growth_rate(values),
+        "trend_data": dict(zip(np.datetime_as_string(dates, unit='D').tolist(), values.tolist())),
+        "last_refreshed": skill.updated_at,
+        "stale": stale,
+        "refresh_pending": trend_refresher.is_pending(skill.name)
     }
@@ -60,6 +60,22 @@ class ProfileResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class BulkResumeResult(BaseModel):
+    filename: str
+    profile_id: Optional[int] = None
+    user_id: Optional[int] = None
+    email: Optional[str] = None
+    skills: List[str] = []
+    error: Optional[str] = None
+
+class BulkResumeUploadResponse(BaseModel):
+    total: int
+    processed: int
+    failed: int
+    elapsed_seconds: float
+    resumes_per_minute: float
+    results: List[BulkResumeResult]
+
 # Skill Gap Schemas
 class SkillGapResponse(BaseModel):
     skill_id: int
@@ -80,6 +96,20 @@ class SkillGapAnalysisResponse(BaseModel):
     priority_skills_short_term: List[str]
     priority_skills_long_term: List[str]
 
+class GapReanalysisRequest(BaseModel):
+    profile_ids: Optional[List[int]] = None
+    domain: Optional[str] = None
+
+class ProfileGapSummary(BaseModel):
+    profile_id: int
+    overall_gap_score: float
+    skill_gaps: int
+
+class GapReanalysisResponse(BaseModel):
+    analyzed: int
+    elapsed_seconds: float
+    results: List[ProfileGapSummary]
+
 # Roadmap Schemas
 class RoadmapStep(BaseModel):
     step_number: int
@@ -106,6 +136,15 @@ class RoadmapResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RoadmapListItem(BaseModel):
+    """A roadmap in a list; fields left out with ?fields= are omitted"""
+    id: int
+    title: Optional[str] = None
+    target_role: Optional[str] = None
+    target_timeline_months: Optional[int] = None
+    roadmap_data: Optional[Dict[str, Any]] = None
+    generated_at: Optional[datetime] = None
+
 # Curriculum Schemas
 class CurriculumCreate(BaseModel):
     name: str
@@ -123,6 +162,16 @@ class CurriculumResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class CurriculumListItem(BaseModel):
+    """A curriculum in a list; fields left out with ?fields= are omitted"""
+    id: int
+    institution_id: Optional[int] = None
+    name: Optional[str] = None
+    program: Optional[str] = None
+    extracted_skills: Optional[List[str]] = None
+    alignment_score: Optional[float] = None
+    recommendations: Optional[Dict[str, Any]] = None
+
 # Analytics Schemas
 class SkillForecastResponse(BaseModel):
     skill_name: str
@@ -138,3 +187,16 @@ class TrendAnalysisResponse(BaseModel):
     trend_data: List[Dict[str, Any]]
     growth_rate: float
     classification: str  # emerging, high-growth, saturated, declining
+
+# Job Schemas
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str  # queued, running, succeeded, failed
+    progress: int = 0
+    progress_message: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
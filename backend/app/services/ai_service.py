@@ -3,32 +3,78 @@ Google AI Studio (Gemini) integration service
 """
 
 import os
+import re
+import json
+import time
+import asyncio
+import weakref
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from dotenv import load_dotenv
 
-# Load .env file from backend directory
-env_path = Path(__file__).parent.parent.parent / '.env'
-load_dotenv(dotenv_path=env_path)
+from app.services.cache_service import get_response_cache
+from app.services.single_flight import SingleFlight, ThreadSingleFlight, call_key
+from app.services.document_prep import PreparedDocument, prepare_document
+from app.services.skill_matcher import get_skill_matcher
+from app.services.skill_canonicalizer import canonical_key
 
-# Try new google.genai first, fallback to deprecated google.generativeai
+# The Gemini SDK is slow to import, so it is loaded when the first AIService
+# is created rather than with this module
 USE_NEW_API = False
 genai = None
+new_genai = None
+_genai_loaded = False
 
-try:
-    from google import genai as new_genai
-    USE_NEW_API = True
-    print("✓ Using new google.genai package")
-except ImportError:
+def _load_genai():
+    """Import google.genai, falling back to the deprecated google.generativeai"""
+    global USE_NEW_API, genai, new_genai, _genai_loaded
+    if _genai_loaded:
+        return
     try:
-        import google.generativeai as old_genai
-        genai = old_genai
-        print("⚠ Using deprecated google.generativeai package")
+        from google import genai as sdk
+        new_genai = sdk
+        USE_NEW_API = True
+        print("✓ Using new google.genai package")
     except ImportError:
-        raise ImportError("Please install google-genai: pip install google-genai")
+        try:
+            import google.generativeai as old_genai
+            genai = old_genai
+            print("⚠ Using deprecated google.generativeai package")
+        except ImportError:
+            raise ImportError("Please install google-genai: pip install google-genai")
+    _genai_loaded = True
+
+# Upper bound on concurrent Gemini calls made from the async path
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+_ai_call_slots = weakref.WeakKeyDictionary()
+
+def _get_call_slots() -> asyncio.Semaphore:
+    """Semaphore limiting in-flight Gemini calls, one per event loop"""
+    loop = asyncio.get_running_loop()
+    slots = _ai_call_slots.get(loop)
+    if slots is None:
+        slots = _ai_call_slots[loop] = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+    return slots
+
+# Resumes packed into one Gemini call by the batch extractor, and the prompt
+# budget for their combined text
+AI_BATCH_DOCUMENTS = int(os.getenv("AI_BATCH_DOCUMENTS", "8"))
+AI_BATCH_MAX_CHARS = int(os.getenv("AI_BATCH_MAX_CHARS", "40000"))
+# Profiles analyzed per Gemini call by the batch gap analysis
+AI_GAP_BATCH_PROFILES = int(os.getenv("AI_GAP_BATCH_PROFILES", "25"))
+
+# An "id": {...} or "id": [...] entry inside a possibly truncated batch answer
+_BATCH_ENTRY = re.compile(r'"(\w+)"\s*:\s*[\[{]')
+
+# Identical prompts in flight at the same time share one Gemini call; callers
+# get their own copy of the parsed JSON
+_ai_flight = SingleFlight("gemini", copy_results=True)
+_ai_thread_flight = ThreadSingleFlight("gemini_sync", copy_results=True)
 
 class AIService:
     def __init__(self):
+        _load_genai()
+        
         # Try multiple locations for .env file
         backend_dir = Path(__file__).parent.parent.parent
         root_dir = backend_dir.parent if backend_dir.name == 'backend' else backend_dir
@@ -78,6 +124,7 @@ class AIService:
             for model_name in model_names:
                 try:
                     self.model = genai.GenerativeModel(model_name)
+                    self.model_name = model_name
                     print(f"✓ Using Gemini model: {model_name} (old API)")
                     break
                 except Exception as e:
@@ -91,10 +138,13 @@ class AIService:
         # self._verify_api_key()
         print("✓ AI Service initialized (skipping verification to avoid rate limits)")
     
+    @staticmethod
+    def _is_rate_limited(error: Exception) -> bool:
+        error_str = str(error)
+        return "RESOURCE_EXHAUSTED" in error_str or "429" in error_str
+
     def _generate_content(self, prompt: str, max_retries: int = 3) -> str:
         """Generate content using the appropriate API with retry logic"""
-        import time
-        
         for attempt in range(max_retries):
             try:
                 if USE_NEW_API:
@@ -107,17 +157,139 @@ class AIService:
                     response = self.model.generate_content(prompt)
                     return response.text if hasattr(response, 'text') else str(response)
             except Exception as e:
-                error_str = str(e)
-                if "RESOURCE_EXHAUSTED" in error_str or "429" in error_str:
-                    if attempt < max_retries - 1:
-                        wait_time = (2 ** attempt) * 5  # 5s, 10s, 20s
-                        print(f"  Rate limited, waiting {wait_time}s before retry {attempt + 2}/{max_retries}...")
-                        time.sleep(wait_time)
-                        continue
+                if self._is_rate_limited(e) and attempt < max_retries - 1:
+                    wait_time = (2 ** attempt) * 5  # 5s, 10s, 20s
+                    print(f"  Rate limited, waiting {wait_time}s before retry {attempt + 2}/{max_retries}...")
+                    time.sleep(wait_time)
+                    continue
+                raise e
+        
+        raise Exception("Max retries exceeded")
+    
+    async def _generate_content_async(self, prompt: str, max_retries: int = 3) -> str:
+        """
+        Async variant of _generate_content for use from route handlers.
+        
+        Uses the genai async client when available; the deprecated SDK has no
+        async API, so its blocking call is offloaded to a worker thread. At most
+        AI_MAX_CONCURRENCY calls are in flight at once and rate-limit backoff
+        awaits instead of sleeping, so the event loop keeps serving requests.
+        """
+        for attempt in range(max_retries):
+            try:
+                async with _get_call_slots():
+                    if USE_NEW_API:
+                        response = await self.client.aio.models.generate_content(
+                            model=self.model_name,
+                            contents=prompt
+                        )
+                        return response.text
+                    response = await asyncio.to_thread(self.model.generate_content, prompt)
+                    return response.text if hasattr(response, 'text') else str(response)
+            except Exception as e:
+                if self._is_rate_limited(e) and attempt < max_retries - 1:
+                    wait_time = (2 ** attempt) * 5  # 5s, 10s, 20s
+                    print(f"  Rate limited, waiting {wait_time}s before retry {attempt + 2}/{max_retries}...")
+                    await asyncio.sleep(wait_time)
+                    continue
                 raise e
         
         raise Exception("Max retries exceeded")
     
+    @staticmethod
+    def _parse_json_response(text: str) -> Any:
+        """Parse a JSON model response, stripping markdown code fences if present"""
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.split("```")[1]
+            if text.startswith("json"):
+                text = text[4:]
+        return json.loads(text.strip())
+    
+    @classmethod
+    def _parse_batch_response(cls, text: str) -> Dict[str, Any]:
+        """
+        Parse a batch answer into {item id: item}, salvaging what it can
+        
+        Accepts an object keyed by id or a list of objects with an "id" field.
+        When the whole answer is not valid JSON (e.g. the output was cut
+        off), every complete "id": {...} entry is still recovered, so only
+        the broken items need a fallback.
+        """
+        try:
+            parsed = cls._parse_json_response(text)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return {str(key): value for key, value in parsed.items()}
+        if isinstance(parsed, list):
+            return {
+                str(item["id"]): item for item in parsed
+                if isinstance(item, dict) and "id" in item
+            }
+        
+        decoder = json.JSONDecoder()
+        items = {}
+        decoded_until = 0
+        for match in _BATCH_ENTRY.finditer(text):
+            if match.start() < decoded_until:
+                continue  # a key nested inside an entry already recovered
+            try:
+                items[match.group(1)], decoded_until = decoder.raw_decode(text, match.end() - 1)
+            except ValueError:
+                continue
+        return items
+    
+    def _generate_json(self, prompt: str) -> Any:
+        """
+        Generate content and parse it as JSON, serving repeated prompts from
+        the cache and sharing one call between identical concurrent prompts
+        """
+        cache = get_response_cache()
+        key = cache.make_key(self.model_name, prompt) if cache else call_key(self.model_name, prompt)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        
+        def generate():
+            result = self._parse_json_response(self._generate_content(prompt))
+            if cache is not None:
+                cache.set(key, self.model_name, result)
+            return result
+        
+        return _ai_thread_flight.do(key, generate)
+    
+    async def _generate_json_async(
+        self,
+        prompt: str,
+        parse: Optional[Callable[[str], Any]] = None,
+        cacheable: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Async _generate_json; generation does not block the event loop
+        
+        parse replaces the default JSON parsing of the model's answer.
+        cacheable decides whether a parsed answer is complete enough to
+        cache (e.g. a batch answer with every item); incomplete answers are
+        returned but not cached, so the next identical call asks again.
+        """
+        parse = parse or self._parse_json_response
+        cache = get_response_cache()
+        key = cache.make_key(self.model_name, prompt) if cache else call_key(self.model_name, prompt)
+        if cache is not None:
+            cached = await cache.get_async(key)
+            if cached is not None and (cacheable is None or cacheable(cached)):
+                return cached
+        
+        async def generate():
+            result = parse(await self._generate_content_async(prompt))
+            if cache is not None and (cacheable is None or cacheable(result)):
+                await cache.set_async(key, self.model_name, result)
+            return result
+        
+        return await _ai_flight.do(key, generate)
+    
     def _verify_api_key(self):
         """Verify that the API key is valid by making a test call"""
         try:
@@ -129,37 +301,39 @@ class AIService:
             print("  The service will still attempt to work, but may fail on actual requests.")
     
     def _extract_skills_fallback(self, text: str) -> List[str]:
-        """Fallback skill extraction using keyword matching when AI is unavailable"""
-        # Common skills to look for
-        skill_keywords = [
-            # Programming languages
-            "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Rust", "Ruby", "PHP",
-            # AI/ML
-            "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Keras", "NLP", "Computer Vision",
-            "Natural Language Processing", "LLM", "Neural Networks", "AI", "Data Science",
-            # Web Development
-            "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask", "FastAPI", "REST API",
-            "HTML", "CSS", "Bootstrap", "Tailwind",
-            # Data
-            "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Pandas", "NumPy", "Data Analysis",
-            "Data Visualization", "Tableau", "Power BI",
-            # Cloud & DevOps
-            "AWS", "Azure", "GCP", "Docker", "Kubernetes", "CI/CD", "DevOps", "Linux", "Git",
-            # Soft Skills
-            "Communication", "Leadership", "Problem Solving", "Team Collaboration", "Project Management",
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        for skill in skill_keywords:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
+        """Fallback skill extraction using the compiled catalog matcher when AI is unavailable"""
+        return get_skill_matcher().find(text, limit=20)  # Limit to 20 skills
+    
+    async def _extract_skills_fallback_async(self, text: str) -> List[str]:
+        """
+        _extract_skills_fallback in a worker thread
         
-        return found_skills[:20]  # Limit to 20 skills
+        The matcher scans the whole document and may load the skill catalog
+        with a blocking query; async callers run it, and the prompt
+        pre-pass, off the event loop.
+        """
+        return await asyncio.to_thread(self._extract_skills_fallback, text)
     
-    def extract_skills_from_resume(self, resume_text: str) -> List[str]:
-        """Extract skills from resume text using AI"""
-        prompt = f"""
+    def _prepared_skills_prompt(self, document_kind: str, prepared: PreparedDocument) -> str:
+        """Prompt built from a locally pre-processed document instead of its full text"""
+        candidates = json.dumps(prepared.candidates)
+        return f"""
+        A keyword scan of a {document_kind} found these candidate skills:
+        {candidates}
+        
+        Below are the parts of the {document_kind} the scan could not fully account for.
+        Return only a JSON array of skill names containing the candidates that are genuine
+        skills in this context, plus any other technical or soft skills mentioned in the excerpt.
+        
+        Excerpt:
+        {prepared.excerpt}
+        """
+    
+    def _resume_skills_prompt(self, resume_text: str) -> str:
+        prepared = prepare_document(resume_text)
+        if prepared is not None:
+            return self._prepared_skills_prompt("resume", prepared)
+        return f"""
         Analyze the following resume text and extract all technical and soft skills mentioned.
         Return only a JSON array of skill names, without any additional text.
         
@@ -168,27 +342,120 @@ class AIService:
         
         Example output format: ["Python", "Machine Learning", "Communication", "Project Management"]
         """
-        
+    
+    def extract_skills_from_resume(self, resume_text: str) -> List[str]:
+        """Extract skills from resume text using AI"""
         try:
-            skills_text = self._generate_content(prompt).strip()
-            # Remove markdown code blocks if present
-            if skills_text.startswith("```"):
-                skills_text = skills_text.split("```")[1]
-                if skills_text.startswith("json"):
-                    skills_text = skills_text[4:]
-            skills_text = skills_text.strip()
-            
-            import json
-            skills = json.loads(skills_text)
+            skills = self._generate_json(self._resume_skills_prompt(resume_text))
             return skills if isinstance(skills, list) else []
         except Exception as e:
             print(f"Error extracting skills from resume: {e}")
             print(f"  Using fallback keyword extraction...")
             return self._extract_skills_fallback(resume_text)
     
-    def extract_skills_from_curriculum(self, curriculum_text: str) -> List[str]:
-        """Extract skills from curriculum/syllabus text"""
-        prompt = f"""
+    async def extract_skills_from_resume_async(self, resume_text: str) -> List[str]:
+        """Async variant of extract_skills_from_resume"""
+        try:
+            prompt = await asyncio.to_thread(self._resume_skills_prompt, resume_text)
+            skills = await self._generate_json_async(prompt)
+            return skills if isinstance(skills, list) else []
+        except Exception as e:
+            print(f"Error extracting skills from resume: {e}")
+            print(f"  Using fallback keyword extraction...")
+            return await self._extract_skills_fallback_async(resume_text)
+    
+    def _resume_batch_entry(self, resume_text: str) -> str:
+        """A resume's text for a batch prompt, pre-processed when long"""
+        prepared = prepare_document(resume_text)
+        if prepared is None:
+            return resume_text.strip()[:AI_BATCH_MAX_CHARS]
+        return f"Candidate skills from a keyword scan: {json.dumps(prepared.candidates)}\n{prepared.excerpt}"
+    
+    def _resume_batch_prompt(self, entries: List[str]) -> str:
+        documents = "\n\n".join(
+            f'<resume id="{number}">\n{entry}\n</resume>' for number, entry in enumerate(entries, start=1)
+        )
+        return f"""
+        Extract all technical and soft skills mentioned in each of the {len(entries)} resumes below.
+        Some resumes list candidate skills found by a keyword scan followed by the rest of their
+        relevant text; keep the candidates that are genuine skills and add any others mentioned.
+        Return only a JSON object mapping every resume id to a JSON array of skill names,
+        without any additional text.
+        
+        {documents}
+        
+        Example output format: {{"1": ["Python", "Machine Learning"], "2": ["Communication", "SQL"]}}
+        """
+    
+    @staticmethod
+    def _pack_batches(sizes: List[int], max_items: int) -> List[List[int]]:
+        """Group item indexes into batches bounded by count and combined size in characters"""
+        batches, current, chars = [], [], 0
+        for index, size in enumerate(sizes):
+            if current and (len(current) >= max_items or chars + size > AI_BATCH_MAX_CHARS):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(index)
+            chars += size
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def extract_skills_from_resumes_batch_async(
+        self,
+        resume_texts: List[str],
+        on_batch_done: Optional[Callable[[int], Awaitable[None]]] = None
+    ) -> List[List[str]]:
+        """
+        Extract skills from many resumes, several per Gemini call
+        
+        Resumes are packed into batches of up to AI_BATCH_DOCUMENTS (and
+        AI_BATCH_MAX_CHARS of text) and the batches run concurrently. Each
+        call returns skills per resume id; a resume missing from the answer,
+        or a whole batch whose call failed, falls back to keyword extraction.
+        on_batch_done is awaited with the number of resumes in each finished
+        batch.
+        
+        Returns:
+            One skill list per input text, in order
+        """
+        entries = await asyncio.to_thread(lambda: [self._resume_batch_entry(text) for text in resume_texts])
+        results: List[List[str]] = [[] for _ in resume_texts]
+        
+        async def run_batch(indexes: List[int]):
+            try:
+                answer = await self._generate_json_async(
+                    self._resume_batch_prompt([entries[i] for i in indexes]),
+                    parse=self._parse_batch_response,
+                    # A cut-off answer is salvaged for this call but not cached
+                    cacheable=lambda items: all(
+                        isinstance(items.get(str(number)), list) for number in range(1, len(indexes) + 1)
+                    )
+                )
+            except Exception as e:
+                print(f"Error extracting skills from a batch of {len(indexes)} resumes: {e}")
+                print(f"  Using fallback keyword extraction...")
+                answer = None
+            for number, index in enumerate(indexes, start=1):
+                skills = answer.get(str(number)) if answer else None
+                if isinstance(skills, list):
+                    results[index] = [skill for skill in skills if isinstance(skill, str)]
+                else:
+                    results[index] = await self._extract_skills_fallback_async(resume_texts[index])
+            if on_batch_done:
+                await on_batch_done(len(indexes))
+        
+        await asyncio.gather(*(
+            run_batch(indexes)
+            for indexes in self._pack_batches([len(entry) for entry in entries], AI_BATCH_DOCUMENTS)
+        ))
+        return results
+    
+    def _curriculum_skills_prompt(self, curriculum_text: str) -> str:
+        prepared = prepare_document(curriculum_text)
+        if prepared is not None:
+            return self._prepared_skills_prompt("curriculum/syllabus", prepared)
+        return f"""
         Analyze the following academic curriculum/syllabus and extract all skills, technologies, 
         and competencies that students would learn from this curriculum.
         Return only a JSON array of skill names.
@@ -198,23 +465,28 @@ class AIService:
         
         Example output format: ["Data Structures", "Algorithms", "Database Management", "Software Engineering"]
         """
-        
+    
+    def extract_skills_from_curriculum(self, curriculum_text: str) -> List[str]:
+        """Extract skills from curriculum/syllabus text"""
         try:
-            skills_text = self._generate_content(prompt).strip()
-            if skills_text.startswith("```"):
-                skills_text = skills_text.split("```")[1]
-                if skills_text.startswith("json"):
-                    skills_text = skills_text[4:]
-            skills_text = skills_text.strip()
-            
-            import json
-            skills = json.loads(skills_text)
+            skills = self._generate_json(self._curriculum_skills_prompt(curriculum_text))
             return skills if isinstance(skills, list) else []
         except Exception as e:
             print(f"Error extracting curriculum skills: {e}")
             print(f"  Using fallback keyword extraction...")
             return self._extract_skills_fallback(curriculum_text)
     
+    async def extract_skills_from_curriculum_async(self, curriculum_text: str) -> List[str]:
+        """Async variant of extract_skills_from_curriculum"""
+        try:
+            prompt = await asyncio.to_thread(self._curriculum_skills_prompt, curriculum_text)
+            skills = await self._generate_json_async(prompt)
+            return skills if isinstance(skills, list) else []
+        except Exception as e:
+            print(f"Error extracting curriculum skills: {e}")
+            print(f"  Using fallback keyword extraction...")
+            return await self._extract_skills_fallback_async(curriculum_text)
+    
     def _generate_fallback_roadmap(
         self,
         current_skills: List[str],
@@ -279,18 +551,17 @@ class AIService:
             "note": "This is a basic roadmap generated offline. For personalized recommendations, please try again later."
         }
 
-    def generate_skill_roadmap(
-        self, 
+    def _roadmap_prompt(
+        self,
         current_skills: List[str],
         target_role: str,
         timeline_months: int,
         domain: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Generate personalized learning roadmap using AI"""
+    ) -> str:
         skills_str = ", ".join(current_skills) if current_skills else "None"
         domain_str = f" in the {domain} domain" if domain else ""
         
-        prompt = f"""
+        return f"""
         Create a detailed, step-by-step learning roadmap for someone who wants to become a {target_role}{domain_str}.
         
         Current skills: {skills_str}
@@ -324,18 +595,36 @@ class AIService:
             "capstone_ideas": ["idea1", "idea2"]
         }}
         """
-        
+    
+    def generate_skill_roadmap(
+        self, 
+        current_skills: List[str],
+        target_role: str,
+        timeline_months: int,
+        domain: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Generate personalized learning roadmap using AI"""
         try:
-            roadmap_text = self._generate_content(prompt).strip()
-            if roadmap_text.startswith("```"):
-                roadmap_text = roadmap_text.split("```")[1]
-                if roadmap_text.startswith("json"):
-                    roadmap_text = roadmap_text[4:]
-            roadmap_text = roadmap_text.strip()
-            
-            import json
-            roadmap = json.loads(roadmap_text)
-            return roadmap
+            return self._generate_json(
+                self._roadmap_prompt(current_skills, target_role, timeline_months, domain)
+            )
+        except Exception as e:
+            print(f"Error generating roadmap with AI: {e}")
+            print(f"  Using fallback roadmap generation...")
+            return self._generate_fallback_roadmap(current_skills, target_role, timeline_months, domain)
+    
+    async def generate_skill_roadmap_async(
+        self,
+        current_skills: List[str],
+        target_role: str,
+        timeline_months: int,
+        domain: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async variant of generate_skill_roadmap"""
+        try:
+            return await self._generate_json_async(
+                self._roadmap_prompt(current_skills, target_role, timeline_months, domain)
+            )
         except Exception as e:
             print(f"Error generating roadmap with AI: {e}")
             print(f"  Using fallback roadmap generation...")
@@ -348,11 +637,10 @@ class AIService:
         target_role: str
     ) -> Dict[str, Any]:
         """Fallback gap analysis when AI is unavailable"""
-        current_lower = set(s.lower() for s in current_skills)
-        required_lower = set(s.lower() for s in required_skills)
+        current_keys = set(canonical_key(s) for s in current_skills)
         
-        # Find missing skills
-        missing = [s for s in required_skills if s.lower() not in current_lower]
+        # Find missing skills ("NodeJS" counts as "Node.js", "ML" as "Machine Learning")
+        missing = [s for s in required_skills if canonical_key(s) not in current_keys]
         
         # Calculate gap score (percentage of missing skills)
         if required_skills:
@@ -374,17 +662,16 @@ class AIService:
             "note": "This is a basic analysis generated offline. For detailed AI recommendations, please try again later."
         }
 
-    def analyze_skill_gaps(
+    def _skill_gaps_prompt(
         self,
         current_skills: List[str],
         required_skills: List[str],
         target_role: str
-    ) -> Dict[str, Any]:
-        """Analyze skill gaps and provide recommendations"""
+    ) -> str:
         current_str = ", ".join(current_skills) if current_skills else "None"
         required_str = ", ".join(required_skills)
         
-        prompt = f"""
+        return f"""
         Analyze the skill gap between current skills and required skills for the role: {target_role}
         
         Current skills: {current_str}
@@ -399,23 +686,138 @@ class AIService:
             "recommendations": "Detailed text recommendations"
         }}
         """
-        
+    
+    def analyze_skill_gaps(
+        self,
+        current_skills: List[str],
+        required_skills: List[str],
+        target_role: str
+    ) -> Dict[str, Any]:
+        """Analyze skill gaps and provide recommendations"""
         try:
-            analysis_text = self._generate_content(prompt).strip()
-            if analysis_text.startswith("```"):
-                analysis_text = analysis_text.split("```")[1]
-                if analysis_text.startswith("json"):
-                    analysis_text = analysis_text[4:]
-            analysis_text = analysis_text.strip()
-            
-            import json
-            analysis = json.loads(analysis_text)
-            return analysis
+            return self._generate_json(
+                self._skill_gaps_prompt(current_skills, required_skills, target_role)
+            )
+        except Exception as e:
+            print(f"Error analyzing skill gaps with AI: {e}")
+            print(f"  Using fallback gap analysis...")
+            return self._analyze_gaps_fallback(current_skills, required_skills, target_role)
+    
+    async def analyze_skill_gaps_async(
+        self,
+        current_skills: List[str],
+        required_skills: List[str],
+        target_role: str
+    ) -> Dict[str, Any]:
+        """Async variant of analyze_skill_gaps"""
+        try:
+            return await self._generate_json_async(
+                self._skill_gaps_prompt(current_skills, required_skills, target_role)
+            )
         except Exception as e:
             print(f"Error analyzing skill gaps with AI: {e}")
             print(f"  Using fallback gap analysis...")
             return self._analyze_gaps_fallback(current_skills, required_skills, target_role)
     
+    def _skill_gaps_batch_prompt(
+        self,
+        required_skills: List[str],
+        profiles: List[Dict[str, Any]]
+    ) -> str:
+        profile_lines = "\n".join(json.dumps(profile) for profile in profiles)
+        return f"""
+        Analyze the skill gaps of each of the {len(profiles)} profiles below against the same
+        set of required skills. Each profile has an id, a target role and its current skills.
+        
+        Required skills: {", ".join(required_skills)}
+        
+        Profiles (one JSON object per line):
+        {profile_lines}
+        
+        Return only a JSON object mapping every profile id to its analysis, keeping
+        recommendations to one or two sentences:
+        {{
+            "1": {{
+                "missing_skills": ["skill1", "skill2"],
+                "priority_skills_short_term": ["skill1"],
+                "priority_skills_long_term": ["skill2"],
+                "gap_score": 0.65,
+                "recommendations": "Short text recommendations"
+            }}
+        }}
+        """
+    
+    @staticmethod
+    def _valid_gap_analysis(analysis: Any) -> bool:
+        return (
+            isinstance(analysis, dict)
+            and isinstance(analysis.get("missing_skills"), list)
+            and isinstance(analysis.get("gap_score", 0.0), (int, float))
+        )
+    
+    async def analyze_skill_gaps_batch_async(
+        self,
+        profiles: List[Dict[str, Any]],
+        required_skills: List[str],
+        on_batch_done: Optional[Callable[[int], Awaitable[None]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze many profiles' skill gaps against one required-skills list
+        
+        profiles holds dicts with current_skills and target_role. Up to
+        AI_GAP_BATCH_PROFILES profiles share each Gemini call, so the
+        required skills are sent once per batch instead of once per profile;
+        batches run concurrently. A profile whose entry is missing or
+        malformed in the answer, or whose whole batch failed, gets the
+        offline fallback analysis. on_batch_done is awaited with the number
+        of profiles in each finished batch.
+        
+        Returns:
+            One analysis per profile, in order, shaped like analyze_skill_gaps
+        """
+        entries = [
+            {
+                "id": str(number),
+                "target_role": profile.get("target_role") or "Professional",
+                "current_skills": list(profile.get("current_skills") or [])
+            }
+            for number, profile in enumerate(profiles, start=1)
+        ]
+        results: List[Dict[str, Any]] = [{} for _ in profiles]
+        
+        async def run_batch(indexes: List[int]):
+            try:
+                answer = await self._generate_json_async(
+                    self._skill_gaps_batch_prompt(required_skills, [entries[i] for i in indexes]),
+                    parse=self._parse_batch_response,
+                    # Salvaged or garbage answers are used for this call only
+                    cacheable=lambda items: all(
+                        self._valid_gap_analysis(items.get(entries[i]["id"])) for i in indexes
+                    )
+                )
+            except Exception as e:
+                print(f"Error analyzing skill gaps for a batch of {len(indexes)} profiles: {e}")
+                print(f"  Using fallback gap analysis...")
+                answer = None
+            fallbacks = 0
+            for index in indexes:
+                analysis = answer.get(entries[index]["id"]) if answer else None
+                if self._valid_gap_analysis(analysis):
+                    results[index] = analysis
+                else:
+                    fallbacks += 1
+                    results[index] = self._analyze_gaps_fallback(
+                        entries[index]["current_skills"], required_skills, entries[index]["target_role"]
+                    )
+            if answer and fallbacks:
+                print(f"⚠ {fallbacks}/{len(indexes)} gap analyses in a batch were unusable; used fallback")
+            if on_batch_done:
+                await on_batch_done(len(indexes))
+        
+        batches = self._pack_batches([len(json.dumps(entry)) for entry in entries], AI_GAP_BATCH_PROFILES)
+        await asyncio.gather(*(run_batch(indexes) for indexes in batches))
+        return results
+    
     def _curriculum_recommendations_fallback(
         self,
         current_curriculum_skills: List[str],
@@ -458,18 +860,17 @@ class AIService:
             "note": "This is a basic analysis generated offline. For detailed AI recommendations, please try again later."
         }
 
-    def generate_curriculum_recommendations(
+    def _curriculum_recommendations_prompt(
         self,
         current_curriculum_skills: List[str],
         industry_skills: List[str],
         future_skills: List[str]
-    ) -> Dict[str, Any]:
-        """Generate curriculum improvement recommendations"""
+    ) -> str:
         current_str = ", ".join(current_curriculum_skills)
         industry_str = ", ".join(industry_skills)
         future_str = ", ".join(future_skills)
         
-        prompt = f"""
+        return f"""
         Analyze an academic curriculum and provide recommendations for improvement.
         
         Current curriculum skills: {current_str}
@@ -492,18 +893,36 @@ class AIService:
             "detailed_recommendations": "Text explanation"
         }}
         """
-        
+    
+    def generate_curriculum_recommendations(
+        self,
+        current_curriculum_skills: List[str],
+        industry_skills: List[str],
+        future_skills: List[str]
+    ) -> Dict[str, Any]:
+        """Generate curriculum improvement recommendations"""
         try:
-            rec_text = self._generate_content(prompt).strip()
-            if rec_text.startswith("```"):
-                rec_text = rec_text.split("```")[1]
-                if rec_text.startswith("json"):
-                    rec_text = rec_text[4:]
-            rec_text = rec_text.strip()
-            
-            import json
-            recommendations = json.loads(rec_text)
-            return recommendations
+            return self._generate_json(self._curriculum_recommendations_prompt(
+                current_curriculum_skills, industry_skills, future_skills
+            ))
+        except Exception as e:
+            print(f"Error generating curriculum recommendations with AI: {e}")
+            print(f"  Using fallback curriculum recommendations...")
+            return self._curriculum_recommendations_fallback(
+                current_curriculum_skills, industry_skills, future_skills
+            )
+    
+    async def generate_curriculum_recommendations_async(
+        self,
+        current_curriculum_skills: List[str],
+        industry_skills: List[str],
+        future_skills: List[str]
+    ) -> Dict[str, Any]:
+        """Async variant of generate_curriculum_recommendations"""
+        try:
+            return await self._generate_json_async(self._curriculum_recommendations_prompt(
+                current_curriculum_skills, industry_skills, future_skills
+            ))
         except Exception as e:
             print(f"Error generating curriculum recommendations with AI: {e}")
             print(f"  Using fallback curriculum recommendations...")
@@ -0,0 +1,399 @@
+"""
+Precomputed analytics snapshots for the dashboard endpoints
+
+The heatmap, trend growth and readiness dashboards are stored as one JSON
+row per view (kind and scope) in the analytics_snapshots table, so a
+dashboard load is a single-row read however large the catalog and user base
+grow. Session events watch writes to the source tables and mark the affected
+snapshots dirty in the same transaction; after the commit a background
+thread recomputes them. A read that still finds its snapshot dirty, missing
+or older than ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS recomputes it inline.
+
+The skill catalog is resolved before a recompute and passed in, so nothing
+inside AsyncSession.run_sync has to reload it.
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models import AnalyticsSnapshot, Curriculum, Skill, SkillGap, UserProfile
+from app.schemas import TrendAnalysisResponse
+from app.services.profile_skills import domain_coverage
+from app.services.skill_catalog import SkillCatalog, get_skill_catalog, get_skill_catalog_async
+from app.services.single_flight import SingleFlight
+from app.services.trend_refresh import trend_refresher
+from app.services.trend_store import load_series_many
+from app.services.trends_service import growth_rate
+
+# Snapshots older than this are recomputed on read even if nothing marked
+# them dirty (writes made outside an ORM session); 0 disables the check
+ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv("ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS", "3600"))
+# Delay before the refresher recomputes, so a burst of commits is refreshed once
+ANALYTICS_SNAPSHOT_REFRESH_DELAY_SECONDS = float(os.getenv("ANALYTICS_SNAPSHOT_REFRESH_DELAY_SECONDS", "2"))
+
+ALL_SCOPE = "all"
+# Kinds scoped by a skill domain, which comes from the request
+DOMAIN_SCOPED_KINDS = ("skill_heatmap", "trend_growth")
+TREND_GROWTH_DEFAULT_SKILLS = 10
+
+# Snapshot kinds recomputed when each source table changes
+SNAPSHOT_SOURCES: Dict[str, Tuple[str, ...]] = {
+    "skills": ("skill_heatmap", "trend_growth", "employability_readiness"),
+    "skill_trends": ("trend_growth",),
+    "skill_gaps": ("employability_readiness",),
+    "profile_skills": ("employability_readiness",),
+    "user_profiles": ("employability_readiness",),
+    "curricula": ("institution_readiness",),
+}
+
+# Invalidations collected during a transaction: kind -> scopes, or None for every scope
+_PENDING_KEY = "analytics_snapshot_invalidations"
+_INVALIDATED_KEY = "analytics_snapshots_invalidated"
+
+_snapshot_flight = SingleFlight("analytics_snapshots")
+
+def _domain_filter(scope: str) -> Optional[str]:
+    return None if scope == ALL_SCOPE else scope
+
+def compute_skill_heatmap(db: Session, scope: str, catalog: SkillCatalog) -> Dict[str, Any]:
+    """Demand scores and trend status of the catalog, or of one domain"""
+    return {
+        "skills": [
+            {
+                "skill": skill.name,
+                "domain": skill.domain,
+                "current_demand": skill.current_demand_score,
+                "future_demand": skill.future_demand_score,
+                "trend_status": skill.trend_status,
+                "category": skill.category
+            }
+            for skill in catalog.ranked(domain=_domain_filter(scope))
+        ]
+    }
+
+def trend_growth_for_skills(db: Session, skills: List) -> List[Dict[str, Any]]:
+    """
+    Stored trend history and growth of the given skills (catalog records),
+    from one range query over skill_trends. Skills with no stored history
+    are queued for a background refresh.
+    """
+    if not skills:
+        return []
+    since = datetime.now(timezone.utc) - timedelta(days=365)
+    history = load_series_many(db, [skill.id for skill in skills], since)
+
+    missing = [skill.name for skill in skills if skill.id not in history]
+    if missing:
+        trend_refresher.enqueue(missing)
+
+    results = []
+    for skill in skills:
+        dates, values = history.get(skill.id, (np.array([], dtype="datetime64[s]"), np.array([])))
+        values = np.nan_to_num(values)
+        trend_data = [
+            {"date": date, "value": value}
+            for date, value in zip(np.datetime_as_string(dates, unit='D').tolist(), values.tolist())
+        ]
+        results.append(TrendAnalysisResponse(
+            skill=skill.name,
+            trend_data=trend_data,
+            growth_rate=growth_rate(values),
+            classification=skill.trend_status or "saturated"
+        ).model_dump())
+    return results
+
+def compute_trend_growth(db: Session, scope: str, catalog: SkillCatalog) -> Dict[str, Any]:
+    """Trend history of the top emerging and high-growth skills"""
+    skills = catalog.ranked(
+        domain=_domain_filter(scope),
+        trend_statuses=["emerging", "high-growth"],
+        limit=TREND_GROWTH_DEFAULT_SKILLS
+    )
+    return {"trends": trend_growth_for_skills(db, skills)}
+
+def compute_employability_readiness(db: Session, scope: str, catalog: SkillCatalog) -> Dict[str, Any]:
+    """Readiness of a user's profile from its skill gaps and domain coverage"""
+    profile = db.execute(
+        select(UserProfile.id, UserProfile.domain).where(UserProfile.user_id == int(scope)).limit(1)
+    ).first()
+    if not profile:
+        return {"readiness_score": 0.0, "message": "Please upload a resume first"}
+
+    # Calculate readiness based on skill gaps
+    skill_gaps = db.execute(
+        select(SkillGap.gap_score, SkillGap.priority).where(SkillGap.profile_id == profile.id)
+    ).all()
+    if not skill_gaps:
+        return {"readiness_score": 0.0, "message": "Please run skill gap analysis first"}
+
+    # Calculate average gap (inverse of readiness)
+    avg_gap = sum(gap.gap_score or 0.0 for gap in skill_gaps) / len(skill_gaps)
+    readiness_score = (1.0 - avg_gap) * 100
+
+    # Get domain-specific readiness from the indexed profile_skills join
+    skills_covered, total_domain_skills = domain_coverage(db, profile.id, profile.domain, catalog)
+    domain_coverage_ratio = skills_covered / total_domain_skills if total_domain_skills else 0.0
+
+    return {
+        "readiness_score": readiness_score,
+        "domain_coverage": domain_coverage_ratio * 100,
+        "total_skills_required": total_domain_skills,
+        "skills_covered": skills_covered,
+        "priority_gaps": len([gap for gap in skill_gaps if gap.priority == "high"])
+    }
+
+def compute_institution_readiness(db: Session, scope: str, catalog: SkillCatalog) -> Dict[str, Any]:
+    """Average readiness scores across an institution's curricula"""
+    recommendations = db.scalars(
+        select(Curriculum.recommendations).where(Curriculum.institution_id == int(scope))
+    ).all()
+    if not recommendations:
+        return {
+            "placement_readiness": 0.0,
+            "industry_collaboration": 0.0,
+            "accreditation": 0.0,
+            "message": "Please upload curricula first"
+        }
+
+    # Aggregate readiness scores
+    total_readiness = {
+        "placement": 0.0,
+        "industry_collaboration": 0.0,
+        "accreditation": 0.0
+    }
+    for curriculum_recommendations in recommendations:
+        if curriculum_recommendations:
+            readiness = curriculum_recommendations.get("readiness_scores", {})
+            total_readiness["placement"] += readiness.get("placements", 0.0)
+            total_readiness["industry_collaboration"] += readiness.get("industry_collaboration", 0.0)
+            total_readiness["accreditation"] += readiness.get("accreditation", 0.0)
+
+    count = len(recommendations)
+    return {
+        "placement_readiness": total_readiness["placement"] / count * 100,
+        "industry_collaboration": total_readiness["industry_collaboration"] / count * 100,
+        "accreditation": total_readiness["accreditation"] / count * 100,
+        "total_curricula": count
+    }
+
+SNAPSHOT_KINDS: Dict[str, Callable[[Session, str, SkillCatalog], Dict[str, Any]]] = {
+    "skill_heatmap": compute_skill_heatmap,
+    "trend_growth": compute_trend_growth,
+    "employability_readiness": compute_employability_readiness,
+    "institution_readiness": compute_institution_readiness,
+}
+
+def _is_expired(computed_at: Optional[datetime]) -> bool:
+    if computed_at is None:
+        return True
+    if not ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS:
+        return False
+    if computed_at.tzinfo is None:
+        computed_at = computed_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - computed_at > timedelta(seconds=ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS)
+
+def _snapshot_query(kind: str, scope: str):
+    return select(
+        AnalyticsSnapshot.id, AnalyticsSnapshot.payload, AnalyticsSnapshot.dirty,
+        AnalyticsSnapshot.version, AnalyticsSnapshot.computed_at
+    ).where(AnalyticsSnapshot.kind == kind, AnalyticsSnapshot.scope == scope)
+
+def refresh_snapshot(db: Session, kind: str, scope: str, catalog: SkillCatalog) -> Dict[str, Any]:
+    """
+    Recompute and store one snapshot from a verified catalog. Does not commit.
+
+    The row is only marked clean if no invalidation bumped its version while
+    the payload was being computed; otherwise it stays dirty for the next
+    refresh.
+    """
+    row = db.execute(_snapshot_query(kind, scope)).first()
+    payload = SNAPSHOT_KINDS[kind](db, scope, catalog)
+    now = datetime.now(timezone.utc)
+    if row is None:
+        try:
+            with db.begin_nested():
+                db.execute(AnalyticsSnapshot.__table__.insert().values(
+                    kind=kind, scope=scope, payload=payload, dirty=False, version=0, computed_at=now
+                ))
+        except IntegrityError:
+            pass  # stored concurrently by another request or worker
+    else:
+        db.execute(update(AnalyticsSnapshot.__table__).where(
+            AnalyticsSnapshot.id == row.id, AnalyticsSnapshot.version == row.version
+        ).values(payload=payload, dirty=False, computed_at=now))
+    return payload
+
+async def _refresh_in_new_session(kind: str, scope: str) -> Dict[str, Any]:
+    # Coalesced callers share this task, so it must not borrow any one caller's session
+    catalog = await get_skill_catalog_async(verify=True)
+    async with AsyncSessionLocal() as session:
+        payload = await session.run_sync(refresh_snapshot, kind, scope, catalog)
+        await session.commit()
+    return payload
+
+async def read_snapshot(db: AsyncSession, kind: str, scope: str = ALL_SCOPE) -> Dict[str, Any]:
+    """
+    A dashboard payload from its snapshot row
+
+    Dirty, missing or expired snapshots are recomputed first; concurrent
+    reads of the same snapshot share one recomputation. A domain scope
+    that has no skills in the catalog is computed without storing a row,
+    so arbitrary ?domain= values cannot grow the table.
+    """
+    if kind in DOMAIN_SCOPED_KINDS and scope != ALL_SCOPE:
+        catalog = await get_skill_catalog_async()
+        if not catalog.in_domain(scope):
+            return await db.run_sync(SNAPSHOT_KINDS[kind], scope, catalog)
+    row = (await db.execute(_snapshot_query(kind, scope))).first()
+    if row is not None and not row.dirty and not _is_expired(row.computed_at):
+        return row.payload
+    return await _snapshot_flight.do((kind, scope), lambda: _refresh_in_new_session(kind, scope))
+
+def refresh_dirty_snapshots(db: Session) -> int:
+    """Recompute every dirty snapshot, committing after each one"""
+    rows = db.execute(
+        select(AnalyticsSnapshot.kind, AnalyticsSnapshot.scope).where(AnalyticsSnapshot.dirty.is_(True))
+    ).all()
+    if not rows:
+        return 0
+    # Runs in the refresher's own thread and session, so a sync load is safe here
+    catalog = get_skill_catalog(db, verify=True)
+    refreshed = 0
+    for kind, scope in rows:
+        if kind not in SNAPSHOT_KINDS:
+            continue
+        try:
+            refresh_snapshot(db, kind, scope, catalog)
+            db.commit()
+            refreshed += 1
+        except Exception as e:
+            db.rollback()
+            print(f"⚠ Analytics snapshot refresh failed for {kind}/{scope}: {e}")
+    return refreshed
+
+class SnapshotRefresher:
+    """Background thread that recomputes dirty snapshots after commits"""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics-snapshots", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self._wake.wait(timeout=1.0):
+                continue
+            if self._stop.wait(ANALYTICS_SNAPSHOT_REFRESH_DELAY_SECONDS):
+                break
+            self._wake.clear()
+            db = SessionLocal()
+            try:
+                refreshed = refresh_dirty_snapshots(db)
+                if refreshed:
+                    print(f"✓ Refreshed {refreshed} analytics snapshots")
+            except Exception as e:
+                print(f"⚠ Analytics snapshot refresh failed: {e}")
+            finally:
+                db.close()
+
+snapshot_refresher = SnapshotRefresher()
+
+def _invalidate(session: Session, kind: str, scopes: Optional[Iterable[str]]):
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    if kind in pending and pending[kind] is None:
+        return
+    if scopes is None:
+        pending[kind] = None
+    else:
+        pending.setdefault(kind, set()).update(scopes)
+
+def _attribute_values(instance, name: str) -> Optional[Set]:
+    """Current and previous values of an attribute, None if not loaded"""
+    history = inspect(instance).attrs[name].history
+    values = set(history.added or ()) | set(history.unchanged or ()) | set(history.deleted or ())
+    return values or None
+
+def _instance_scopes(kind: str, instance) -> Optional[Set[str]]:
+    """Scopes of kind affected by a changed row, None when it may affect any"""
+    if kind == "skill_heatmap" and isinstance(instance, Skill):
+        domains = _attribute_values(instance, "domain")
+        if domains is None:
+            return None
+        return {ALL_SCOPE} | {domain for domain in domains if domain}
+    if kind == "employability_readiness" and isinstance(instance, UserProfile):
+        user_ids = _attribute_values(instance, "user_id")
+        return {str(user_id) for user_id in user_ids} if user_ids else None
+    if kind == "institution_readiness" and isinstance(instance, Curriculum):
+        institution_ids = _attribute_values(instance, "institution_id")
+        return {str(institution_id) for institution_id in institution_ids} if institution_ids else None
+    return None
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_changes(session, flush_context):
+    for instances, check_modified in ((session.new, False), (session.dirty, True), (session.deleted, False)):
+        for instance in instances:
+            kinds = SNAPSHOT_SOURCES.get(getattr(instance, "__tablename__", None))
+            if not kinds or (check_modified and not session.is_modified(instance)):
+                continue
+            for kind in kinds:
+                _invalidate(session, kind, _instance_scopes(kind, instance))
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    # Bulk inserts, updates and deletes bypass the unit of work and its flush events
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    for kind in SNAPSHOT_SOURCES.get(getattr(table, "name", None), ()):
+        _invalidate(orm_execute_state.session, kind, None)
+
+@event.listens_for(Session, "before_commit")
+def _mark_snapshots_dirty(session):
+    # Commit flushes after this hook, so flush first to collect every change
+    session.flush()
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    table = AnalyticsSnapshot.__table__
+    connection = session.connection()
+    for kind, scopes in pending.items():
+        statement = update(table).where(table.c.kind == kind)
+        if scopes is not None:
+            statement = statement.where(table.c.scope.in_(sorted(scopes)))
+        connection.execute(statement.values(dirty=True, version=table.c.version + 1))
+    session.info[_INVALIDATED_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _wake_refresher(session):
+    if session.info.pop(_INVALIDATED_KEY, False):
+        snapshot_refresher.wake()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_INVALIDATED_KEY, None)
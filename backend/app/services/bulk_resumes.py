@@ -0,0 +1,182 @@
+"""
+Bulk resume ingestion for cohort uploads
+
+A placement cell uploads a whole cohort at once. Each resume becomes a
+student user with its own profile; skills are extracted several resumes per
+Gemini call, and users, profiles and profile skills are written with bulk
+statements rather than row by row.
+"""
+
+import hashlib
+import re
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import User, UserProfile
+from app.services.ai_service import AIService
+from app.services.profile_skills import sync_profile_skills_many
+from app.services.skill_catalog import SkillCatalog, get_skill_catalog_async
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Bulk-created students cannot log in until they set a password
+UNUSABLE_PASSWORD = "!"
+
+def resume_email(text: str) -> str:
+    """
+    The first email address in a resume, lower-cased
+
+    Resumes without one get a stable placeholder derived from their text, so
+    uploading the same resume again updates the same student.
+    """
+    match = _EMAIL.search(text)
+    if match:
+        return match.group(0).lower().rstrip(".")
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    return f"resume-{digest}@bulk-upload.invalid"
+
+def store_resume_profiles(
+    db: Session,
+    resumes: List[Tuple[str, str, List[str]]],
+    domain: Optional[str],
+    target_role: Optional[str],
+    catalog: SkillCatalog
+) -> List[Dict]:
+    """
+    Create or update a student and profile per resume with bulk statements
+
+    resumes holds (email, resume text, skills). Students matched by email
+    have their first profile overwritten. Does not commit.
+
+    Returns:
+        Per resume, a dict with user_id, profile_id and email
+    """
+    emails = [email for email, _, _ in resumes]
+    user_ids = dict(db.execute(select(User.email, User.id).where(User.email.in_(emails))).all())
+    new_users = [
+        {"email": email, "hashed_password": UNUSABLE_PASSWORD, "user_type": "student"}
+        for email in dict.fromkeys(emails) if email not in user_ids
+    ]
+    if new_users:
+        user_ids.update(
+            (email, user_id) for user_id, email in db.execute(
+                insert(User).returning(User.id, User.email), new_users
+            )
+        )
+
+    profile_ids = {}
+    for profile_id, user_id in db.execute(
+        select(UserProfile.id, UserProfile.user_id).where(
+            UserProfile.user_id.in_(list(user_ids.values()))
+        ).order_by(UserProfile.id)
+    ):
+        profile_ids.setdefault(user_id, profile_id)
+
+    values = [
+        {
+            "user_id": user_ids[email],
+            "resume_text": text,
+            "domain": domain,
+            "target_role": target_role,
+            "current_skills": skills
+        }
+        for email, text, skills in resumes
+    ]
+    updates = [
+        {"id": profile_ids[row["user_id"]], **row} for row in values if row["user_id"] in profile_ids
+    ]
+    if updates:
+        db.execute(update(UserProfile), updates)
+    new_profiles = [row for row in values if row["user_id"] not in profile_ids]
+    if new_profiles:
+        profile_ids.update(
+            (user_id, profile_id) for profile_id, user_id in db.execute(
+                insert(UserProfile).returning(UserProfile.id, UserProfile.user_id), new_profiles
+            )
+        )
+
+    sync_profile_skills_many(db, {
+        profile_ids[user_ids[email]]: skills for email, _, skills in resumes
+    }, catalog)
+    return [
+        {"email": email, "user_id": user_ids[email], "profile_id": profile_ids[user_ids[email]]}
+        for email, _, _ in resumes
+    ]
+
+async def ingest_resumes(
+    db: AsyncSession,
+    ai_service: AIService,
+    documents: List[Dict],
+    domain: Optional[str] = None,
+    target_role: Optional[str] = None,
+    report: Optional[Callable[[int, str], Awaitable[None]]] = None,
+    started_at: Optional[float] = None
+) -> Dict:
+    """
+    Extract skills from a batch of resumes and store a profile for each
+
+    documents holds dicts with filename plus either text or error (as
+    produced from ExtractedDocument). A resume whose email already appeared
+    earlier in the batch is reported as a duplicate. report, when given, is
+    awaited with a percentage and message as batches finish. started_at is
+    the time.perf_counter() at which the upload began, so that throughput
+    includes text extraction.
+
+    Returns:
+        The BulkResumeUploadResponse fields, including resumes per minute
+    """
+    started = started_at if started_at is not None else time.perf_counter()
+    results = []
+    pending = []  # (result, email, text)
+    seen = {}
+    for document in documents:
+        result = {"filename": document["filename"], "skills": [], "error": document.get("error")}
+        results.append(result)
+        text = document.get("text")
+        if result["error"]:
+            continue
+        if not text or not text.strip():
+            result["error"] = "No text could be extracted"
+            continue
+        email = resume_email(text)
+        if email in seen:
+            result["error"] = f"Duplicate of {seen[email]}"
+            continue
+        seen[email] = document["filename"]
+        pending.append((result, email, text))
+
+    if pending:
+        done = 0
+
+        async def batch_done(count: int):
+            nonlocal done
+            done += count
+            if report:
+                await report(10 + int(80 * done / len(pending)), f"Extracted skills from {done}/{len(pending)} resumes")
+
+        skill_lists = await ai_service.extract_skills_from_resumes_batch_async(
+            [text for _, _, text in pending], on_batch_done=batch_done
+        )
+        catalog = await get_skill_catalog_async()
+        stored = await db.run_sync(store_resume_profiles, [
+            (email, text, skills) for (_, email, text), skills in zip(pending, skill_lists)
+        ], domain, target_role, catalog)
+        await db.commit()
+        for (result, _, _), skills, ids in zip(pending, skill_lists, stored):
+            result.update(ids, skills=skills)
+
+    elapsed = time.perf_counter() - started
+    processed = len(pending)
+    rate = processed / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"✓ Ingested {processed}/{len(documents)} resumes in {elapsed:.1f}s ({rate:.0f} resumes/min)")
+    return {
+        "total": len(documents),
+        "processed": processed,
+        "failed": len(documents) - processed,
+        "elapsed_seconds": round(elapsed, 3),
+        "resumes_per_minute": round(rate, 1),
+        "results": results
+    }
@@ -0,0 +1,163 @@
+"""
+Persistent, content-addressed cache for AI model responses
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / '.cache' / 'ai_responses.db'
+
+# Expired and over-limit entries are evicted at most this often, or sooner
+# once a tenth of max_entries has been written since the last eviction
+AI_CACHE_EVICT_INTERVAL_SECONDS = float(os.getenv("AI_CACHE_EVICT_INTERVAL_SECONDS", "300"))
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with TTL expiry and LRU eviction.
+
+    Entries are keyed by a hash of the model name and the whitespace-normalized
+    prompt, so identical inputs map to the same entry across restarts and
+    across workers sharing the same file. Every operation is blocking
+    SQLite I/O; async code uses get_async/set_async, which run it in a
+    worker thread.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: int, max_entries: int):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._evict_every = max(1, max_entries // 10)
+        self._writes_since_evict = 0
+        self._evicted_at = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ai_response_cache ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_ai_response_cache_accessed_at"
+            " ON ai_response_cache (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_ai_response_cache_created_at"
+            " ON ai_response_cache (created_at)"
+        )
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Hash the model name and normalized prompt into a cache key"""
+        normalized = " ".join(prompt.split())
+        return hashlib.sha256(f"{model}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM ai_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM ai_response_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE ai_response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, model: str, value: Any):
+        """Store a JSON-serializable value, evicting old entries every so many writes"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_response_cache (key, model, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(value), now, now)
+            )
+            self._writes_since_evict += 1
+            if (
+                self._writes_since_evict >= self._evict_every
+                or time.monotonic() - self._evicted_at >= AI_CACHE_EVICT_INTERVAL_SECONDS
+            ):
+                self._evict(now)
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """get without blocking the event loop"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, model: str, value: Any):
+        """set without blocking the event loop"""
+        await asyncio.to_thread(self.set, key, model, value)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the least recently used ones over max_entries"""
+        expired = self._conn.execute(
+            "DELETE FROM ai_response_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        overflow = self._conn.execute(
+            "DELETE FROM ai_response_cache WHERE key IN ("
+            " SELECT key FROM ai_response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        self.evictions += max(expired, 0) + max(overflow, 0)
+        self._writes_since_evict = 0
+        self._evicted_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM ai_response_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM ai_response_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the shared response cache, or None when AI_CACHE_ENABLED is off"""
+    global _response_cache
+    if os.getenv("AI_CACHE_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    path=Path(os.getenv("AI_CACHE_PATH", str(DEFAULT_CACHE_PATH))),
+                    ttl_seconds=int(os.getenv("AI_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+                    max_entries=int(os.getenv("AI_CACHE_MAX_ENTRIES", "5000")),
+                )
+    return _response_cache
@@ -0,0 +1,196 @@
+"""
+Local pre-pass that shrinks documents before skill extraction prompts
+
+Resumes and syllabi carry a lot of text that does not help Gemini find
+skills: repeated page headers and footers, contact details, references,
+and lists of skills the catalog matcher already recognizes. This module
+removes that locally and leaves Gemini with a list of candidate skills to
+confirm plus only the spans the matcher could not account for.
+"""
+
+import os
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.services.skill_matcher import SkillMatcher, get_skill_matcher
+
+DOC_PREP_ENABLED = os.getenv("DOC_PREP_ENABLED", "true").lower() in ("1", "true", "yes")
+# Documents shorter than this are sent whole; the pre-pass would save little
+DOC_PREP_MIN_CHARS = int(os.getenv("DOC_PREP_MIN_CHARS", "1500"))
+# Upper bound on the unmatched excerpt sent along with the candidates
+DOC_PREP_MAX_EXCERPT_CHARS = int(os.getenv("DOC_PREP_MAX_EXCERPT_CHARS", "6000"))
+
+# Sections that never contain skills
+IRRELEVANT_SECTIONS = re.compile(
+    r"^(references?|referees|declaration|personal (details|information|profile)|contact( details| information)?|"
+    r"address|hobbies|interests|languages known|passport|marital status|date of birth|signature|"
+    r"text ?books?|reference books?|bibliography|suggested readings?|web resources|"
+    r"examination scheme|evaluation scheme|marks distribution|assessment pattern)$",
+    re.IGNORECASE
+)
+_HEADING_WORDS = re.compile(
+    r"^(skills?|technical skills|core competencies|tools|technologies|experience|work experience|"
+    r"employment|projects?|education|certifications?|achievements|summary|objective|profile|"
+    r"course (objectives?|outcomes?|content|description)|syllabus|unit\s+[ivx\d]+|module\s+\d+|"
+    r"prerequisites?|learning outcomes?|lab(oratory)? experiments?|(course|subject|paper)\s+\d+)\b",
+    re.IGNORECASE
+)
+_PAGE_FURNITURE = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+_SEPARATORS = re.compile(r"[\s,;:|/•·●▪◦\-–—()\[\]{}.&+]+")
+# Emails, links and profile domains; bare domains are limited to endings
+# that tool names (Node.js, Socket.io, ASP.NET) do not use
+_CONTACT = re.compile(
+    r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+|(?:https?://|www\.)\S+|"
+    r"\b[\w-]+(?:\.[\w-]+)*\.(?:com|org|in|co|me)\b(?:/\S*)?|\b[\w-]+\.github\.io\b\S*",
+    re.IGNORECASE
+)
+_PHONE = re.compile(r"(?<![\w.])\+?\(?\d[\d\s().-]{6,}\d(?![\w.])")
+# Digit groups of dates and year ranges ("2019 - 2023", "06.2019 - 05.2023")
+_DATE_GROUP = re.compile(r"(19|20)\d\d|\d{1,2}")
+_CONTACT_LABELS = re.compile(
+    r"\b(e-?mail|phone|mobile|mob|tel|cell|contact|linkedin|github|portfolio|website|web)\b",
+    re.IGNORECASE
+)
+
+class PreparedDocument(NamedTuple):
+    candidates: List[str]   # skills the matcher found, for Gemini to confirm
+    excerpt: str            # relevant lines the matcher could not account for
+    original_chars: int
+
+def _is_heading(line: str) -> bool:
+    if len(line) > 60 or line.endswith("."):
+        return False
+    bare = line.rstrip(":").strip()
+    return bool(_HEADING_WORDS.match(bare) or IRRELEVANT_SECTIONS.match(bare)
+                or line.endswith(":") or (bare.isupper() and len(bare.split()) <= 6))
+
+def _is_generic_heading(heading: str) -> bool:
+    """Structural headings ("Course Outcomes", "Skills") as opposed to ones naming a topic"""
+    match = _HEADING_WORDS.match(heading)
+    return bool(match) and match.end() == len(heading)
+
+def dedupe_lines(text: str) -> List[str]:
+    """
+    Non-empty lines with repeated boilerplate removed
+
+    A line seen before (ignoring case and digits, so "Page 3 of 12" style
+    headers and footers collapse) is kept only once; bare page numbers are
+    dropped. Headings are kept every time, since each one starts a section.
+    """
+    seen = set()
+    lines = []
+    for raw in text.splitlines():
+        line = " ".join(raw.split())
+        if not line or _PAGE_FURNITURE.match(line):
+            continue
+        fingerprint = _DIGITS.sub("#", line.casefold())
+        if fingerprint in seen and not _is_heading(line):
+            continue
+        seen.add(fingerprint)
+        lines.append(line)
+    return lines
+
+def split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """Group lines under the heading that precedes them ("" before the first heading)"""
+    sections = [("", [])]
+    for line in lines:
+        if _is_heading(line):
+            sections.append((line.rstrip(":").strip(), []))
+        else:
+            sections[-1][1].append(line)
+    return [(heading, body) for heading, body in sections if heading or body]
+
+def _is_phone(candidate: str) -> bool:
+    """10-15 digits that are not just dates or years"""
+    groups = _DIGITS.findall(candidate)
+    if not 10 <= sum(len(group) for group in groups) <= 15:
+        return False
+    return not all(_DATE_GROUP.fullmatch(group) for group in groups)
+
+def _contact_spans(line: str) -> List[Tuple[int, int]]:
+    """Sorted, non-overlapping spans of emails, links and phone numbers in a line"""
+    spans = sorted(
+        [match.span() for match in _CONTACT.finditer(line)]
+        + [match.span() for match in _PHONE.finditer(line) if _is_phone(match.group(0))]
+    )
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+def _is_contact_line(line: str, spans: List[Tuple[int, int]]) -> bool:
+    """Whether contact details make up most of a line, labels such as "Email:" aside"""
+    contact_chars = sum(end - start for start, end in spans)
+    other = _SEPARATORS.sub("", _CONTACT_LABELS.sub(" ", _residual(line, spans)))
+    return contact_chars >= len(other)
+
+def _residual(line: str, spans: List[Tuple[int, int]]) -> str:
+    """The line with matched spans and list separators removed"""
+    parts, cursor = [], 0
+    for start, end in spans:
+        parts.append(line[cursor:start])
+        cursor = end
+    parts.append(line[cursor:])
+    return _SEPARATORS.sub(" ", " ".join(parts)).strip()
+
+def prepare_document(
+    text: str,
+    matcher: Optional[SkillMatcher] = None,
+    min_chars: int = DOC_PREP_MIN_CHARS,
+    max_excerpt_chars: int = DOC_PREP_MAX_EXCERPT_CHARS
+) -> Optional[PreparedDocument]:
+    """
+    Reduce a document to candidate skills plus the unmatched relevant text
+
+    Returns None when the pre-pass is disabled or the document is short
+    enough to send as is.
+    """
+    if not DOC_PREP_ENABLED or not text or len(text) < min_chars:
+        return None
+    matcher = matcher or get_skill_matcher()
+
+    candidates = {}
+    excerpt_lines = []
+    excerpt_chars = 0
+    for heading, body in split_sections(dedupe_lines(text)):
+        if heading and IRRELEVANT_SECTIONS.match(heading):
+            continue
+        # Topic headings such as "Course 2: Database Systems" are content too
+        label = [f"[{heading}]"] if heading else []
+        if heading and not _is_generic_heading(heading):
+            for _, _, name in matcher.finditer(heading):
+                candidates.setdefault(name, None)
+        section_lines = []
+        for line in body:
+            contact = _contact_spans(line)
+            spans = []
+            for start, end, name in matcher.finditer(line):
+                # "python.org" in an email address is not a skill
+                if any(start < contact_end and end > contact_start for contact_start, contact_end in contact):
+                    continue
+                candidates.setdefault(name, None)
+                spans.append((start, end))
+            # Lines that are mostly contact details (email, phone, profile
+            # links) name no skills; a line with a skill match is always kept
+            if contact and not spans and _is_contact_line(line, contact):
+                continue
+            residual = _residual(line, spans)
+            # Lines fully explained by matches (e.g. "Python, SQL, Docker") add nothing
+            if len(residual) < 3 or not re.search(r"[A-Za-z]{2}", residual):
+                continue
+            section_lines.append(line)
+        if (section_lines or (label and not _is_generic_heading(heading))) and excerpt_chars < max_excerpt_chars:
+            block = "\n".join(label + section_lines)
+            block = block[:max_excerpt_chars - excerpt_chars]
+            excerpt_lines.append(block)
+            excerpt_chars += len(block)
+
+    return PreparedDocument(
+        candidates=list(candidates),
+        excerpt="\n\n".join(excerpt_lines),
+        original_chars=len(text)
+    )
@@ -0,0 +1,349 @@
+"""
+Document text extraction shared by resume and curriculum uploads
+
+Uploads are streamed to a temp file in chunks while being hashed, so large
+files never sit in memory whole. PDF parsing is CPU-bound, so it runs in
+worker processes instead of on the event loop; a worker stuck on a hostile
+PDF is killed and replaced. Extracted text is cached by
+content hash so re-uploading the same file skips parsing entirely. Bulk
+uploads (several files or a zip archive) are extracted concurrently.
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+DOCUMENT_MAX_BYTES = int(os.getenv("DOCUMENT_MAX_BYTES", str(20 * 1024 * 1024)))
+# Pages beyond this limit are ignored
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "300"))
+PDF_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("PDF_EXTRACT_TIMEOUT_SECONDS", "60"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+DOCUMENT_CACHE_ENTRIES = int(os.getenv("DOCUMENT_CACHE_ENTRIES", "128"))
+# Most documents accepted in one bulk upload, counting files inside archives
+BULK_MAX_DOCUMENTS = int(os.getenv("BULK_MAX_DOCUMENTS", "500"))
+BULK_ARCHIVE_MAX_BYTES = int(os.getenv("BULK_ARCHIVE_MAX_BYTES", str(200 * 1024 * 1024)))
+SUPPORTED_EXTENSIONS = (".pdf", ".txt")
+
+def extract_pdf_pages(path: str, max_pages: int) -> Tuple[str, int]:
+    """
+    Extract the text of a PDF on disk; runs inside a PDF worker process
+
+    Returns:
+        (text, total_pages) where text holds at most max_pages pages
+    """
+    import PyPDF2
+
+    with open(path, "rb") as pdf_file:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        total_pages = len(pdf_reader.pages)
+        pages = [
+            pdf_reader.pages[i].extract_text() or ""
+            for i in range(min(total_pages, max_pages))
+        ]
+    return "\n".join(pages), total_pages
+
+class TextCache:
+    """Small LRU of extracted text keyed by content hash"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(digest)
+            if text is not None:
+                self._entries.move_to_end(digest)
+            return text
+
+    def set(self, digest: str, text: str):
+        with self._lock:
+            self._entries[digest] = text
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+_text_cache = TextCache(DOCUMENT_CACHE_ENTRIES)
+
+def _pdf_worker_main(conn):
+    """Entry point of a PDF worker process: extract documents until the pipe closes"""
+    while True:
+        try:
+            path, max_pages = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, extract_pdf_pages(path, max_pages)))
+        except Exception as e:
+            conn.send((False, str(e)))
+
+class PdfWorkerCrashed(Exception):
+    pass
+
+class PdfWorker:
+    """One PDF worker process, fed documents over a pipe"""
+
+    def __init__(self):
+        # spawn: forking a process that runs background threads is unsafe
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_pdf_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def extract(self, path: str, max_pages: int, timeout: float) -> Tuple[str, int]:
+        """
+        Extract a PDF in the worker process
+
+        Raises TimeoutError when the worker takes longer than timeout and
+        PdfWorkerCrashed when it dies; either way the worker is unusable.
+        """
+        try:
+            self._conn.send((path, max_pages))
+            finished = self._conn.poll(timeout)
+            if finished:
+                ok, result = self._conn.recv()
+        except (EOFError, OSError):
+            raise PdfWorkerCrashed
+        if not finished:
+            raise TimeoutError
+        if not ok:
+            raise ValueError(result)
+        return result
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self._conn.close()
+
+# Each thread of the PDF executor drives its own worker process, so at most
+# PDF_WORKERS documents are parsed at once and the timeout covers only parsing,
+# not time spent queueing behind other uploads
+_pdf_executor: Optional[ThreadPoolExecutor] = None
+_pdf_executor_lock = threading.Lock()
+_pdf_thread_state = threading.local()
+_pdf_workers = set()
+
+def _get_pdf_executor() -> ThreadPoolExecutor:
+    global _pdf_executor
+    if _pdf_executor is None:
+        with _pdf_executor_lock:
+            if _pdf_executor is None:
+                _pdf_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix="pdf")
+    return _pdf_executor
+
+def _extract_pdf_in_worker(path: str, max_pages: int) -> Tuple[str, int]:
+    worker = getattr(_pdf_thread_state, "worker", None)
+    if worker is None:
+        worker = _pdf_thread_state.worker = PdfWorker()
+        with _pdf_executor_lock:
+            _pdf_workers.add(worker)
+    try:
+        return worker.extract(path, max_pages, PDF_EXTRACT_TIMEOUT_SECONDS)
+    except (TimeoutError, PdfWorkerCrashed):
+        # A hung worker would keep its slot busy; the next document gets a fresh process
+        _pdf_thread_state.worker = None
+        with _pdf_executor_lock:
+            _pdf_workers.discard(worker)
+        worker.kill()
+        raise
+
+def shutdown_pdf_workers():
+    """Stop the PDF worker processes (called on application shutdown)"""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        executor, _pdf_executor = _pdf_executor, None
+        workers = list(_pdf_workers)
+        _pdf_workers.clear()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    for worker in workers:
+        worker.kill()
+
+async def spool_upload(file: UploadFile, max_bytes: int = DOCUMENT_MAX_BYTES) -> Tuple[str, str, int]:
+    """
+    Stream an upload to a temp file, hashing it on the way
+
+    Returns:
+        (path, sha256 hex digest, size in bytes); the caller removes the file
+    """
+    digest = hashlib.sha256()
+    size = 0
+    suffix = os.path.splitext(file.filename or "")[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spool:
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File is larger than the {max_bytes // (1024 * 1024)} MB limit"
+                    )
+                digest.update(chunk)
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            os.unlink(spool.name)
+            raise
+    return spool.name, digest.hexdigest(), size
+
+async def _extract_pdf(path: str) -> str:
+    loop = asyncio.get_running_loop()
+    try:
+        text, total_pages = await loop.run_in_executor(
+            _get_pdf_executor(), _extract_pdf_in_worker, path, PDF_MAX_PAGES
+        )
+    except TimeoutError:
+        raise HTTPException(status_code=400, detail="Error reading PDF: extraction timed out")
+    except PdfWorkerCrashed:
+        # e.g. out of memory; the worker has been replaced for the next upload
+        raise HTTPException(status_code=400, detail="Error reading PDF: extraction worker crashed")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
+    if total_pages > PDF_MAX_PAGES:
+        print(f"⚠ PDF has {total_pages} pages, only the first {PDF_MAX_PAGES} were read")
+    return text
+
+def _read_text_file(path: str) -> str:
+    with open(path, "rb") as text_file:
+        content = text_file.read()
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Text files must be UTF-8 encoded")
+
+async def _extract_spooled(path: str, digest: str, filename: str) -> str:
+    cached = _text_cache.get(digest)
+    if cached is not None:
+        return cached
+    if filename.lower().endswith(".pdf"):
+        text = await _extract_pdf(path)
+    else:
+        text = await asyncio.to_thread(_read_text_file, path)
+    _text_cache.set(digest, text)
+    return text
+
+async def extract_upload_text(file: UploadFile) -> str:
+    """Extract the text of an uploaded PDF or UTF-8 text file"""
+    path, digest, _ = await spool_upload(file)
+    try:
+        return await _extract_spooled(path, digest, file.filename or "")
+    finally:
+        os.unlink(path)
+
+class ExtractedDocument(NamedTuple):
+    filename: str
+    text: Optional[str]
+    error: Optional[str]
+
+def _unpack_archive(path: str, max_members: int) -> List[Tuple[str, str, str]]:
+    """
+    Copy the supported files in a zip archive to temp files, hashing them
+
+    Returns:
+        (member name, temp path, sha256 hex digest) per file, with an empty
+        digest for files over DOCUMENT_MAX_BYTES; the caller removes the
+        temp files
+    """
+    unpacked = []
+    try:
+        with zipfile.ZipFile(path) as archive:
+            members = [
+                info for info in archive.infolist()
+                if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+                and info.filename.lower().endswith(SUPPORTED_EXTENSIONS)
+            ]
+            if len(members) > max_members:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Archive holds more than {max_members} documents"
+                )
+            for info in members:
+                spool = tempfile.NamedTemporaryFile(
+                    suffix=os.path.splitext(info.filename)[1], delete=False
+                )
+                unpacked.append((info.filename, spool.name, ""))
+                digest = hashlib.sha256()
+                size = 0
+                # Sizes in the archive directory can lie, so the copy itself is capped
+                with spool, archive.open(info) as member:
+                    while chunk := member.read(UPLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > DOCUMENT_MAX_BYTES:
+                            break
+                        digest.update(chunk)
+                        spool.write(chunk)
+                if size <= DOCUMENT_MAX_BYTES:
+                    unpacked[-1] = (info.filename, spool.name, digest.hexdigest())
+    except zipfile.BadZipFile:
+        _remove_files(path for _, path, _ in unpacked)
+        raise HTTPException(status_code=400, detail="Invalid zip archive")
+    except BaseException:
+        _remove_files(path for _, path, _ in unpacked)
+        raise
+    return unpacked
+
+def _remove_files(paths):
+    for path in paths:
+        if path:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+async def extract_upload_texts(files: List[UploadFile]) -> List[ExtractedDocument]:
+    """
+    Extract the text of every document in a bulk upload
+
+    Accepts PDFs, UTF-8 text files and zip archives of them. Documents are
+    extracted concurrently (PDFs in the worker processes), and a document that
+    cannot be read is reported with its error instead of failing the batch.
+    """
+    spooled = []  # (filename, temp path, digest or "" when the file is too large)
+    try:
+        for file in files:
+            filename = file.filename or "upload"
+            if filename.lower().endswith(".zip"):
+                path, _, _ = await spool_upload(file, BULK_ARCHIVE_MAX_BYTES)
+                try:
+                    spooled.extend(await asyncio.to_thread(
+                        _unpack_archive, path, BULK_MAX_DOCUMENTS - len(spooled)
+                    ))
+                finally:
+                    os.unlink(path)
+            else:
+                try:
+                    path, digest, _ = await spool_upload(file)
+                except HTTPException as e:
+                    if e.status_code != 413:
+                        raise
+                    path, digest = None, ""
+                spooled.append((filename, path, digest))
+            if len(spooled) > BULK_MAX_DOCUMENTS:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"At most {BULK_MAX_DOCUMENTS} documents can be uploaded at once"
+                )
+
+        async def extract(filename: str, path: str, digest: str) -> ExtractedDocument:
+            if not digest:
+                return ExtractedDocument(filename, None, "File is too large")
+            try:
+                return ExtractedDocument(filename, await _extract_spooled(path, digest, filename), None)
+            except HTTPException as e:
+                return ExtractedDocument(filename, None, e.detail)
+
+        return list(await asyncio.gather(*(extract(*entry) for entry in spooled)))
+    finally:
+        _remove_files(path for _, path, _ in spooled)
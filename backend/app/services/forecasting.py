@@ -0,0 +1,166 @@
+"""
+Vectorized demand forecasting for the whole skill catalog
+
+Works on a (skills x weeks) matrix of trend values and fits a damped Holt
+linear-trend model to every row at once: the recursion walks the time axis,
+but each step is a single NumPy operation across all skills.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models import Skill
+from app.services.trend_store import load_series_matrix
+
+# Forecast horizons in weeks (trend history is weekly)
+HORIZONS = {"6m": 26, "1y": 52, "3y": 156}
+# History window the stored forecasts are fitted on
+FORECAST_HISTORY_DAYS = 365
+
+HOLT_ALPHA = 0.5    # level smoothing
+HOLT_BETA = 0.1     # trend smoothing
+HOLT_PHI = 0.98     # trend damping, keeps multi-year forecasts from running away
+BAND_Z = 1.96       # ~95% confidence band
+
+def fill_gaps(matrix: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs along each row, back-filling leading gaps; empty rows become 0"""
+    matrix = np.array(matrix, dtype=float)
+    if matrix.size == 0:
+        return matrix
+    n_cols = matrix.shape[1]
+    valid = ~np.isnan(matrix)
+    # Index of the last valid column at or before each position
+    last_valid = np.where(valid, np.arange(n_cols), -1)
+    np.maximum.accumulate(last_valid, axis=1, out=last_valid)
+    # Rows with a leading gap take their first valid value
+    first_valid = np.where(valid.any(axis=1), valid.argmax(axis=1), 0)
+    last_valid = np.where(last_valid < 0, first_valid[:, None], last_valid)
+    filled = np.take_along_axis(matrix, last_valid, axis=1)
+    return np.nan_to_num(filled)
+
+def growth_rates(matrix: np.ndarray) -> np.ndarray:
+    """Per-row growth of the second half over the first half, in percent"""
+    mid_point = matrix.shape[1] // 2
+    if mid_point == 0:
+        return np.zeros(matrix.shape[0])
+    first_half = matrix[:, :mid_point].mean(axis=1)
+    second_half = matrix[:, mid_point:].mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = (second_half - first_half) / first_half * 100
+    return np.where(first_half > 0, rates, 0.0)
+
+def classify_trends(growth: np.ndarray, avg_interest: np.ndarray) -> np.ndarray:
+    """Classify every skill as emerging, high-growth, declining or saturated"""
+    growth = np.asarray(growth, dtype=float)
+    avg_interest = np.asarray(avg_interest, dtype=float)
+    return np.select(
+        [(growth > 30) & (avg_interest < 50), growth > 15, growth < -10],
+        ["emerging", "high-growth", "declining"],
+        default="saturated"
+    )
+
+def holt_fit(matrix: np.ndarray, alpha: float = HOLT_ALPHA, beta: float = HOLT_BETA,
+             phi: float = HOLT_PHI):
+    """
+    Fit damped Holt smoothing to every row
+
+    Returns:
+        (level, trend, sigma) arrays with one entry per row, where sigma is the
+        RMS one-step-ahead forecast error
+    """
+    n_rows, n_cols = matrix.shape
+    level = matrix[:, 0].copy()
+    trend = matrix[:, 1] - matrix[:, 0] if n_cols > 1 else np.zeros(n_rows)
+    squared_error = np.zeros(n_rows)
+
+    for t in range(1, n_cols):
+        observed = matrix[:, t]
+        predicted = level + phi * trend
+        squared_error += (observed - predicted) ** 2
+        new_level = alpha * observed + (1 - alpha) * predicted
+        trend = beta * (new_level - level) + (1 - beta) * phi * trend
+        level = new_level
+
+    sigma = np.sqrt(squared_error / max(n_cols - 1, 1))
+    return level, trend, sigma
+
+def forecast_matrix(matrix: np.ndarray, horizons: Optional[Dict[str, int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Forecast every row of a (skills x weeks) matrix in one pass
+
+    Returns:
+        Dict of arrays (one value per skill): average_interest, growth_rate,
+        trend_status and, for each horizon key, forecast_<key>, lower_<key>
+        and upper_<key>. Values are clipped to the 0-100 Trends scale.
+    """
+    horizons = horizons or HORIZONS
+    matrix = fill_gaps(matrix)
+    n_rows = matrix.shape[0]
+    if matrix.shape[1] == 0:
+        matrix = np.zeros((n_rows, 1))
+
+    avg_interest = matrix.mean(axis=1)
+    growth = growth_rates(matrix)
+    level, trend, sigma = holt_fit(matrix)
+
+    result = {
+        "average_interest": avg_interest,
+        "growth_rate": growth,
+        "trend_status": classify_trends(growth, avg_interest),
+    }
+    for key, steps in horizons.items():
+        damped_steps = HOLT_PHI * (1 - HOLT_PHI ** steps) / (1 - HOLT_PHI)
+        point = level + damped_steps * trend
+        spread = BAND_Z * sigma * np.sqrt(steps)
+        result[f"forecast_{key}"] = np.clip(point, 0, 100)
+        result[f"lower_{key}"] = np.clip(point - spread, 0, 100)
+        result[f"upper_{key}"] = np.clip(point + spread, 0, 100)
+    return result
+
+def forecast_one(values) -> Dict[str, float]:
+    """Forecast a single series; convenience wrapper over forecast_matrix"""
+    result = forecast_matrix(np.asarray(values, dtype=float).reshape(1, -1))
+    return {key: value[0].item() for key, value in result.items()}
+
+def recompute_catalog_forecasts(db: Session, skill_ids: Optional[List[int]] = None,
+                                history_days: int = FORECAST_HISTORY_DAYS) -> int:
+    """
+    Recompute scores, forecasts and trend status for skills with stored history
+
+    Loads the last `history_days` of history as one matrix, forecasts it in
+    one pass and writes the results back with a bulk UPDATE. Skills without
+    history are left untouched. Does not commit.
+    """
+    if skill_ids is None:
+        skill_ids = [skill_id for (skill_id,) in db.query(Skill.id).all()]
+    since = datetime.now(timezone.utc) - timedelta(days=history_days)
+    _, matrix = load_series_matrix(db, skill_ids, start=since)
+    if matrix.shape[1] == 0:
+        return 0
+
+    has_history = ~np.isnan(matrix).all(axis=1)
+    ids = np.asarray(skill_ids)[has_history]
+    result = forecast_matrix(matrix[has_history])
+    refreshed_at = datetime.now(timezone.utc)
+
+    mappings = [
+        {
+            "id": int(skill_id),
+            "current_demand_score": float(result["average_interest"][i]),
+            "google_trends_score": float(result["average_interest"][i]),
+            "trend_status": str(result["trend_status"][i]),
+            "forecast_6m": float(result["forecast_6m"][i]),
+            "forecast_1y": float(result["forecast_1y"][i]),
+            "forecast_3y": float(result["forecast_3y"][i]),
+            "future_demand_score": float(result["forecast_1y"][i]),
+            "updated_at": refreshed_at,
+        }
+        for i, skill_id in enumerate(ids)
+    ]
+    if mappings:
+        db.execute(update(Skill), mappings)
+    return len(mappings)
@@ -0,0 +1,273 @@
+"""
+Database-backed job queue for long-running AI analyses
+
+Endpoints that wait on Gemini can hand their work to this queue and return
+a job id straight away. Jobs are rows in the jobs table, so they survive a
+restart and are visible to every worker process; each process runs a small
+pool of asyncio workers that claim queued jobs, report progress and store
+the result for polling (/api/jobs/{id}) or Server-Sent Events.
+
+A running job's updated_at is its heartbeat, refreshed by progress reports
+and every JOB_HEARTBEAT_SECONDS while it runs. Workers periodically requeue
+running jobs whose heartbeat stopped (their process died), however long
+they have been running.
+"""
+
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models import Job
+from app.schemas import JobResponse
+
+# Concurrent jobs per worker process
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# How often idle workers look for jobs enqueued by other processes
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+# How often a running job's heartbeat is refreshed, and idle workers sweep for lost jobs
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+# Running jobs without a heartbeat for this long are assumed lost and requeued
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "2"))
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+ProgressReporter = Callable[[int, Optional[str]], Awaitable[None]]
+JobHandler = Callable[[AsyncSession, Dict[str, Any], ProgressReporter], Awaitable[Any]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+def register_job_handler(kind: str):
+    """
+    Register the coroutine that runs jobs of the given kind
+
+    The handler receives an AsyncSession, the job payload and a progress
+    reporter, and returns a JSON-serializable result. The session is
+    committed by the handler; the queue only records the outcome.
+    """
+    def decorator(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+    return decorator
+
+def job_to_dict(job: Job) -> Dict[str, Any]:
+    """JobResponse fields for a job row"""
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress or 0,
+        "progress_message": job.progress_message,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+async def enqueue_job(db: AsyncSession, kind: str, payload: Dict[str, Any]) -> Job:
+    """Insert a queued job, commit it and wake a local worker"""
+    if kind not in _handlers:
+        raise ValueError(f"No job handler registered for {kind}")
+    job = Job(
+        id=uuid.uuid4().hex,
+        kind=kind,
+        status="queued",
+        payload=payload,
+        progress=0,
+        progress_message="Queued",
+        attempts=0,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(job)
+    await db.commit()
+    job_workers.notify()
+    return job
+
+async def get_job(db: AsyncSession, job_id: str) -> Optional[Job]:
+    return (await db.execute(select(Job).where(Job.id == job_id))).scalar_one_or_none()
+
+def _still_claimed(job: Job):
+    """Conditions that hold while the job is still this worker's claim"""
+    return Job.id == job.id, Job.status == "running", Job.attempts == job.attempts
+
+async def _set_job_fields(job: Job, **values) -> bool:
+    """Update a job this worker runs, unless it was requeued meanwhile"""
+    async with AsyncSessionLocal() as db:
+        updated = await db.execute(update(Job).where(*_still_claimed(job)).values(
+            updated_at=datetime.now(timezone.utc), **values
+        ))
+        await db.commit()
+        return updated.rowcount == 1
+
+async def _claim_next_job() -> Optional[Job]:
+    """
+    Atomically move the oldest queued job to running
+
+    PostgreSQL skips rows other workers have locked; on SQLite writes are
+    serialized, and the status check in the UPDATE settles any race.
+    """
+    async with AsyncSessionLocal() as db:
+        candidate = (await db.execute(
+            select(Job.id).where(Job.status == "queued")
+            .order_by(Job.created_at).limit(1)
+            .with_for_update(skip_locked=True)
+        )).scalar_one_or_none()
+        if candidate is None:
+            await db.rollback()
+            return None
+        now = datetime.now(timezone.utc)
+        claimed = await db.execute(
+            update(Job).where(Job.id == candidate, Job.status == "queued").values(
+                status="running",
+                started_at=now,
+                updated_at=now,
+                attempts=Job.attempts + 1,
+                progress_message="Running",
+            )
+        )
+        await db.commit()
+        if claimed.rowcount != 1:
+            return None
+        return await get_job(db, candidate)
+
+async def requeue_stale_jobs() -> int:
+    """Requeue running jobs whose heartbeat stopped, failing those out of attempts"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=JOB_STALE_SECONDS)
+    async with AsyncSessionLocal() as db:
+        stale = Job.status == "running", Job.updated_at < cutoff
+        await db.execute(update(Job).where(*stale, Job.attempts >= JOB_MAX_ATTEMPTS).values(
+            status="failed",
+            error="Job was interrupted too many times",
+            finished_at=datetime.now(timezone.utc),
+        ))
+        requeued = await db.execute(update(Job).where(*stale).values(
+            status="queued", progress_message="Requeued", updated_at=datetime.now(timezone.utc)
+        ))
+        await db.commit()
+        return requeued.rowcount
+
+class JobWorkerPool:
+    """A fixed number of asyncio workers pulling jobs from the jobs table"""
+
+    def __init__(self, size: int = JOB_WORKERS):
+        self.size = size
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._swept_at = 0.0
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        await self._sweep()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"job-worker-{i}") for i in range(self.size)
+        ]
+
+    async def stop(self):
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _sweep(self):
+        """Requeue jobs lost by crashed processes; at most once per JOB_HEARTBEAT_SECONDS"""
+        loop = asyncio.get_running_loop()
+        if loop.time() - self._swept_at < JOB_HEARTBEAT_SECONDS:
+            return
+        self._swept_at = loop.time()
+        try:
+            requeued = await requeue_stale_jobs()
+            if requeued:
+                print(f"✓ Requeued {requeued} interrupted jobs")
+        except Exception as e:
+            print(f"⚠ Could not check for interrupted jobs: {e}")
+
+    async def _run(self):
+        while not self._stopping:
+            await self._sweep()
+            # Clear before claiming so a job enqueued meanwhile still wakes us
+            self._wake.clear()
+            try:
+                job = await _claim_next_job()
+            except Exception as e:
+                print(f"⚠ Job queue unavailable: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._execute(job)
+
+    async def _execute(self, job: Job):
+        async def report(progress: int, message: Optional[str] = None):
+            await _set_job_fields(job, progress=max(0, min(100, progress)), progress_message=message)
+
+        async def run_handler():
+            handler = _handlers[job.kind]
+            async with AsyncSessionLocal() as db:
+                return await handler(db, job.payload or {}, report)
+
+        handler_task = asyncio.create_task(run_handler())
+        heartbeat_task = asyncio.create_task(self._heartbeat(job, handler_task))
+        try:
+            result = await handler_task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # Shutting down; leave the job running so it is requeued once stale
+                raise
+            print(f"⚠ Job {job.id} ({job.kind}) was requeued by a sweep; stopped running it here")
+            return
+        except Exception as e:
+            print(f"⚠ Job {job.id} ({job.kind}) failed: {e}")
+            # HTTPExceptions raised by shared route code carry a readable detail
+            await _set_job_fields(
+                job, status="failed", error=str(getattr(e, "detail", None) or e),
+                progress_message="Failed", finished_at=datetime.now(timezone.utc)
+            )
+            return
+        finally:
+            heartbeat_task.cancel()
+        await _set_job_fields(
+            job, status="succeeded", result=result, progress=100,
+            progress_message="Done", finished_at=datetime.now(timezone.utc)
+        )
+
+    @staticmethod
+    async def _heartbeat(job: Job, handler_task: asyncio.Task):
+        """Refresh the job's updated_at while it runs; stop it if it was requeued meanwhile"""
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            try:
+                claimed = await _set_job_fields(job)
+            except Exception as e:
+                print(f"⚠ Could not record heartbeat for job {job.id}: {e}")
+                continue
+            if not claimed:
+                # Another worker may be running it by now; running it here too would do it twice
+                handler_task.cancel()
+                return
+
+def job_accepted_response(job: Job) -> JSONResponse:
+    """202 response pointing the client at the job's status endpoints"""
+    body = JobResponse(**job_to_dict(job)).model_dump(mode="json")
+    return JSONResponse(status_code=202, content=body, headers={"Location": f"/api/jobs/{job.id}"})
+
+job_workers = JobWorkerPool()
@@ -0,0 +1,142 @@
+"""
+Profile-skill associations
+
+profile_skills is the normalized, indexed record of which catalog skills each
+profile holds. UserProfile.current_skills keeps the raw extracted list, which
+may include names outside the catalog, but coverage and supply questions are
+answered with SQL joins against this table.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import ProfileSkill, Skill, UserProfile
+from app.services.skill_canonicalizer import get_skill_canonicalizer
+from app.services.skill_catalog import SkillCatalog, get_skill_catalog
+
+def sync_profile_skills(
+    db: Session,
+    profile_id: int,
+    skill_names: Iterable[str],
+    catalog: SkillCatalog
+) -> List[int]:
+    """
+    Replace the catalog skills linked to a profile
+
+    Names are resolved against the skill catalog by the canonicalization
+    index (case, punctuation, aliases and near spellings), without a lookup
+    query; names that do not resolve are not linked. Does not commit.
+
+    Returns:
+        The linked skill ids
+    """
+    skill_ids = get_skill_canonicalizer(catalog).resolve_ids(skill_names)
+
+    db.query(ProfileSkill).filter(ProfileSkill.profile_id == profile_id).delete(synchronize_session=False)
+    if skill_ids:
+        db.execute(insert(ProfileSkill), [
+            {"profile_id": profile_id, "skill_id": skill_id} for skill_id in skill_ids
+        ])
+    return skill_ids
+
+def sync_profile_skills_many(
+    db: Session,
+    skills_by_profile: Dict[int, Iterable[str]],
+    catalog: SkillCatalog
+) -> int:
+    """
+    Replace the catalog skills linked to many profiles at once
+
+    Same resolution as sync_profile_skills, with one delete and one bulk
+    insert for the whole batch. Does not commit.
+
+    Returns:
+        Number of association rows written
+    """
+    canonicalizer = get_skill_canonicalizer(catalog)
+    rows = [
+        {"profile_id": profile_id, "skill_id": skill_id}
+        for profile_id, skill_names in skills_by_profile.items()
+        for skill_id in canonicalizer.resolve_ids(skill_names or [])
+    ]
+    if skills_by_profile:
+        db.query(ProfileSkill).filter(
+            ProfileSkill.profile_id.in_(list(skills_by_profile))
+        ).delete(synchronize_session=False)
+    if rows:
+        db.execute(insert(ProfileSkill), rows)
+    return len(rows)
+
+def skill_supply_subquery():
+    """Per-skill profile counts as a subquery with skill_id and supply_count columns"""
+    return select(
+        ProfileSkill.skill_id,
+        func.count(ProfileSkill.profile_id).label("supply_count")
+    ).group_by(ProfileSkill.skill_id).subquery()
+
+def backfill_profile_skills(db: Session, batch_size: int = 1000) -> int:
+    """
+    Rebuild profile_skills from the JSON current_skills column
+
+    Walks profiles in id order with keyset batches, resolving names with the
+    canonicalization index, and commits after each batch.
+
+    Returns:
+        Number of association rows written
+    """
+    canonicalizer = get_skill_canonicalizer(get_skill_catalog(db))
+    written = 0
+    last_id = 0
+    while True:
+        batch = db.query(UserProfile.id, UserProfile.current_skills).filter(
+            UserProfile.id > last_id
+        ).order_by(UserProfile.id).limit(batch_size).all()
+        if not batch:
+            break
+
+        profile_ids = [profile_id for profile_id, _ in batch]
+        rows = [
+            {"profile_id": profile_id, "skill_id": skill_id}
+            for profile_id, skill_names in batch
+            for skill_id in canonicalizer.resolve_ids(skill_names or [])
+        ]
+        db.query(ProfileSkill).filter(
+            ProfileSkill.profile_id.in_(profile_ids)
+        ).delete(synchronize_session=False)
+        if rows:
+            db.execute(insert(ProfileSkill), rows)
+        db.commit()
+
+        written += len(rows)
+        last_id = profile_ids[-1]
+    return written
+
+def profile_skill_names(db: Session, profile_id: int, catalog: SkillCatalog) -> List[str]:
+    """Catalog names of the skills linked to a profile"""
+    skills = (catalog.get(skill_id) for (skill_id,) in db.query(ProfileSkill.skill_id).filter(
+        ProfileSkill.profile_id == profile_id
+    ))
+    return sorted(skill.name for skill in skills if skill)
+
+def profiles_with_skill(db: Session, skill_name: str):
+    """Query of profile ids holding the named catalog skill"""
+    return db.query(ProfileSkill.profile_id).join(
+        Skill, Skill.id == ProfileSkill.skill_id
+    ).filter(Skill.name == skill_name)
+
+def domain_coverage(db: Session, profile_id: int, domain: Optional[str], catalog: SkillCatalog) -> Tuple[int, int]:
+    """
+    How many of a domain's catalog skills a profile holds
+
+    Returns:
+        (skills_covered, total_domain_skills)
+    """
+    total = len(catalog.in_domain(domain))
+    if not total:
+        return 0, 0
+    covered = db.query(func.count(ProfileSkill.skill_id)).join(
+        Skill, Skill.id == ProfileSkill.skill_id
+    ).filter(ProfileSkill.profile_id == profile_id, Skill.domain == domain).scalar() or 0
+    return covered, total
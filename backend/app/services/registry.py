@@ -0,0 +1,49 @@
+"""
+Per-process service registry
+
+Services that are expensive to build (the Gemini client, Google Trends
+sessions) are created on first use and then shared by every router, job
+handler and background thread in the worker process. Their modules, and
+the heavy SDKs behind them, are imported only at that point, which keeps
+worker startup fast.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+
+if TYPE_CHECKING:
+    from app.services.ai_service import AIService
+    from app.services.trends_service import TrendsService
+
+_instances: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+def _get(name: str, factory: Callable[[], Any]) -> Any:
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                # A factory that raises (e.g. missing API key) is retried on the next call
+                instance = _instances[name] = factory()
+    return instance
+
+def _create_ai_service() -> "AIService":
+    from app.services.ai_service import AIService
+    return AIService()
+
+def _create_trends_service() -> "TrendsService":
+    from app.services.trends_service import TrendsService
+    return TrendsService()
+
+def get_ai_service() -> "AIService":
+    """The worker's AIService, created on first use"""
+    return _get("ai", _create_ai_service)
+
+def get_trends_service() -> "TrendsService":
+    """The worker's TrendsService, created on first use"""
+    return _get("trends", _create_trends_service)
+
+def loaded_services() -> List[str]:
+    """Names of the services created so far in this process"""
+    return sorted(_instances)
@@ -0,0 +1,140 @@
+"""
+Request coalescing for identical in-flight upstream calls
+
+When several requests need the same Gemini or Google Trends result at the
+same time, only the first one makes the call; the others wait for it and
+share its result (or its exception). Nothing is kept once the call is done,
+so this complements the response cache rather than replacing it.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_groups: Dict[str, "_FlightGroup"] = {}
+
+def call_key(*parts: Any) -> str:
+    """Stable key for a call from its normalized arguments"""
+    raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class _FlightGroup(ABC):
+    def __init__(self, name: str, copy_results: bool):
+        self.name = name
+        # Results are shared objects; callers that mutate them need copies
+        self.copy_results = copy_results
+        self.calls = 0
+        self.coalesced = 0
+        self._stats_lock = threading.Lock()
+        _groups[name] = self
+
+    def _count(self, coalesced: bool):
+        with self._stats_lock:
+            if coalesced:
+                self.coalesced += 1
+            else:
+                self.calls += 1
+
+    def _share(self, result: Any) -> Any:
+        return copy.deepcopy(result) if self.copy_results else result
+
+    @abstractmethod
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": self.in_flight()}
+
+class SingleFlight(_FlightGroup):
+    """Coalesces coroutine calls on the same event loop"""
+
+    def __init__(self, name: str, copy_results: bool = False):
+        super().__init__(name, copy_results)
+        self._tasks = weakref.WeakKeyDictionary()
+
+    def _loop_tasks(self) -> Dict[Hashable, asyncio.Task]:
+        loop = asyncio.get_running_loop()
+        tasks = self._tasks.get(loop)
+        if tasks is None:
+            tasks = self._tasks[loop] = {}
+        return tasks
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn(), or the identical call already in flight for key
+
+        The call runs as its own task, so one caller being cancelled (e.g. a
+        client disconnecting) does not cancel it for the others.
+        """
+        tasks = self._loop_tasks()
+        task = tasks.get(key)
+        if task is None:
+            self._count(coalesced=False)
+            task = tasks[key] = asyncio.ensure_future(fn())
+
+            def _done(finished: asyncio.Task):
+                if tasks.get(key) is finished:
+                    del tasks[key]
+                if not finished.cancelled():
+                    finished.exception()  # retrieved here in case every caller went away
+            task.add_done_callback(_done)
+        else:
+            self._count(coalesced=True)
+        return self._share(await asyncio.shield(task))
+
+    def in_flight(self) -> int:
+        return sum(len(tasks) for tasks in list(self._tasks.values()))
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class ThreadSingleFlight(_FlightGroup):
+    """Coalesces blocking calls made from different threads"""
+
+    def __init__(self, name: str, copy_results: bool = False):
+        super().__init__(name, copy_results)
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn(), or wait for the identical call already running in another thread"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        self._count(coalesced=not leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self._share(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return self._share(call.result)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Per-group counts of upstream calls made and duplicate calls coalesced"""
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,154 @@
+"""
+Skill name canonicalization
+
+Gemini and uploaded documents spell skills freely ("NodeJS", "node.js",
+"ML"), while gaps and profile links must point at catalog rows. This
+module keeps an in-memory index from normalized spellings and aliases to
+catalog skills, so a batch of names resolves with dictionary lookups and
+no per-name queries. Names that still do not resolve fall back to a
+trigram similarity search over the index.
+"""
+
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.services.skill_catalog import SkillCatalog, get_skill_catalog
+from app.services.skill_matcher import SKILL_ALIASES
+
+# Minimum trigram similarity (Dice coefficient) for a fuzzy match
+SKILL_FUZZY_THRESHOLD = float(os.getenv("SKILL_FUZZY_THRESHOLD", "0.75"))
+# Keys shorter than this are never fuzzy matched ("go" is not "git")
+SKILL_FUZZY_MIN_LENGTH = 4
+# Fuzzy results are remembered per index, up to this many names
+SKILL_FUZZY_CACHE_SIZE = 4096
+
+# Symbols that distinguish skills ("C", "C++", "C#") are spelled out before
+# the remaining punctuation is dropped
+_SYMBOLS = (("++", "pp"), ("#", "sharp"), ("+", "plus"))
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+class CatalogSkill(NamedTuple):
+    id: int
+    name: str
+
+def normalize_name(name) -> Optional[str]:
+    """Case-folded name with whitespace and punctuation removed ("Node.js" -> "nodejs")"""
+    if not isinstance(name, str):
+        return None
+    key = unicodedata.normalize("NFKC", name).casefold().strip()
+    for symbol, word in _SYMBOLS:
+        key = key.replace(symbol, word)
+    key = _NON_ALNUM.sub("", key)
+    return key or None
+
+# Built-in aliases by normalized spelling
+_ALIAS_KEYS = {normalize_name(alias): normalize_name(target) for alias, target in SKILL_ALIASES.items()}
+
+def canonical_key(name) -> Optional[str]:
+    """Normalized name with known aliases mapped to their skill ("ML" -> "machinelearning")"""
+    key = normalize_name(name)
+    return _ALIAS_KEYS.get(key, key)
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SkillCanonicalizer:
+    """Immutable index from spellings to catalog skills"""
+
+    def __init__(self, skills: Iterable[Tuple[int, str]], aliases: Optional[Dict[str, str]] = None):
+        self._aliases = SKILL_ALIASES if aliases is None else dict(aliases)
+        self._by_key: Dict[str, CatalogSkill] = {}
+        for skill_id, name in skills:
+            key = normalize_name(name)
+            if key:
+                self._by_key.setdefault(key, CatalogSkill(skill_id, name))
+        for alias, target in self._aliases.items():
+            skill = self._by_key.get(normalize_name(target))
+            key = normalize_name(alias)
+            if skill and key:
+                self._by_key.setdefault(key, skill)
+
+        self._by_trigram: Dict[str, List[str]] = {}
+        self._trigram_counts: Dict[str, int] = {}
+        for key in self._by_key:
+            if len(key) >= SKILL_FUZZY_MIN_LENGTH:
+                grams = _trigrams(key)
+                self._trigram_counts[key] = len(grams)
+                for gram in grams:
+                    self._by_trigram.setdefault(gram, []).append(key)
+        self._fuzzy_cache: Dict[str, Optional[CatalogSkill]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def with_skills(self, skills: Iterable[Tuple[int, str]]) -> "SkillCanonicalizer":
+        """A new index that also knows the given (id, name) skills"""
+        known = {(skill.id, skill.name) for skill in self._by_key.values()}
+        return SkillCanonicalizer([*sorted(known), *skills], self._aliases)
+
+    def _fuzzy(self, key: str) -> Optional[CatalogSkill]:
+        if key in self._fuzzy_cache:
+            return self._fuzzy_cache[key]
+        grams = _trigrams(key)
+        shared = Counter(
+            candidate for gram in grams for candidate in self._by_trigram.get(gram, ())
+        )
+        best, best_score = None, SKILL_FUZZY_THRESHOLD
+        for candidate, count in shared.items():
+            score = 2 * count / (len(grams) + self._trigram_counts[candidate])
+            if score >= best_score:
+                best, best_score = candidate, score
+        skill = self._by_key[best] if best else None
+        if len(self._fuzzy_cache) < SKILL_FUZZY_CACHE_SIZE:
+            self._fuzzy_cache[key] = skill
+        return skill
+
+    def resolve(self, name, fuzzy: bool = True) -> Optional[CatalogSkill]:
+        """The catalog skill a name refers to, or None"""
+        key = normalize_name(name)
+        if not key:
+            return None
+        skill = self._by_key.get(key)
+        if skill is None and fuzzy and len(key) >= SKILL_FUZZY_MIN_LENGTH:
+            skill = self._fuzzy(key)
+        return skill
+
+    def resolve_many(self, names: Iterable, fuzzy: bool = True) -> Dict[str, Optional[CatalogSkill]]:
+        """Resolve a batch of names; every distinct input name maps to its skill or None"""
+        return {
+            name: self.resolve(name, fuzzy)
+            for name in dict.fromkeys(names) if isinstance(name, str)
+        }
+
+    def resolve_ids(self, names: Iterable, fuzzy: bool = True) -> List[int]:
+        """Distinct catalog skill ids for the names that resolve, in input order"""
+        resolved = self.resolve_many(names, fuzzy).values()
+        return list(dict.fromkeys(skill.id for skill in resolved if skill))
+
+_canonicalizer: Optional[SkillCanonicalizer] = None
+_canonicalizer_catalog = None
+_canonicalizer_lock = threading.Lock()
+
+def get_skill_canonicalizer(catalog: Optional[SkillCatalog] = None) -> SkillCanonicalizer:
+    """
+    Shared canonicalization index over the skill catalog
+
+    Rebuilt whenever the in-process skill catalog is reloaded (see
+    app/services/skill_catalog.py). Code running inside
+    AsyncSession.run_sync passes the catalog it was handed, so building the
+    index never touches the database.
+    """
+    global _canonicalizer, _canonicalizer_catalog
+    catalog = catalog or get_skill_catalog()
+    if _canonicalizer is not None and _canonicalizer_catalog is catalog:
+        return _canonicalizer
+    with _canonicalizer_lock:
+        if _canonicalizer is None or _canonicalizer_catalog is not catalog:
+            _canonicalizer = SkillCanonicalizer((skill.id, skill.name) for skill in catalog.skills)
+            _canonicalizer_catalog = catalog
+        return _canonicalizer
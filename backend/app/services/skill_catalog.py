@@ -0,0 +1,242 @@
+"""
+In-process skill catalog
+
+The skills table is small and changes rarely, but nearly every handler
+reads it. Each worker keeps an immutable snapshot of the whole catalog,
+indexed by id, name, domain and trend status, with the domain and status
+views pre-sorted by future demand, so lookups and "top N" listings cost no
+database round trip.
+
+The snapshot is tagged with the skills table's change counter (see
+app/services/table_versions.py). Writes made through a session in this
+process invalidate it as soon as they are flushed, committed or rolled back;
+other workers' commits are picked up by a primary-key version check at most
+every SKILL_CATALOG_REFRESH_SECONDS, or sooner when a conditional GET sees a
+newer version.
+
+Reloads never hold a lock across database I/O: a session driven by
+AsyncSession.run_sync does its I/O on the event loop thread, so a second
+request waiting on a thread lock there would stall the loop the first one
+needs to finish. Concurrent reloads are coalesced per event loop instead,
+and run in a worker thread with their own session.
+"""
+
+import asyncio
+import heapq
+import os
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Skill, TableVersion
+from app.services.single_flight import SingleFlight
+
+# How often to check whether another process changed the catalog
+SKILL_CATALOG_REFRESH_SECONDS = float(os.getenv("SKILL_CATALOG_REFRESH_SECONDS", "10"))
+
+_TOUCHED_KEY = "skill_catalog_touched"
+
+class SkillRecord(NamedTuple):
+    id: int
+    name: str
+    category: Optional[str]
+    domain: Optional[str]
+    description: Optional[str]
+    current_demand_score: Optional[float]
+    future_demand_score: Optional[float]
+    trend_status: Optional[str]
+    google_trends_score: Optional[float]
+    forecast_6m: Optional[float]
+    forecast_1y: Optional[float]
+    forecast_3y: Optional[float]
+    updated_at: Optional[datetime]
+
+_RECORD_COLUMNS = [getattr(Skill, field) for field in SkillRecord._fields]
+
+def _demand_order(skill: SkillRecord):
+    # Highest future demand first, unscored skills last, ties by id
+    score = skill.future_demand_score
+    return (score is None, -(score or 0.0), skill.id)
+
+def _group(skills: Iterable[SkillRecord], field: str) -> Dict[Optional[str], Tuple[SkillRecord, ...]]:
+    groups: Dict[Optional[str], List[SkillRecord]] = {}
+    for skill in skills:
+        groups.setdefault(getattr(skill, field), []).append(skill)
+    return {key: tuple(members) for key, members in groups.items()}
+
+class SkillCatalog:
+    """Immutable snapshot of the skills table at one version"""
+
+    def __init__(self, skills: Iterable[SkillRecord], version: int = 0):
+        self.version = version
+        self.skills: Tuple[SkillRecord, ...] = tuple(sorted(skills, key=lambda skill: skill.id))
+        self._by_id = {skill.id: skill for skill in self.skills}
+        self._by_name = {skill.name: skill for skill in self.skills}
+        self._by_demand = tuple(sorted(self.skills, key=_demand_order))
+        self._by_domain = _group(self._by_demand, "domain")
+        self._by_status = _group(self._by_demand, "trend_status")
+
+    @classmethod
+    def load(cls, db: Session, version: int) -> "SkillCatalog":
+        return cls((SkillRecord(*row) for row in db.execute(select(*_RECORD_COLUMNS))), version)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def get(self, skill_id: int) -> Optional[SkillRecord]:
+        return self._by_id.get(skill_id)
+
+    def find(self, name: str) -> Optional[SkillRecord]:
+        """Skill with exactly this name; see skill_canonicalizer for loose matching"""
+        return self._by_name.get(name)
+
+    def in_domain(self, domain: Optional[str]) -> Tuple[SkillRecord, ...]:
+        """Skills of a domain (None: skills without one), by future demand"""
+        return self._by_domain.get(domain, ())
+
+    def ranked(
+        self,
+        domain: Optional[str] = None,
+        trend_statuses: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[SkillRecord]:
+        """
+        Skills by future demand, highest first, optionally filtered to a
+        domain and/or trend statuses
+        """
+        if domain:
+            view = self.in_domain(domain)
+            if trend_statuses is not None:
+                statuses = set(trend_statuses)
+                view = (skill for skill in view if skill.trend_status in statuses)
+        elif trend_statuses is not None:
+            view = heapq.merge(
+                *(self._by_status.get(status, ()) for status in dict.fromkeys(trend_statuses)),
+                key=_demand_order
+            )
+        else:
+            view = self._by_demand
+        if limit is not None:
+            view = islice(view, max(limit, 0))
+        return list(view)
+
+_catalog: Optional[SkillCatalog] = None
+_catalog_generation = -1
+_catalog_checked_at = 0.0
+# Guards publishing a loaded catalog only, never the load itself
+_catalog_lock = threading.Lock()
+_reload_flight = SingleFlight("skill_catalog")
+# Bumped by every local invalidation; a catalog loaded before the latest bump is reloaded
+_generation = 0
+
+def invalidate_skill_catalog():
+    """Make the next get_skill_catalog call reload the catalog"""
+    global _generation
+    _generation += 1
+
+def observe_skill_catalog_version(version: int):
+    """Reload on next use if the skills table is known to be past the cached version"""
+    catalog = _catalog
+    if catalog is not None and version != catalog.version:
+        invalidate_skill_catalog()
+
+def _is_current(catalog: Optional[SkillCatalog]) -> bool:
+    return (
+        catalog is not None and _catalog_generation == _generation
+        and time.monotonic() - _catalog_checked_at < SKILL_CATALOG_REFRESH_SECONDS
+    )
+
+def _skills_version(db: Session) -> int:
+    return db.scalar(select(TableVersion.version).where(TableVersion.table_name == "skills")) or 0
+
+def _reload(db: Optional[Session]) -> SkillCatalog:
+    """Check the skills version and load the catalog if it moved, then publish it"""
+    global _catalog, _catalog_generation, _catalog_checked_at
+    generation = _generation
+    current = _catalog
+    session = db or SessionLocal()
+    try:
+        version = _skills_version(session)
+        if current is None or _catalog_generation != generation or current.version != version:
+            current = SkillCatalog.load(session, version)
+    except Exception as e:
+        print(f"⚠ Could not load skill catalog: {e}")
+        # Retried after SKILL_CATALOG_REFRESH_SECONDS
+        current = current or SkillCatalog([], version=-1)
+    finally:
+        if db is None:
+            session.close()
+
+    with _catalog_lock:
+        # A load that started before a newer invalidation must not replace
+        # a catalog loaded after it
+        if generation >= _catalog_generation:
+            _catalog = current
+            _catalog_generation = generation
+            _catalog_checked_at = time.monotonic()
+        return current
+
+def get_skill_catalog(db: Optional[Session] = None, verify: bool = False) -> SkillCatalog:
+    """
+    The worker's skill catalog, reloaded when the skills table changed
+
+    For sync code running in its own thread. Pass the caller's session to
+    check and load through it instead of opening another connection; a
+    catalog loaded mid-transaction is invalidated again when that
+    transaction ends. verify=True checks the version now rather than
+    trusting a check from the last SKILL_CATALOG_REFRESH_SECONDS, for
+    results that are stored and reused. Code running inside
+    AsyncSession.run_sync should be handed a catalog from
+    get_skill_catalog_async instead.
+    """
+    catalog = _catalog
+    if not verify and _is_current(catalog):
+        return catalog
+    return _reload(db)
+
+async def get_skill_catalog_async(verify: bool = False) -> SkillCatalog:
+    """
+    get_skill_catalog for request handlers; only a reload touches the
+    database, in a worker thread, and concurrent reloads share one load
+    """
+    catalog = _catalog
+    if not verify and _is_current(catalog):
+        return catalog
+    return await _reload_flight.do(verify, lambda: asyncio.to_thread(_reload, None))
+
+def _touch(session: Session):
+    session.info[_TOUCHED_KEY] = True
+    invalidate_skill_catalog()
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_skills(session, flush_context):
+    for instance in session.new:
+        if isinstance(instance, Skill):
+            return _touch(session)
+    for instance in session.deleted:
+        if isinstance(instance, Skill):
+            return _touch(session)
+    for instance in session.dirty:
+        if isinstance(instance, Skill) and session.is_modified(instance):
+            return _touch(session)
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_skill_statements(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if getattr(table, "name", None) == Skill.__tablename__:
+            _touch(orm_execute_state.session)
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _end_skill_transaction(session):
+    # A catalog loaded while the transaction was open may hold its
+    # uncommitted rows, or miss rows it has just committed
+    if session.info.pop(_TOUCHED_KEY, False):
+        invalidate_skill_catalog()
@@ -0,0 +1,242 @@
+"""
+Skill gap analysis inputs and storage
+
+Shared by the single-profile gap analysis and the cohort-wide re-analysis,
+which batches many profiles into each Gemini call after a catalog refresh.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import ProfileSkill, SkillGap, UserProfile
+from app.schemas import SkillGapResponse
+from app.services.ai_service import AIService
+from app.services.skill_canonicalizer import canonical_key, get_skill_canonicalizer
+from app.services.skill_catalog import SkillCatalog, get_skill_catalog_async
+
+# Profiles loaded, analyzed and committed together by the cohort re-analysis
+GAP_REANALYSIS_PAGE_SIZE = 500
+
+def required_skills_for_domains(
+    catalog: SkillCatalog,
+    domains: Iterable[Optional[str]]
+) -> Dict[Optional[str], List[str]]:
+    """
+    The skills each domain's profiles are measured against
+
+    A domain's own catalog skills; domains without any (or no domain) fall
+    back to the top 20 emerging/high-growth skills, then to the top 20
+    skills. Read from the in-process skill catalog, without a query.
+    """
+    domains = set(domains)
+    required = {}
+    for domain in domains:
+        names = [skill.name for skill in catalog.in_domain(domain)] if domain else []
+        if names:
+            required[domain] = names
+    if len(required) < len(domains):
+        fallback = catalog.ranked(trend_statuses=["emerging", "high-growth"], limit=20) or catalog.ranked(limit=20)
+        for domain in domains:
+            required.setdefault(domain, [skill.name for skill in fallback])
+    return required
+
+def merge_current_skills(catalog_skills: List[str], extracted_skills: Optional[List]) -> List[str]:
+    """A profile's catalog skills plus extracted names that are not in the catalog"""
+    known = {canonical_key(name) for name in catalog_skills}
+    return catalog_skills + [
+        name for name in (extracted_skills or [])
+        if isinstance(name, str) and canonical_key(name) not in known
+    ]
+
+def save_skill_gaps_many(
+    db: Session,
+    analyses: Dict[int, dict],
+    catalog: SkillCatalog
+) -> Dict[int, List[SkillGapResponse]]:
+    """
+    Replace the skill gaps of many profiles with the missing skills from their analyses
+
+    Names from the analyses are resolved to catalog skills in memory by the
+    canonicalization index, so "NodeJS" or "ML" still become gaps, and
+    their demand scores come from the in-process skill catalog. Uses one
+    delete and one bulk insert regardless of profile or gap count. Does
+    not commit.
+
+    Returns:
+        The stored gaps per profile id
+    """
+    canonicalizer = get_skill_canonicalizer(catalog)
+    missing_by_profile = {}
+    short_term_by_profile = {}
+    for profile_id, gap_analysis in analyses.items():
+        missing_by_profile[profile_id] = canonicalizer.resolve_ids(gap_analysis.get("missing_skills") or [])
+        short_term_by_profile[profile_id] = set(
+            canonicalizer.resolve_ids(gap_analysis.get("priority_skills_short_term") or [])
+        )
+
+    gap_rows = []
+    gap_responses = {}
+    for profile_id, missing_ids in missing_by_profile.items():
+        gap_responses[profile_id] = []
+        for skill_id in missing_ids:
+            skill = catalog.get(skill_id)
+            if not skill:
+                continue
+            # Determine priority and timeframe
+            is_short_term = skill_id in short_term_by_profile[profile_id]
+            gap = {
+                "profile_id": profile_id,
+                "skill_id": skill.id,
+                "gap_score": 1.0,  # Missing skill = full gap
+                "priority": "high" if is_short_term else "medium",
+                "timeframe": "short-term" if is_short_term else "long-term"
+            }
+            gap_rows.append(gap)
+            gap_responses[profile_id].append(SkillGapResponse(
+                skill_id=skill.id,
+                skill_name=skill.name,
+                gap_score=gap["gap_score"],
+                priority=gap["priority"],
+                timeframe=gap["timeframe"],
+                current_demand_score=skill.current_demand_score,
+                future_demand_score=skill.future_demand_score
+            ))
+
+    # Clear existing gaps and add new ones
+    if analyses:
+        db.query(SkillGap).filter(
+            SkillGap.profile_id.in_(list(analyses))
+        ).delete(synchronize_session=False)
+    if gap_rows:
+        db.execute(insert(SkillGap), gap_rows)
+    return gap_responses
+
+def save_skill_gaps(db: Session, profile_id: int, gap_analysis: dict, catalog: SkillCatalog) -> List[SkillGapResponse]:
+    """Replace one profile's skill gaps; see save_skill_gaps_many. Does not commit."""
+    return save_skill_gaps_many(db, {profile_id: gap_analysis}, catalog)[profile_id]
+
+def _load_profile_page(
+    db: Session,
+    after_id: int,
+    limit: int,
+    profile_ids: Optional[List[int]],
+    domain: Optional[str],
+    catalog: SkillCatalog
+):
+    """A keyset page of profiles with their current skills resolved"""
+    query = select(
+        UserProfile.id, UserProfile.domain, UserProfile.target_role, UserProfile.current_skills
+    ).where(UserProfile.id > after_id)
+    if profile_ids is not None:
+        query = query.where(UserProfile.id.in_(profile_ids))
+    if domain:
+        query = query.where(UserProfile.domain == domain)
+    rows = db.execute(query.order_by(UserProfile.id).limit(limit)).all()
+    if not rows:
+        return []
+
+    catalog_names = defaultdict(list)
+    for profile_id, skill_id in db.execute(
+        select(ProfileSkill.profile_id, ProfileSkill.skill_id).where(
+            ProfileSkill.profile_id.in_([row.id for row in rows])
+        )
+    ):
+        skill = catalog.get(skill_id)
+        if skill:
+            catalog_names[profile_id].append(skill.name)
+    for names in catalog_names.values():
+        names.sort()
+    return [
+        {
+            "id": row.id,
+            "domain": row.domain,
+            "target_role": row.target_role,
+            "current_skills": merge_current_skills(catalog_names[row.id], row.current_skills)
+        }
+        for row in rows
+    ]
+
+async def reanalyze_skill_gaps(
+    db: AsyncSession,
+    ai_service: AIService,
+    profile_ids: Optional[List[int]] = None,
+    domain: Optional[str] = None,
+    report: Optional[Callable[[int, str], Awaitable[None]]] = None
+) -> Dict:
+    """
+    Re-run gap analysis for many profiles, batching them into few AI calls
+
+    Walks the selected profiles (all of them by default) in keyset pages of
+    GAP_REANALYSIS_PAGE_SIZE. Within a page, profiles are grouped by domain
+    so each group shares one required-skills list; the groups are analyzed
+    concurrently with analyze_skill_gaps_batch_async, then stored and
+    committed together.
+
+    Returns:
+        Counts, elapsed time and per-profile gap scores
+    """
+    started = time.perf_counter()
+    total = None
+    if report:
+        count_query = select(func.count(UserProfile.id))
+        if profile_ids is not None:
+            count_query = count_query.where(UserProfile.id.in_(profile_ids))
+        if domain:
+            count_query = count_query.where(UserProfile.domain == domain)
+        total = (await db.execute(count_query)).scalar()
+
+    results = []
+    after_id = 0
+    while True:
+        # Resolved per page, outside run_sync; a catalog refresh mid-walk applies to later pages
+        catalog = await get_skill_catalog_async()
+        profiles = await db.run_sync(
+            _load_profile_page, after_id, GAP_REANALYSIS_PAGE_SIZE, profile_ids, domain, catalog
+        )
+        if not profiles:
+            break
+        after_id = profiles[-1]["id"]
+
+        required = required_skills_for_domains(catalog, {profile["domain"] for profile in profiles})
+        groups = defaultdict(list)
+        for profile in profiles:
+            if required[profile["domain"]]:
+                groups[profile["domain"]].append(profile)
+
+        group_analyses = await asyncio.gather(*(
+            ai_service.analyze_skill_gaps_batch_async(group, required[group_domain])
+            for group_domain, group in groups.items()
+        ))
+        analyses = {
+            profile["id"]: analysis
+            for group, analyses_of_group in zip(groups.values(), group_analyses)
+            for profile, analysis in zip(group, analyses_of_group)
+        }
+
+        gaps = await db.run_sync(save_skill_gaps_many, analyses, catalog)
+        await db.commit()
+        results.extend(
+            {
+                "profile_id": profile_id,
+                "overall_gap_score": analysis.get("gap_score", 0.0),
+                "skill_gaps": len(gaps[profile_id])
+            }
+            for profile_id, analysis in analyses.items()
+        )
+        if report and total:
+            done = len(results)
+            await report(min(99, int(100 * done / total)), f"Analyzed {done}/{total} profiles")
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ Re-analyzed skill gaps for {len(results)} profiles in {elapsed:.1f}s")
+    return {
+        "analyzed": len(results),
+        "elapsed_seconds": round(elapsed, 3),
+        "results": results
+    }
@@ -0,0 +1,171 @@
+"""
+Compiled multi-pattern skill matcher
+
+Finds known skills in free text (resumes, syllabi) with a single compiled
+alternation regex, so a document is scanned once however large the
+catalog is. Terms come from the skills table plus a built-in list and
+aliases, and only match on token boundaries: "Go" does not match "Google"
+and "AI" does not match "maintain". Short alphabetic terms (three letters
+or fewer) are case-sensitive so that "Go" or "R" are not found in ordinary
+prose.
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.skill_catalog import SkillCatalog, get_skill_catalog
+
+# Built-in terms, used even when the catalog is empty
+DEFAULT_SKILLS = [
+    # Programming languages
+    "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Rust", "Ruby", "PHP",
+    # AI/ML
+    "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Keras", "NLP", "Computer Vision",
+    "Natural Language Processing", "LLM", "Neural Networks", "AI", "Data Science",
+    # Web Development
+    "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask", "FastAPI", "REST API",
+    "HTML", "CSS", "Bootstrap", "Tailwind",
+    # Data
+    "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Pandas", "NumPy", "Data Analysis",
+    "Data Visualization", "Tableau", "Power BI",
+    # Cloud & DevOps
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "CI/CD", "DevOps", "Linux", "Git",
+    # Soft Skills
+    "Communication", "Leadership", "Problem Solving", "Team Collaboration", "Project Management",
+]
+
+# Alternative spellings mapped to the name they should be reported as
+SKILL_ALIASES = {
+    "Golang": "Go",
+    "JS": "JavaScript",
+    "TS": "TypeScript",
+    "NodeJS": "Node.js",
+    "Node JS": "Node.js",
+    "ReactJS": "React",
+    "React.js": "React",
+    "Vue.js": "Vue",
+    "VueJS": "Vue",
+    "AngularJS": "Angular",
+    "Postgres": "PostgreSQL",
+    "Mongo": "MongoDB",
+    "K8s": "Kubernetes",
+    "Amazon Web Services": "AWS",
+    "Google Cloud": "GCP",
+    "Google Cloud Platform": "GCP",
+    "Microsoft Azure": "Azure",
+    "ML": "Machine Learning",
+    "DL": "Deep Learning",
+    "Large Language Models": "LLM",
+    "LLMs": "LLM",
+    "Artificial Intelligence": "AI",
+    "Sklearn": "Scikit-learn",
+    "Scikit Learn": "Scikit-learn",
+    "RESTful API": "REST API",
+    "RESTful APIs": "REST API",
+    "REST APIs": "REST API",
+    "Continuous Integration": "CI/CD",
+    "PowerBI": "Power BI",
+    "Tailwind CSS": "Tailwind",
+}
+
+# Alphabetic terms this short must match case-sensitively (as written, or all caps)
+CASE_SENSITIVE_MAX_LENGTH = 3
+
+# A term may not be glued to word characters or to the symbols that extend
+# names like C++, C# or Node.js. A slash separates list items ("HTML/CSS",
+# "AI/ML"); terms that contain one, such as CI/CD, are longer than their
+# parts and so are tried first.
+_BEFORE = r"(?<![\w+#.-])"
+_AFTER = r"(?![\w+#]|[.-]\w)"
+
+def _term_pattern(term: str) -> str:
+    """Escaped term where any run of spaces or hyphens matches spaces or hyphens"""
+    parts = re.split(r"[\s-]+", term.strip())
+    return r"[\s-]+".join(re.escape(part) for part in parts)
+
+def _key(term: str) -> str:
+    return re.sub(r"[\s-]+", " ", term.strip()).casefold()
+
+class SkillMatcher:
+    """Immutable matcher over a fixed set of terms"""
+
+    def __init__(self, terms: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self.terms = [term.strip() for term in terms if term and term.strip()]
+        self.aliases = dict(aliases or {})
+        # normalized spelling -> (spelling as written, name to report)
+        self._terms: Dict[str, Tuple[str, str]] = {}
+        for term in self.terms:
+            self._terms.setdefault(_key(term), (term, term))
+        for alias, target in self.aliases.items():
+            known = self._terms.get(_key(target))
+            if known:
+                self._terms.setdefault(_key(alias), (alias, known[1]))
+        self.pattern = self._compile()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def with_terms(self, terms: Iterable[str]) -> "SkillMatcher":
+        """A new matcher that also knows the given terms"""
+        return SkillMatcher([*self.terms, *terms], self.aliases)
+
+    def _compile(self) -> Optional[re.Pattern]:
+        long_terms, short_variants = [], set()
+        for spelling, _ in self._terms.values():
+            if len(spelling) > CASE_SENSITIVE_MAX_LENGTH or not spelling.isalpha():
+                long_terms.append(spelling)
+            else:
+                short_variants.update({spelling, spelling.upper()})
+        if not long_terms and not short_variants:
+            return None
+
+        # Longest first, so "C++" wins over "C" and "Machine Learning" over "Machine"
+        by_length = lambda term: (-len(term), term)
+        alternatives = []
+        if long_terms:
+            alternatives.append(
+                "(?i:" + "|".join(_term_pattern(t) for t in sorted(long_terms, key=by_length)) + ")"
+            )
+        if short_variants:
+            alternatives.extend(_term_pattern(t) for t in sorted(short_variants, key=by_length))
+        return re.compile(_BEFORE + "(?:" + "|".join(alternatives) + ")" + _AFTER)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """(start, end, skill name) for every match, in one pass over the text"""
+        if self.pattern is None or not text:
+            return
+        for match in self.pattern.finditer(text):
+            term = self._terms.get(_key(match.group(0)))
+            if term:
+                yield match.start(), match.end(), term[1]
+
+    def find(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Distinct skills found in text, in order of first mention"""
+        found = {}
+        for _, _, name in self.finditer(text):
+            found.setdefault(name, None)
+            if limit and len(found) >= limit:
+                break
+        return list(found)
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_catalog = None
+_matcher_lock = threading.Lock()
+
+def get_skill_matcher(catalog: Optional[SkillCatalog] = None) -> SkillMatcher:
+    """
+    Shared matcher over the skill catalog, built-in terms and aliases
+
+    Rebuilt whenever the in-process skill catalog is reloaded; see
+    app/services/skill_catalog.py for how catalog changes are noticed.
+    """
+    global _matcher, _matcher_catalog
+    catalog = catalog or get_skill_catalog()
+    if _matcher is not None and _matcher_catalog is catalog:
+        return _matcher
+    with _matcher_lock:
+        if _matcher is None or _matcher_catalog is not catalog:
+            _matcher = SkillMatcher([*(skill.name for skill in catalog.skills), *DEFAULT_SKILLS], SKILL_ALIASES)
+            _matcher_catalog = catalog
+        return _matcher
@@ -0,0 +1,91 @@
+"""
+Per-table change counters
+
+Every committed transaction that writes to a table increments that table's
+row in table_versions, in the same transaction. Read endpoints derive ETag
+and Last-Modified headers from the versions of the tables they read, so a
+revalidation costs one primary-key lookup instead of the endpoint's query.
+Writes are seen through session events: after_flush for ORM changes and
+do_orm_execute for bulk insert/update/delete statements.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.database import upsert_insert
+from app.models import TableVersion
+
+# Tables whose writes are not versioned: job progress is written constantly
+# and nothing is cached from it, and the bookkeeping tables themselves
+UNVERSIONED_TABLES = {"jobs", "table_versions", "analytics_snapshots", "schema_migrations"}
+
+_CHANGED_KEY = "changed_tables"
+
+def _record(session: Session, table_name: Optional[str]):
+    if table_name and table_name not in UNVERSIONED_TABLES:
+        session.info.setdefault(_CHANGED_KEY, set()).add(table_name)
+
+def load_table_versions(db: Session, table_names: Iterable[str]) -> Tuple[Dict[str, int], Optional[datetime]]:
+    """
+    Current versions of the given tables and when the latest of them changed
+
+    Tables never written since versioning started are at version 0.
+
+    Returns:
+        (version by table name, last change time in UTC or None)
+    """
+    names = sorted(set(table_names))
+    versions = {name: 0 for name in names}
+    last_modified = None
+    for name, version, updated_at in db.execute(
+        select(TableVersion.table_name, TableVersion.version, TableVersion.updated_at).where(
+            TableVersion.table_name.in_(names)
+        )
+    ):
+        versions[name] = version
+        if updated_at is not None:
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            last_modified = max(last_modified, updated_at) if last_modified else updated_at
+    return versions, last_modified
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    for instance in session.new:
+        _record(session, getattr(instance, "__tablename__", None))
+    for instance in session.deleted:
+        _record(session, getattr(instance, "__tablename__", None))
+    for instance in session.dirty:
+        if session.is_modified(instance):
+            _record(session, getattr(instance, "__tablename__", None))
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        _record(orm_execute_state.session, getattr(table, "name", None))
+
+@event.listens_for(Session, "before_commit")
+def _bump_table_versions(session):
+    # Commit flushes after this hook, so flush first to collect every change
+    session.flush()
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if not changed:
+        return
+    now = datetime.now(timezone.utc)
+    insert = upsert_insert(session)
+    statement = insert(TableVersion.__table__).values([
+        {"table_name": name, "version": 1, "updated_at": now} for name in sorted(changed)
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=["table_name"],
+        set_={"version": TableVersion.__table__.c.version + 1, "updated_at": statement.excluded.updated_at}
+    )
+    session.connection().execute(statement)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_tables(session):
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,131 @@
+"""
+Background refresh of skill trend history
+
+Google Trends calls are slow and rate limited, so they never run on the
+request path. Endpoints serve whatever history is stored in the skill_trends
+table and queue a refresh here when it is older than the configured horizon.
+"""
+
+import os
+import time
+import queue
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from app.database import SessionLocal
+from app.models import Skill
+from app.services.trend_store import upsert_trend_points
+from app.services.forecasting import recompute_catalog_forecasts
+from app.services.registry import get_trends_service
+
+TREND_REFRESH_HORIZON_HOURS = float(os.getenv("TREND_REFRESH_HORIZON_HOURS", "24"))
+# Minimum delay before re-queueing a skill whose last refresh attempt failed
+TREND_REFRESH_RETRY_SECONDS = float(os.getenv("TREND_REFRESH_RETRY_SECONDS", "900"))
+# Skills fetched per refresh cycle; the Trends service batches them into payloads
+TREND_REFRESH_BATCH_SIZE = int(os.getenv("TREND_REFRESH_BATCH_SIZE", "20"))
+
+def is_stale(skill: Skill, horizon_hours: float = TREND_REFRESH_HORIZON_HOURS) -> bool:
+    """Whether a skill's trend data is older than the refresh horizon"""
+    if skill.updated_at is None:
+        return True
+    refreshed_at = skill.updated_at
+    if refreshed_at.tzinfo is None:
+        refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - refreshed_at > timedelta(hours=horizon_hours)
+
+class TrendRefresher:
+    """Single background thread that refreshes queued skills in batches"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._last_attempt = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="trend-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def enqueue(self, skill_names: Iterable[str]) -> List[str]:
+        """Queue skills for refresh, skipping ones already pending or recently attempted"""
+        queued = []
+        now = time.monotonic()
+        with self._lock:
+            for name in skill_names:
+                if name in self._pending:
+                    continue
+                last_attempt = self._last_attempt.get(name)
+                if last_attempt is not None and now - last_attempt < TREND_REFRESH_RETRY_SECONDS:
+                    continue
+                self._pending.add(name)
+                self._queue.put(name)
+                queued.append(name)
+        return queued
+
+    def is_pending(self, skill_name: str) -> bool:
+        with self._lock:
+            return skill_name in self._pending
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                batch = [self._queue.get(timeout=1.0)]
+            except queue.Empty:
+                continue
+            while len(batch) < TREND_REFRESH_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self.refresh_skills(batch)
+            except Exception as e:
+                print(f"⚠ Trend refresh failed for {batch}: {e}")
+            finally:
+                now = time.monotonic()
+                with self._lock:
+                    for name in batch:
+                        self._pending.discard(name)
+                        self._last_attempt[name] = now
+
+    def refresh_skills(self, skill_names: List[str]):
+        """Fetch trends for the given skills and store their history and scores"""
+        trends_service = get_trends_service()
+        trend_data = trends_service.get_trend_data_batched(skill_names)
+
+        db = SessionLocal()
+        try:
+            skills = db.query(Skill).filter(Skill.name.in_(skill_names)).all()
+            points = [
+                {
+                    "skill_id": skill.id,
+                    "date": date.to_pydatetime() if hasattr(date, "to_pydatetime") else date,
+                    "search_volume": float(value),
+                    "demand_score": float(value)
+                }
+                for skill in skills
+                for date, value in trend_data.get(skill.name, {}).get("trend_data", {}).items()
+            ]
+            upsert_trend_points(db, points)
+            refreshed = recompute_catalog_forecasts(db, [skill.id for skill in skills])
+            db.commit()
+            print(f"✓ Refreshed trends for {refreshed} skills")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+trend_refresher = TrendRefresher()
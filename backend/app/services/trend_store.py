@@ -0,0 +1,131 @@
+"""
+Time-series store for skill trend history backed by the skill_trends table
+"""
+
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import upsert_insert
+from app.models import SkillTrend
+
+UPSERT_CHUNK_SIZE = 500
+VALUE_COLUMNS = ("search_volume", "job_postings_count", "demand_score")
+
+Series = Tuple[np.ndarray, np.ndarray]
+
+def _to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def upsert_trend_points(db: Session, points: Iterable[Dict]) -> int:
+    """
+    Bulk insert trend points, updating rows that already exist for the same
+    (skill_id, date). Values left as None keep whatever is already stored.
+
+    Each point is a dict with skill_id, date and any of search_volume,
+    job_postings_count and demand_score. Does not commit.
+    """
+    rows = [
+        {
+            "skill_id": point["skill_id"],
+            "date": point["date"],
+            **{column: point.get(column) for column in VALUE_COLUMNS}
+        }
+        for point in points
+    ]
+    if not rows:
+        return 0
+
+    insert = upsert_insert(db)
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = insert(SkillTrend).values(rows[start:start + UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["skill_id", "date"],
+            set_={
+                column: func.coalesce(getattr(stmt.excluded, column), getattr(SkillTrend, column))
+                for column in VALUE_COLUMNS
+            }
+        )
+        db.execute(stmt)
+    return len(rows)
+
+def _range_query(db: Session, skill_ids: List[int], column: str,
+                 start: Optional[datetime], end: Optional[datetime]):
+    query = db.query(SkillTrend.skill_id, SkillTrend.date, getattr(SkillTrend, column)).filter(
+        SkillTrend.skill_id.in_(skill_ids)
+    )
+    if start is not None:
+        query = query.filter(SkillTrend.date >= start)
+    if end is not None:
+        query = query.filter(SkillTrend.date < end)
+    return query.order_by(SkillTrend.skill_id, SkillTrend.date)
+
+def load_series_many(
+    db: Session,
+    skill_ids: List[int],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    column: str = "search_volume"
+) -> Dict[int, Series]:
+    """
+    Load the history of several skills with one indexed range query
+
+    Returns:
+        Mapping of skill_id to (dates, values), where dates is a
+        datetime64[s] array in UTC and values a float array (NaN for nulls).
+        Skills without history are omitted.
+    """
+    if not skill_ids:
+        return {}
+    rows = _range_query(db, skill_ids, column, start, end).all()
+
+    series = {}
+    for skill_id, group in groupby(rows, key=lambda row: row[0]):
+        group = list(group)
+        dates = np.array([_to_naive_utc(row[1]) for row in group], dtype="datetime64[s]")
+        values = np.array([row[2] if row[2] is not None else np.nan for row in group], dtype=float)
+        series[skill_id] = (dates, values)
+    return series
+
+def load_series(
+    db: Session,
+    skill_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    column: str = "search_volume"
+) -> Series:
+    """Load one skill's history as (dates, values) arrays"""
+    empty = (np.array([], dtype="datetime64[s]"), np.array([], dtype=float))
+    return load_series_many(db, [skill_id], start, end, column).get(skill_id, empty)
+
+def load_series_matrix(
+    db: Session,
+    skill_ids: List[int],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    column: str = "search_volume"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load several skills' history aligned on a shared date axis
+
+    Returns:
+        (dates, matrix) where matrix has one row per entry in skill_ids and
+        one column per date, with NaN where a skill has no point for a date.
+    """
+    series = load_series_many(db, skill_ids, start, end, column)
+    if not series:
+        return np.array([], dtype="datetime64[s]"), np.full((len(skill_ids), 0), np.nan)
+
+    dates = np.unique(np.concatenate([skill_dates for skill_dates, _ in series.values()]))
+    matrix = np.full((len(skill_ids), len(dates)), np.nan)
+    for row, skill_id in enumerate(skill_ids):
+        if skill_id in series:
+            skill_dates, values = series[skill_id]
+            matrix[row, np.searchsorted(dates, skill_dates)] = values
+    return dates, matrix
@@ -2,14 +2,103 @@
 Google Trends integration service for skill demand forecasting
 """
 
-from pytrends.request import TrendReq
-import pandas as pd
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import numpy as np
+import os
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+
+from app.services.forecasting import HORIZONS, classify_trends, forecast_matrix
+from app.services.single_flight import ThreadSingleFlight
+
+if TYPE_CHECKING:
+    from pytrends.request import TrendReq
+
+# pytrends accepts at most five keywords per payload; one slot is reserved for the anchor
+MAX_KEYWORDS_PER_PAYLOAD = 5
+TRENDS_ANCHOR_KEYWORD = os.getenv("TRENDS_ANCHOR_KEYWORD", "Python")
+# Score the anchor is normalized to; leaves headroom for skills more popular than it
+TRENDS_ANCHOR_SCORE = float(os.getenv("TRENDS_ANCHOR_SCORE", "25"))
+
+# Shared by every TrendsService instance, so the refresher, seed script and
+# request handlers never fetch the same payload twice at once
+_trends_flight = ThreadSingleFlight("google_trends")
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of outbound requests"""
+    
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: int = 1):
+        """Block until `tokens` tokens are available, then consume them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait_time = (tokens - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+def _is_rate_limited(error: Exception) -> bool:
+    return "429" in str(error) or type(error).__name__ == "TooManyRequestsError"
+
+def _empty_trend_result() -> Dict[str, Any]:
+    return {
+        "average_interest": 0.0,
+        "growth_rate": 0.0,
+        "trend_data": {},
+        "related_queries": []
+    }
+
+def growth_rate(values) -> float:
+    """Growth of the second half of a series over its first half, in percent"""
+    values = np.asarray(values, dtype=float)
+    mid_point = len(values) // 2
+    if mid_point == 0:
+        return 0.0
+    first_half_avg = values[:mid_point].mean()
+    second_half_avg = values[mid_point:].mean()
+    if first_half_avg > 0:
+        return float(((second_half_avg - first_half_avg) / first_half_avg) * 100)
+    return 0.0
+
+def _new_client() -> "TrendReq":
+    # pytrends (and pandas behind it) is slow to import, and building a
+    # client contacts Google, so both wait until a fetch needs them
+    from pytrends.request import TrendReq
+    return TrendReq(hl='en-US', tz=360)
 
 class TrendsService:
     def __init__(self):
-        self.pytrends = TrendReq(hl='en-US', tz=360)
+        self._pytrends = None
+        self.rate_limiter = TokenBucket(
+            rate_per_second=float(os.getenv("TRENDS_REQUESTS_PER_SECOND", "1.0")),
+            capacity=int(os.getenv("TRENDS_BURST", "5"))
+        )
+        self.max_workers = int(os.getenv("TRENDS_MAX_WORKERS", "4"))
+        # Long-lived, so each worker thread's client (and its Google cookie) is reused across calls
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        # self.pytrends keeps per-payload state and is shared by callers of get_trend_data
+        self._client_lock = threading.Lock()
+    
+    @property
+    def pytrends(self) -> "TrendReq":
+        """Client shared by get_trend_data callers, created on first use"""
+        if self._pytrends is None:
+            self._pytrends = _new_client()
+        return self._pytrends
     
     def get_trend_data(self, skill_keywords: List[str], timeframe: str = 'today 12-m') -> Dict[str, Any]:
         """
@@ -22,53 +111,160 @@ class TrendsService:
         Returns:
             Dictionary with trend data for each skill
         """
-        results = {}
-        
-        for skill in skill_keywords:
-            try:
+        # Concurrent requests for the same skill share one upstream fetch
+        return {
+            skill: _trends_flight.do(
+                ("skill", skill, timeframe),
+                lambda skill=skill: self._fetch_skill_trend(skill, timeframe)
+            )
+            for skill in skill_keywords
+        }
+    
+    def _fetch_skill_trend(self, skill: str, timeframe: str) -> Dict[str, Any]:
+        try:
+            with self._client_lock:
                 # Build payload
                 self.pytrends.build_payload([skill], timeframe=timeframe, geo='IN')  # India-focused
                 
                 # Get interest over time
                 interest_over_time = self.pytrends.interest_over_time()
                 
-                if not interest_over_time.empty:
-                    # Calculate average interest
-                    avg_interest = interest_over_time[skill].mean()
-                    
-                    # Calculate growth rate (compare first half vs second half)
-                    mid_point = len(interest_over_time) // 2
-                    first_half_avg = interest_over_time[skill][:mid_point].mean()
-                    second_half_avg = interest_over_time[skill][mid_point:].mean()
-                    
-                    if first_half_avg > 0:
-                        growth_rate = ((second_half_avg - first_half_avg) / first_half_avg) * 100
-                    else:
-                        growth_rate = 0
-                    
-                    # Get related queries
-                    related_queries = self.pytrends.related_queries()
-                    
-                    results[skill] = {
-                        "average_interest": float(avg_interest),
-                        "growth_rate": float(growth_rate),
-                        "trend_data": interest_over_time[skill].to_dict(),
-                        "related_queries": related_queries.get(skill, {}).get('rising', pd.DataFrame()).to_dict('records') if related_queries.get(skill) else []
-                    }
-                else:
-                    results[skill] = {
-                        "average_interest": 0.0,
-                        "growth_rate": 0.0,
-                        "trend_data": {},
-                        "related_queries": []
-                    }
+                # Get related queries
+                related_queries = self.pytrends.related_queries() if not interest_over_time.empty else {}
+            
+            if interest_over_time.empty:
+                return _empty_trend_result()
+            
+            # Calculate average interest
+            avg_interest = interest_over_time[skill].mean()
+            
+            # Calculate growth rate (compare first half vs second half)
+            skill_growth = growth_rate(interest_over_time[skill])
+            
+            rising = (related_queries.get(skill) or {}).get('rising')
+            return {
+                "average_interest": float(avg_interest),
+                "growth_rate": skill_growth,
+                "trend_data": interest_over_time[skill].to_dict(),
+                "related_queries": rising.to_dict('records') if rising is not None else []
+            }
+        except Exception as e:
+            print(f"Error fetching trends for {skill}: {e}")
+            return _empty_trend_result()
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        """The service's payload worker pool, created on first use"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="trends")
+            return self._pool
+    
+    def shutdown(self):
+        """Stop the payload worker pool (called on application shutdown)"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _thread_client(self) -> "TrendReq":
+        """
+        TrendReq keeps per-payload state, so each pool thread gets its own,
+        built once and reused by every later batch on that thread
+        """
+        client = getattr(self._local, "client", None)
+        if client is None:
+            self.rate_limiter.acquire()
+            client = self._local.client = _new_client()
+        return client
+    
+    def _fetch_payload(
+        self,
+        keywords: List[str],
+        timeframe: str,
+        max_retries: int = 4
+    ) -> Optional[tuple]:
+        """
+        Fetch interest over time and related queries for up to five keywords
+        in one payload. Identical payloads already in flight on another
+        thread are awaited instead of fetched again.
+        """
+        return _trends_flight.do(
+            ("payload", tuple(sorted(keywords)), timeframe),
+            lambda: self._fetch_payload_uncoalesced(keywords, timeframe, max_retries)
+        )
+    
+    def _fetch_payload_uncoalesced(self, keywords: List[str], timeframe: str, max_retries: int) -> Optional[tuple]:
+        """Single payload fetch, retrying rate-limited calls with jittered backoff"""
+        client = self._thread_client()
+        for attempt in range(max_retries):
+            try:
+                self.rate_limiter.acquire()
+                client.build_payload(keywords, timeframe=timeframe, geo='IN')  # India-focused
+                self.rate_limiter.acquire()
+                interest_over_time = client.interest_over_time()
+                # related_queries issues one request per keyword
+                self.rate_limiter.acquire(len(keywords))
+                related_queries = client.related_queries()
+                return interest_over_time, related_queries
             except Exception as e:
-                print(f"Error fetching trends for {skill}: {e}")
+                if _is_rate_limited(e) and attempt < max_retries - 1:
+                    wait_time = (2 ** attempt) * 5 + random.uniform(0, 5)
+                    print(f"  Trends rate limited, waiting {wait_time:.1f}s before retry {attempt + 2}/{max_retries}...")
+                    time.sleep(wait_time)
+                    continue
+                print(f"Error fetching trends for {keywords}: {e}")
+                return None
+        return None
+    
+    def get_trend_data_batched(
+        self,
+        skill_keywords: List[str],
+        timeframe: str = 'today 12-m',
+        anchor: str = TRENDS_ANCHOR_KEYWORD
+    ) -> Dict[str, Any]:
+        """
+        Get Google Trends data for many skills using multi-keyword payloads
+        
+        Skills are packed four per payload alongside a shared anchor keyword.
+        Google scales each payload to its own maximum, so every series is
+        rescaled so that the anchor averages TRENDS_ANCHOR_SCORE. Scores are
+        then comparable across batches and across separate calls. Payloads
+        run concurrently on the service's worker pool (shared by every call,
+        so at most TRENDS_MAX_WORKERS clients ever exist) under its token
+        bucket.
+        
+        Returns:
+            Dictionary with the same per-skill shape as get_trend_data
+        """
+        skills = list(dict.fromkeys(skill_keywords))
+        others = [s for s in skills if s != anchor]
+        batch_size = MAX_KEYWORDS_PER_PAYLOAD - 1
+        batches = [others[i:i + batch_size] + [anchor] for i in range(0, len(others), batch_size)]
+        if not batches and anchor in skills:
+            batches = [[anchor]]
+        
+        responses = list(self._executor().map(lambda batch: self._fetch_payload(batch, timeframe), batches))
+        
+        results = {skill: _empty_trend_result() for skill in skills}
+        for batch, response in zip(batches, responses):
+            if response is None:
+                continue
+            interest_over_time, related_queries = response
+            if interest_over_time.empty:
+                continue
+            anchor_mean = interest_over_time[anchor].mean()
+            factor = TRENDS_ANCHOR_SCORE / anchor_mean if anchor_mean > 0 else 1.0
+            for skill in batch:
+                if skill not in results:
+                    continue
+                # Skills far more popular than the anchor saturate at 100
+                series = (interest_over_time[skill].astype(float) * factor).clip(upper=100.0)
+                rising = ((related_queries or {}).get(skill) or {}).get('rising')
                 results[skill] = {
-                    "average_interest": 0.0,
-                    "growth_rate": 0.0,
-                    "trend_data": {},
-                    "related_queries": []
+                    "average_interest": float(series.mean()),
+                    "growth_rate": growth_rate(series),
+                    "trend_data": series.to_dict(),
+                    "related_queries": rising.to_dict('records') if rising is not None else []
                 }
         
         return results
@@ -80,69 +276,35 @@ class TrendsService:
         Returns:
             'emerging', 'high-growth', 'saturated', or 'declining'
         """
-        if growth_rate > 30 and avg_interest < 50:
-            return "emerging"
-        elif growth_rate > 15:
-            return "high-growth"
-        elif growth_rate < -10:
-            return "declining"
-        else:
-            return "saturated"
+        return str(classify_trends([growth_rate], [avg_interest])[0])
     
-    def forecast_skill_demand(
-        self,
-        skill: str,
-        current_demand: float,
-        growth_rate: float
-    ) -> Dict[str, float]:
+    def analyze_multiple_skills(self, skills: List[str]) -> List[Dict[str, Any]]:
         """
-        Forecast skill demand for 6 months, 1 year, and 3 years
+        Analyze multiple skills and return comprehensive trend analysis
         
-        Uses simple exponential growth model based on current growth rate
+        All fetched series are forecast together in one vectorized pass.
         """
-        # Simple forecasting model
-        # In production, use more sophisticated time-series forecasting
-        
-        forecast_6m = current_demand * (1 + (growth_rate / 100) * 0.5)
-        forecast_1y = current_demand * (1 + (growth_rate / 100))
-        forecast_3y = current_demand * (1 + (growth_rate / 100) * 3)
+        import pandas as pd
         
-        # Cap forecasts to reasonable ranges
-        forecast_6m = max(0, min(100, forecast_6m))
-        forecast_1y = max(0, min(100, forecast_1y))
-        forecast_3y = max(0, min(100, forecast_3y))
+        trend_data = self.get_trend_data_batched(skills)
+        names = list(trend_data.keys())
+        frame = pd.DataFrame({
+            skill: pd.Series(trend_data[skill]["trend_data"], dtype=float) for skill in names
+        })
+        matrix = frame.reindex(columns=names).T.to_numpy() if not frame.empty else np.full((len(names), 0), np.nan)
+        forecasts = forecast_matrix(matrix)
         
-        return {
-            "forecast_6m": forecast_6m,
-            "forecast_1y": forecast_1y,
-            "forecast_3y": forecast_3y
-        }
-    
-    def analyze_multiple_skills(self, skills: List[str]) -> List[Dict[str, Any]]:
-        """
-        Analyze multiple skills and return comprehensive trend analysis
-        """
-        trend_data = self.get_trend_data(skills)
         results = []
-        
-        for skill, data in trend_data.items():
-            trend_status = self.classify_skill_trend(
-                data["growth_rate"],
-                data["average_interest"]
-            )
-            
-            forecasts = self.forecast_skill_demand(
-                skill,
-                data["average_interest"],
-                data["growth_rate"]
-            )
-            
+        for i, skill in enumerate(names):
+            data = trend_data[skill]
             results.append({
                 "skill": skill,
                 "current_demand": data["average_interest"],
                 "growth_rate": data["growth_rate"],
-                "trend_status": trend_status,
-                "forecasts": forecasts,
+                "trend_status": str(forecasts["trend_status"][i]),
+                "forecasts": {
+                    f"forecast_{key}": float(forecasts[f"forecast_{key}"][i]) for key in HORIZONS
+                },
                 "trend_data": data["trend_data"]
             })
         
@@ -8,21 +8,28 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from contextlib import asynccontextmanager
 import os
+import asyncio
 from dotenv import load_dotenv
 
-from app.database import engine, Base, SessionLocal
+from app.database import engine, async_engine, Base, SessionLocal
+from app.pool_metrics import pool_stats
+from app.services.cache_service import get_response_cache
+from app.services.single_flight import single_flight_stats
+from app.services.registry import get_trends_service, loaded_services
 from app.models import User, Skill
-from app.routers import skills, roadmaps, curriculum, analytics
-from app.services.ai_service import AIService
-from app.services.trends_service import TrendsService
+from app.migrations import run_migrations
+from app.routers import skills, roadmaps, curriculum, analytics, jobs
+from app.services.trend_refresh import trend_refresher
+from app.services.analytics_snapshots import snapshot_refresher
+from app.services.document_service import shutdown_pdf_workers
+from app.services.job_queue import job_workers
 
 # Load .env file explicitly from backend directory
 from pathlib import Path
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path, override=True)
 
-# Initialize services (lazy-loaded in routers, not here)
-trends_service = TrendsService()
+# Services (Gemini, Google Trends) are created on first use; see app/services/registry.py
 
 def init_default_data():
     """Initialize default user and skills if they don't exist"""
@@ -88,6 +95,8 @@ async def lifespan(app: FastAPI):
     try:
         # Try to create database tables
         Base.metadata.create_all(bind=engine)
+        # create_all skips tables that already exist; later schema changes are migrations
+        run_migrations(engine)
         print("✓ Database connection successful")
         # Initialize default data
         init_default_data()
@@ -95,9 +104,21 @@ async def lifespan(app: FastAPI):
         print(f"⚠ Warning: Could not connect to database: {e}")
         print("  The server will start, but database features may not work.")
         print("  Make sure PostgreSQL is running and DATABASE_URL is correct in .env")
+    # Refresh trend history in the background, off the request path
+    trend_refresher.start()
+    # Recompute dashboard snapshots marked dirty by committed writes
+    snapshot_refresher.start()
+    # Run queued AI analyses (?background=true) on a bounded worker pool
+    await job_workers.start()
     yield
     # Shutdown
-    pass
+    await job_workers.stop()
+    snapshot_refresher.stop()
+    trend_refresher.stop()
+    if "trends" in loaded_services():
+        get_trends_service().shutdown()
+    shutdown_pdf_workers()
+    await async_engine.dispose()
 
 app = FastAPI(
     title="Skill Gap Intelligence Platform API",
@@ -128,6 +149,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read by the frontend to fetch the next page of list endpoints
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers (authentication removed for now)
@@ -135,6 +158,7 @@ app.include_router(skills.router, prefix="/api/skills", tags=["Skills"])
 app.include_router(roadmaps.router, prefix="/api/roadmaps", tags=["Roadmaps"])
 app.include_router(curriculum.router, prefix="/api/curriculum", tags=["Curriculum"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
 
 @app.get("/")
 async def root():
@@ -148,6 +172,21 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    """Connection pool, AI response cache and call coalescing counters for this worker process"""
+    cache = get_response_cache()
+    return {
+        "pid": os.getpid(),
+        "database": {
+            "async_pool": pool_stats(async_engine),
+            "sync_pool": pool_stats(engine),
+        },
+        "ai_cache": await asyncio.to_thread(cache.stats) if cache else {"enabled": False},
+        "single_flight": single_flight_stats(),
+        "services": loaded_services(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
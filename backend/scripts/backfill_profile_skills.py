@@ -0,0 +1,32 @@
+"""
+Backfill the profile_skills table from the JSON current_skills column
+Run this once after upgrading, and again after bulk catalog changes
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, engine, Base
+from app.services.profile_skills import backfill_profile_skills
+# Mark dashboard snapshots and HTTP validators stale when this script changes their rows
+import app.services.analytics_snapshots  # noqa: F401
+import app.services.table_versions  # noqa: F401
+
+def main():
+    # Make sure the profile_skills table exists
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        written = backfill_profile_skills(db)
+        print(f"✓ Wrote {written} profile-skill links")
+    except Exception as e:
+        print(f"Error backfilling profile skills: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
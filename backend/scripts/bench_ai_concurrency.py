@@ -0,0 +1,100 @@
+"""
+Load benchmark for the async AI path against a stubbed Gemini model
+Run from the backend directory: python scripts/bench_ai_concurrency.py
+
+The stub sleeps for a fixed latency per call, so throughput should scale with
+concurrency up to AI_MAX_CONCURRENCY when calls overlap, and stay flat when
+they are serialized by a blocking call on the event loop. Every request in
+the throughput run sends a different resume, so identical-call coalescing
+cannot lift throughput past the limiter's AI_MAX_CONCURRENCY / latency
+ceiling. A second run sends one resume from every request and reports how
+many model calls coalescing saved.
+"""
+
+import sys
+import os
+import time
+import asyncio
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Repeated prompts would be served by the response cache and hide the model latency
+os.environ["AI_CACHE_ENABLED"] = "false"
+
+from app.services import ai_service as ai_module
+from app.services.ai_service import AIService
+
+STUB_LATENCY_SECONDS = float(os.getenv("BENCH_STUB_LATENCY", "0.25"))
+REQUESTS_PER_RUN = int(os.getenv("BENCH_REQUESTS", "32"))
+SAMPLE_RESUME = "Experienced engineer skilled in Python, Docker, Kubernetes and SQL."
+
+class _StubModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, model, contents):
+        self.calls += 1
+        time.sleep(STUB_LATENCY_SECONDS)
+        return SimpleNamespace(text='["Python", "Docker", "Kubernetes", "SQL"]')
+
+class _StubAsyncModels:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content(self, model, contents):
+        self.calls += 1
+        await asyncio.sleep(STUB_LATENCY_SECONDS)
+        return SimpleNamespace(text='["Python", "Docker", "Kubernetes", "SQL"]')
+
+def make_stub_service() -> AIService:
+    """Build an AIService wired to the stub client, skipping API key setup"""
+    ai_module.USE_NEW_API = True
+    service = AIService.__new__(AIService)
+    service.model_name = "stub-model"
+    service.client = SimpleNamespace(
+        models=_StubModels(),
+        aio=SimpleNamespace(models=_StubAsyncModels())
+    )
+    return service
+
+async def run(service: AIService, concurrency: int, use_async: bool, distinct: bool = True) -> float:
+    """Issue REQUESTS_PER_RUN extractions with at most `concurrency` in flight"""
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def one_request(number: int):
+        resume = f"{SAMPLE_RESUME} Candidate #{number}." if distinct else SAMPLE_RESUME
+        async with limiter:
+            if use_async:
+                await service.extract_skills_from_resume_async(resume)
+            else:
+                # What the routers used to do: a blocking call inside async def
+                service.extract_skills_from_resume(resume)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(number) for number in range(REQUESTS_PER_RUN)))
+    return time.perf_counter() - start
+
+def main():
+    service = make_stub_service()
+    async_models = service.client.aio.models
+    ceiling = ai_module.AI_MAX_CONCURRENCY / STUB_LATENCY_SECONDS
+    print(f"Stub latency: {STUB_LATENCY_SECONDS * 1000:.0f}ms, "
+          f"{REQUESTS_PER_RUN} requests per run, AI_MAX_CONCURRENCY={ai_module.AI_MAX_CONCURRENCY} "
+          f"(ceiling {ceiling:.0f} req/s)")
+
+    print("\nDistinct prompts (concurrency limiter)")
+    print(f"{'concurrency':>12} {'blocking req/s':>16} {'async req/s':>14}")
+    for concurrency in (1, 2, 4, 8, 16):
+        blocking = asyncio.run(run(service, concurrency, use_async=False))
+        non_blocking = asyncio.run(run(service, concurrency, use_async=True))
+        print(f"{concurrency:>12} {REQUESTS_PER_RUN / blocking:>16.1f} {REQUESTS_PER_RUN / non_blocking:>14.1f}")
+
+    print("\nOne prompt from every request (coalescing)")
+    print(f"{'concurrency':>12} {'model calls':>12} {'async req/s':>14}")
+    for concurrency in (1, 4, 16):
+        async_models.calls = 0
+        elapsed = asyncio.run(run(service, concurrency, use_async=True, distinct=False))
+        print(f"{concurrency:>12} {async_models.calls:>12} {REQUESTS_PER_RUN / elapsed:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark bulk resume ingestion against one-upload-per-resume
+Run from the backend directory: python scripts/bench_bulk_resumes.py [--resumes N]
+
+Ingests the same synthetic cohort twice into a throwaway SQLite database:
+once the way single uploads do it (one Gemini call and one transaction per
+resume, AI_MAX_CONCURRENCY uploads at a time) and once through the bulk
+path (several resumes per Gemini call, bulk inserts). The model is a stub
+whose latency grows with the prompt (BENCH_BASE_LATENCY +
+BENCH_MS_PER_1K_TOKENS, tokens ~ chars/4) and which starts at most
+BENCH_RPM calls per minute, like a rate-limited API key.
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import asyncio
+import tempfile
+import argparse
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["AI_CACHE_ENABLED"] = "false"
+
+from sqlalchemy import func, select
+
+from app.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from app.models import Skill, User, UserProfile
+from app.services import ai_service as ai_module
+from app.services.ai_service import AIService
+from app.services.bulk_resumes import UNUSABLE_PASSWORD, ingest_resumes, resume_email
+from app.services.profile_skills import sync_profile_skills
+from app.services.skill_catalog import get_skill_catalog_async
+from app.services.skill_matcher import DEFAULT_SKILLS
+
+BASE_LATENCY_SECONDS = float(os.getenv("BENCH_BASE_LATENCY", "0.8"))
+MS_PER_1K_TOKENS = float(os.getenv("BENCH_MS_PER_1K_TOKENS", "120"))
+REQUESTS_PER_MINUTE = float(os.getenv("BENCH_RPM", "60"))
+
+SKILL_SETS = [
+    ["Python", "SQL", "Pandas", "Data Analysis", "Tableau"],
+    ["JavaScript", "React", "Node.js", "MongoDB", "Git"],
+    ["Java", "Docker", "Kubernetes", "AWS", "CI/CD"],
+    ["Machine Learning", "TensorFlow", "NumPy", "Communication", "Leadership"],
+]
+
+def synthetic_resume(n: int) -> str:
+    skills = SKILL_SETS[n % len(SKILL_SETS)]
+    return "\n".join([
+        f"Student {n}", f"student{n}@college.example.edu",
+        "OBJECTIVE", "Final year B.Tech student seeking a graduate engineering role.",
+        "SKILLS", ", ".join(skills),
+        "PROJECTS",
+        f"Capstone project {n}: built an end-to-end application using {skills[0]} and {skills[1]}.",
+        f"Internship at Company {n % 17}: worked on {skills[2]} pipelines and reporting.",
+        "Organized the college coding club and mentored juniors.",
+        "EDUCATION", "B.Tech Computer Science, CGPA 8.1",
+    ])
+
+class _StubAsyncModels:
+    def __init__(self):
+        self.calls = 0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def generate_content(self, model, contents):
+        # Calls start no faster than the per-minute quota allows
+        async with self._lock:
+            now = time.perf_counter()
+            start = max(now, self._next_start)
+            if REQUESTS_PER_MINUTE > 0:
+                self._next_start = start + 60 / REQUESTS_PER_MINUTE
+        await asyncio.sleep(start - time.perf_counter())
+        self.calls += 1
+        await asyncio.sleep(BASE_LATENCY_SECONDS + len(contents) / 4 / 1000 * MS_PER_1K_TOKENS / 1000)
+
+        ids = re.findall(r'<resume id="(\d+)">', contents)
+        if ids:
+            sections = re.split(r'<resume id="\d+">', contents)[1:]
+            answer = {
+                number: [skill for skill in DEFAULT_SKILLS if skill in section]
+                for number, section in zip(ids, sections)
+            }
+        else:
+            answer = [skill for skill in DEFAULT_SKILLS if skill in contents]
+        return SimpleNamespace(text=json.dumps(answer))
+
+def make_stub_service() -> AIService:
+    """AIService wired to the stub model, skipping API key setup"""
+    ai_module.USE_NEW_API = True
+    service = AIService.__new__(AIService)
+    service.model_name = "stub-model"
+    service.client = SimpleNamespace(aio=SimpleNamespace(models=_StubAsyncModels()))
+    return service
+
+def reset_database():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        db.add_all([Skill(name=name) for name in DEFAULT_SKILLS])
+        db.commit()
+    finally:
+        db.close()
+
+async def ingest_one_by_one(service: AIService, texts):
+    """What N single uploads do: one AI call and one transaction per resume"""
+    slots = asyncio.Semaphore(ai_module.AI_MAX_CONCURRENCY)
+
+    async def upload(text: str):
+        async with slots, AsyncSessionLocal() as db:
+            skills = await service.extract_skills_from_resume_async(text)
+            user = User(email=resume_email(text), hashed_password=UNUSABLE_PASSWORD, user_type="student")
+            db.add(user)
+            await db.flush()
+            profile = UserProfile(user_id=user.id, resume_text=text, current_skills=skills)
+            db.add(profile)
+            await db.flush()
+            await db.run_sync(sync_profile_skills, profile.id, skills, await get_skill_catalog_async())
+            await db.commit()
+
+    await asyncio.gather(*(upload(text) for text in texts))
+
+async def ingest_bulk(service: AIService, texts):
+    async with AsyncSessionLocal() as db:
+        documents = [{"filename": f"resume_{n}.txt", "text": text} for n, text in enumerate(texts)]
+        return await ingest_resumes(db, service, documents)
+
+async def run(label: str, ingest, count: int):
+    reset_database()
+    service = make_stub_service()
+    texts = [synthetic_resume(n) for n in range(count)]
+    started = time.perf_counter()
+    await ingest(service, texts)
+    elapsed = time.perf_counter() - started
+    async with AsyncSessionLocal() as db:
+        profiles = (await db.execute(select(func.count(UserProfile.id)))).scalar()
+    calls = service.client.aio.models.calls
+    print(f"{label:<14} {count:>7} {profiles:>8} {calls:>8} {elapsed:>9.2f} {count / elapsed * 60:>13.0f}")
+    return elapsed
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=120, help="cohort size")
+    args = parser.parse_args()
+
+    print(f"Stub model: {BASE_LATENCY_SECONDS * 1000:.0f}ms + {MS_PER_1K_TOKENS:.0f}ms/1k tokens, "
+          f"{REQUESTS_PER_MINUTE:.0f} requests/min, {ai_module.AI_BATCH_DOCUMENTS} resumes per batch call\n")
+    print(f"{'mode':<14} {'resumes':>7} {'profiles':>8} {'AI calls':>8} {'seconds':>9} {'resumes/min':>13}")
+    single = await run("one by one", ingest_one_by_one, args.resumes)
+    bulk = await run("bulk", ingest_bulk, args.resumes)
+    print(f"\nBulk ingestion is {single / bulk:.1f}x faster")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
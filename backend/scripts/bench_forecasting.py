@@ -0,0 +1,101 @@
+"""
+Benchmark for the vectorized forecasting engine
+Run from the backend directory: python scripts/bench_forecasting.py [n_skills] [n_weeks]
+
+Seeds a throwaway SQLite database with a synthetic catalog of random-walk
+weekly trend series, then times a full catalog recompute
+(recompute_catalog_forecasts: loading the history matrix from skill_trends,
+forecasting it and the bulk UPDATE of skills) along with its load and
+forecast stages on their own.
+"""
+
+import sys
+import os
+import time
+import tempfile
+from datetime import datetime, timedelta, timezone
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+from sqlalchemy import insert
+
+from app.database import Base, SessionLocal, engine
+from app.models import Skill, SkillTrend
+from app.services.forecasting import forecast_matrix, recompute_catalog_forecasts
+from app.services.trend_store import load_series_matrix
+
+RUNS = 3
+
+def synthetic_catalog(n_skills: int, n_weeks: int, seed: int = 42) -> np.ndarray:
+    """Random-walk series on the 0-100 scale with a few missing points"""
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(10, 90, size=(n_skills, 1))
+    drift = rng.normal(0, 0.3, size=(n_skills, 1))
+    walk = start + np.cumsum(rng.normal(0, 2, size=(n_skills, n_weeks)) + drift, axis=1)
+    matrix = np.clip(walk, 0, 100)
+    matrix[rng.random(matrix.shape) < 0.02] = np.nan
+    return matrix
+
+def seed(matrix: np.ndarray):
+    """One skill per row and one skill_trends point per non-missing cell"""
+    n_skills, n_weeks = matrix.shape
+    Base.metadata.create_all(bind=engine)
+    first_week = datetime.now(timezone.utc) - timedelta(weeks=n_weeks)
+    dates = [first_week + timedelta(weeks=week) for week in range(n_weeks)]
+    with SessionLocal() as db:
+        db.execute(insert(Skill), [{"id": i + 1, "name": f"Skill {i + 1}"} for i in range(n_skills)])
+        rows, points = np.nonzero(~np.isnan(matrix))
+        trend_rows = [
+            {"skill_id": int(row) + 1, "date": dates[week], "search_volume": float(matrix[row, week])}
+            for row, week in zip(rows, points)
+        ]
+        for start in range(0, len(trend_rows), 50_000):
+            db.execute(insert(SkillTrend), trend_rows[start:start + 50_000])
+        db.commit()
+    return len(trend_rows)
+
+def best_and_median(timings):
+    ordered = sorted(timings)
+    return f"best {ordered[0] * 1000:.0f}ms, median {ordered[len(ordered) // 2] * 1000:.0f}ms"
+
+def main():
+    n_skills = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_weeks = int(sys.argv[2]) if len(sys.argv) > 2 else 52
+    matrix = synthetic_catalog(n_skills, n_weeks)
+
+    started = time.perf_counter()
+    n_points = seed(matrix)
+    print(f"Seeded {n_skills} skills, {n_points} trend points in {time.perf_counter() - started:.1f}s")
+
+    skill_ids = list(range(1, n_skills + 1))
+    since = datetime.now(timezone.utc) - timedelta(days=365 * (n_weeks // 52 + 1))
+    load_timings, forecast_timings, recompute_timings = [], [], []
+    for _ in range(RUNS):
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            _, loaded = load_series_matrix(db, skill_ids, start=since)
+            load_timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = forecast_matrix(loaded)
+        forecast_timings.append(time.perf_counter() - start)
+
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            updated = recompute_catalog_forecasts(db, skill_ids, history_days=365 * (n_weeks // 52 + 1))
+            recompute_timings.append(time.perf_counter() - start)
+            db.rollback()
+
+    statuses, counts = np.unique(result["trend_status"], return_counts=True)
+    print(f"Recompute {n_skills} skills x {n_weeks} weeks ({updated} updated)")
+    print(f"  end to end:        {best_and_median(recompute_timings)}")
+    print(f"  load_series_matrix: {best_and_median(load_timings)}")
+    print(f"  forecast_matrix:    {best_and_median(forecast_timings)}")
+    print("  classification: " + ", ".join(f"{s}={c}" for s, c in zip(statuses, counts)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark batched cohort gap re-analysis against one AI call per profile
+Run from the backend directory: python scripts/bench_gap_batches.py [--profiles N]
+
+Seeds a throwaway SQLite database with a catalog across a few domains and N
+student profiles, then re-scores every profile twice: with one
+analyze_skill_gaps call per profile, and with reanalyze_skill_gaps, which
+packs AI_GAP_BATCH_PROFILES profiles into each call. The model is a stub
+whose latency grows with prompt size (BENCH_BASE_LATENCY +
+BENCH_MS_PER_1K_TOKENS, tokens ~ chars/4); with BENCH_TRUNCATE_EVERY=k
+every k-th batch answer is cut short, to exercise per-item fallback.
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import tempfile
+import argparse
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["AI_CACHE_ENABLED"] = "false"
+
+from sqlalchemy import func, insert, select
+
+from app.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from app.models import Skill, SkillGap, User, UserProfile
+from app.services import ai_service as ai_module
+from app.services.ai_service import AIService
+from app.services.profile_skills import sync_profile_skills_many
+from app.services.skill_catalog import get_skill_catalog, get_skill_catalog_async
+from app.services.skill_gaps import (
+    _load_profile_page, reanalyze_skill_gaps, required_skills_for_domains, save_skill_gaps_many
+)
+
+BASE_LATENCY_SECONDS = float(os.getenv("BENCH_BASE_LATENCY", "0.8"))
+MS_PER_1K_TOKENS = float(os.getenv("BENCH_MS_PER_1K_TOKENS", "120"))
+TRUNCATE_EVERY = int(os.getenv("BENCH_TRUNCATE_EVERY", "10"))
+
+CATALOG = {
+    "AI": ["Python", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "NLP", "SQL", "Statistics"],
+    "Web": ["JavaScript", "TypeScript", "React", "Node.js", "CSS", "REST API", "Git", "Docker"],
+    "Cloud": ["AWS", "Azure", "Kubernetes", "Terraform", "Linux", "CI/CD", "Docker Compose", "Networking"],
+    "Data": ["SQL", "Pandas", "Data Visualization", "Tableau", "Power BI", "Excel", "Spark", "Airflow"],
+}
+
+class _StubAsyncModels:
+    def __init__(self):
+        self.calls = 0
+
+    def _analysis(self, current, required):
+        missing = [skill for skill in required if skill not in current]
+        return {
+            "missing_skills": missing,
+            "priority_skills_short_term": missing[:2],
+            "priority_skills_long_term": missing[2:5],
+            "gap_score": round(len(missing) / len(required), 2),
+            "recommendations": f"Focus on {', '.join(missing[:2]) or 'advanced topics'}."
+        }
+
+    async def generate_content(self, model, contents):
+        self.calls += 1
+        await asyncio.sleep(BASE_LATENCY_SECONDS + len(contents) / 4 / 1000 * MS_PER_1K_TOKENS / 1000)
+        required = re.search(r"Required skills: (.*)", contents).group(1).strip().split(", ")
+        profiles = [json.loads(line) for line in re.findall(r"^\s*(\{.*\"id\".*\})\s*$", contents, re.M)]
+        if not profiles:
+            current = re.search(r"Current skills: (.*)", contents).group(1).strip().split(", ")
+            return SimpleNamespace(text=json.dumps(self._analysis(current, required)))
+        text = json.dumps({
+            profile["id"]: self._analysis(profile["current_skills"], required) for profile in profiles
+        })
+        if TRUNCATE_EVERY and self.calls % TRUNCATE_EVERY == 0:
+            text = text[: int(len(text) * 0.8)]
+        return SimpleNamespace(text=text)
+
+def make_stub_service() -> AIService:
+    """AIService wired to the stub model, skipping API key setup"""
+    ai_module.USE_NEW_API = True
+    service = AIService.__new__(AIService)
+    service.model_name = "stub-model"
+    service.client = SimpleNamespace(aio=SimpleNamespace(models=_StubAsyncModels()))
+    return service
+
+def seed_database(count: int):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    db = SessionLocal()
+    try:
+        catalog = {}
+        for domain, names in CATALOG.items():
+            for name in names:
+                catalog.setdefault(name, domain)
+        db.add_all([Skill(name=name, domain=domain) for name, domain in catalog.items()])
+        db.flush()
+        user_ids = db.execute(insert(User).returning(User.id), [
+            {"email": f"student{n}@college.example.edu", "hashed_password": "!", "user_type": "student"}
+            for n in range(count)
+        ]).scalars().all()
+        domains = list(CATALOG)
+        profiles = []
+        for n, user_id in enumerate(user_ids):
+            domain = rng.choice(domains)
+            # A per-student elective keeps prompts distinct, so identical calls are not coalesced
+            profiles.append({
+                "user_id": user_id, "domain": domain, "target_role": f"{domain} Engineer",
+                "current_skills": rng.sample(CATALOG[domain], 3) + ["Communication", f"Elective {n}"]
+            })
+        rows = db.execute(insert(UserProfile).returning(UserProfile.id), profiles).scalars().all()
+        sync_profile_skills_many(db, {
+            profile_id: profile["current_skills"] for profile_id, profile in zip(rows, profiles)
+        }, get_skill_catalog(db))
+        db.commit()
+    finally:
+        db.close()
+
+async def reanalyze_one_by_one(db, service: AIService):
+    """One analyze_skill_gaps call per profile, run concurrently"""
+    catalog = await get_skill_catalog_async()
+    profiles = await db.run_sync(_load_profile_page, 0, 10 ** 9, None, None, catalog)
+    required = required_skills_for_domains(catalog, {profile["domain"] for profile in profiles})
+    analyses = await asyncio.gather(*(
+        service.analyze_skill_gaps_async(
+            profile["current_skills"], required[profile["domain"]], profile["target_role"]
+        )
+        for profile in profiles
+    ))
+    await db.run_sync(save_skill_gaps_many, {
+        profile["id"]: analysis for profile, analysis in zip(profiles, analyses)
+    }, catalog)
+    await db.commit()
+
+async def reanalyze_batched(db, service: AIService):
+    await reanalyze_skill_gaps(db, service)
+
+async def run(label: str, reanalyze, count: int):
+    seed_database(count)
+    service = make_stub_service()
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        await reanalyze(db, service)
+        elapsed = time.perf_counter() - started
+        gaps = (await db.execute(select(func.count(SkillGap.id)))).scalar()
+    calls = service.client.aio.models.calls
+    print(f"{label:<14} {count:>8} {calls:>8} {gaps:>7} {elapsed:>9.2f}")
+    return calls, elapsed
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=1000, help="number of student profiles")
+    args = parser.parse_args()
+
+    print(f"Stub model: {BASE_LATENCY_SECONDS * 1000:.0f}ms + {MS_PER_1K_TOKENS:.0f}ms/1k tokens, "
+          f"{ai_module.AI_MAX_CONCURRENCY} concurrent calls, "
+          f"{ai_module.AI_GAP_BATCH_PROFILES} profiles per batch call\n")
+    print(f"{'mode':<14} {'profiles':>8} {'AI calls':>8} {'gaps':>7} {'seconds':>9}")
+    single_calls, single = await run("one by one", reanalyze_one_by_one, args.profiles)
+    batch_calls, batched = await run("batched", reanalyze_batched, args.profiles)
+    print(f"\n{single_calls / batch_calls:.0f}x fewer AI calls, {single / batched:.1f}x faster")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
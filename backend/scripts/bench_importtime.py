@@ -0,0 +1,135 @@
+"""
+Measure backend startup import time and guard against heavy imports
+Run from the backend directory: python scripts/bench_importtime.py [--compare REF] [--max-ms MS]
+
+Imports main in fresh interpreters with python -X importtime and reports
+the median total and the slowest imports. Exits with status 1 when any of
+HEAVY_MODULES is imported at startup, or when the median exceeds --max-ms,
+so it can run as a CI step. --compare measures another git ref as well
+(checked out in a temporary worktree), e.g. --compare HEAD~1.
+"""
+
+import sys
+import os
+import re
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SDKs that must only be imported when a service first needs them
+HEAVY_MODULES = ("pandas", "pytrends", "google.genai", "google.generativeai", "PyPDF2")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def measure_once(backend_dir: str) -> Tuple[Optional[int], Dict[str, int], str]:
+    """
+    Import main once in a fresh interpreter
+
+    Returns:
+        (total microseconds or None on failure, cumulative microseconds by
+        module for top-level and first-level imports, error output)
+    """
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "importtime.db"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=backend_dir, env=env, capture_output=True, text=True
+    )
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)) // 2, match.group(4)
+        if depth == 0:
+            total += cumulative
+        if depth <= 1:
+            modules[name] = max(modules.get(name, 0), cumulative)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        return None, modules, "\n".join(errors[-5:])
+    return total, modules, ""
+
+def imported_heavy_modules(backend_dir: str) -> List[str]:
+    """HEAVY_MODULES that importing main pulls in"""
+    check = (
+        "import sys, main; "
+        f"print('heavy:' + ','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", check], cwd=backend_dir, capture_output=True, text=True
+    )
+    lines = [line for line in result.stdout.splitlines() if line.startswith("heavy:")]
+    return [name for name in (lines[-1][len("heavy:"):].split(",") if lines else []) if name]
+
+def measure(backend_dir: str, runs: int):
+    totals = []
+    slowest: Dict[str, int] = {}
+    error = ""
+    for _ in range(runs):
+        total, modules, error = measure_once(backend_dir)
+        if total is None:
+            return None, modules, error
+        totals.append(total)
+        slowest = modules
+    return statistics.median(totals), slowest, error
+
+def report(label: str, median_us: Optional[float], modules: Dict[str, int], error: str):
+    if median_us is None:
+        print(f"{label}: import main failed\n{error}\n")
+        return
+    print(f"{label}: import main took {median_us / 1000:.0f} ms (median)")
+    for name, cumulative in sorted(modules.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="interpreter launches to take the median of")
+    parser.add_argument("--max-ms", type=float, help="fail when the median import time exceeds this")
+    parser.add_argument("--compare", metavar="REF", help="also measure this git ref, e.g. HEAD~1")
+    args = parser.parse_args()
+
+    failed = False
+    if args.compare:
+        repo_root = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        worktree = tempfile.mkdtemp(prefix="importtime-")
+        subprocess.run(["git", "worktree", "add", "--detach", "--force", worktree, args.compare],
+                       cwd=repo_root, capture_output=True, check=True)
+        try:
+            backend = os.path.join(worktree, os.path.relpath(BACKEND_DIR, repo_root))
+            report(args.compare, *measure(backend, args.runs))
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=repo_root, capture_output=True)
+            shutil.rmtree(worktree, ignore_errors=True)
+
+    median_us, modules, error = measure(BACKEND_DIR, args.runs)
+    report("working tree", median_us, modules, error)
+    if median_us is None:
+        sys.exit(1)
+
+    heavy = imported_heavy_modules(BACKEND_DIR)
+    if heavy:
+        print(f"✗ Imported at startup: {', '.join(heavy)}; import them where they are first needed")
+        failed = True
+    else:
+        print(f"✓ None of {', '.join(HEAVY_MODULES)} imported at startup")
+    if args.max_ms is not None:
+        if median_us / 1000 > args.max_ms:
+            print(f"✗ Import time {median_us / 1000:.0f} ms exceeds the {args.max_ms:.0f} ms budget")
+            failed = True
+        else:
+            print(f"✓ Import time within the {args.max_ms:.0f} ms budget")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
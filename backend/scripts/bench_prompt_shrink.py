@@ -0,0 +1,183 @@
+"""
+Benchmark the local pre-pass that shrinks skill extraction prompts
+Run from the backend directory: python scripts/bench_prompt_shrink.py [--corpus DIR] [--live]
+
+Builds the resume and curriculum extraction prompts for every document
+with the pre-pass off and on, and compares their size and the time to get
+an answer. Without --live the model is a stub whose latency grows with the
+prompt (BENCH_BASE_LATENCY + BENCH_MS_PER_1K_TOKENS), and tokens are
+estimated at ~4 characters each. With --live the real Gemini model counts
+tokens and answers (needs GEMINI_API_KEY; the response cache is disabled).
+
+--corpus points at a directory of .txt files; names containing "syllabus"
+or "curriculum" are treated as curricula, everything else as resumes.
+Without it a synthetic corpus with typical boilerplate is used.
+"""
+
+import sys
+import os
+import time
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Identical prompts would otherwise be served from the cache
+os.environ["AI_CACHE_ENABLED"] = "false"
+
+from app.services import ai_service as ai_module
+from app.services import document_prep
+from app.services.ai_service import AIService
+
+BASE_LATENCY_SECONDS = float(os.getenv("BENCH_BASE_LATENCY", "0.4"))
+MS_PER_1K_TOKENS = float(os.getenv("BENCH_MS_PER_1K_TOKENS", "120"))
+
+RESUME_HEADER = "Priya Sharma | priya.sharma@example.com | +91 98765 43210 | linkedin.com/in/priya"
+SYLLABUS_HEADER = "XYZ Institute of Technology - Department of Computer Science and Engineering"
+SYLLABUS_FOOTER = "Approved in the 42nd Academic Council meeting held on 12.06.2024"
+
+def _paginate(pages, header, footer=None):
+    out = []
+    for number, page in enumerate(pages, start=1):
+        out.append(header)
+        out.extend(page)
+        if footer:
+            out.append(footer)
+        out.append(f"Page {number} of {len(pages)}")
+    return "\n".join(out)
+
+def synthetic_resume(seed: int) -> str:
+    experience = [
+        f"Senior Software Engineer, Company {seed}, 2020 - Present",
+        "Built REST APIs in Python and FastAPI serving 2M requests a day.",
+        "Migrated batch jobs from cron to Airflow and cut failures by 60%.",
+        "Led a team of 5 engineers; mentored interns on code review practices.",
+        "Deployed services on AWS with Docker, Kubernetes and Terraform.",
+        "Designed event-driven pipelines with Kafka and Spark Structured Streaming.",
+        "Implemented observability with Prometheus, Grafana and OpenTelemetry.",
+    ] * (2 + seed % 3)
+    pages = [
+        ["SUMMARY", "Backend engineer with 7 years of experience in distributed systems and data platforms.",
+         "TECHNICAL SKILLS", "Python, Go, SQL, PostgreSQL, Redis, Docker, Kubernetes, AWS, Git, Linux",
+         "Machine Learning, Pandas, NumPy, Data Analysis, CI/CD",
+         "EXPERIENCE", *experience],
+        ["PROJECTS", "Open-source contributor to a FastAPI rate limiting library.",
+         "Personal finance dashboard in React and TypeScript with a Node.js backend.",
+         "EDUCATION", "B.Tech in Computer Science, 2016, CGPA 8.7",
+         "CERTIFICATIONS", "AWS Certified Solutions Architect - Associate",
+         "PERSONAL DETAILS", "Date of birth: 01/01/1994", "Marital status: Single",
+         "Address: 221B Example Street, Bengaluru", "HOBBIES", "Chess, trekking, photography",
+         "DECLARATION", "I hereby declare that the above information is true to the best of my knowledge.",
+         "REFERENCES", "Available on request."],
+    ]
+    return _paginate(pages, RESUME_HEADER)
+
+def synthetic_syllabus(seed: int) -> str:
+    units = []
+    topics = [
+        ("Data Structures", "Arrays, linked lists, stacks, queues, trees, graphs and hashing."),
+        ("Database Management Systems", "Relational model, SQL, normalization, transactions, indexing."),
+        ("Machine Learning", "Regression, classification, clustering, model evaluation using Python and scikit-learn."),
+        ("Cloud Computing", "Virtualization, containers with Docker, orchestration with Kubernetes, AWS services."),
+        ("Software Engineering", "Agile methods, Git workflows, testing, CI/CD pipelines and DevOps practices."),
+        ("Computer Networks", "OSI model, TCP/IP, routing, network security fundamentals."),
+    ]
+    for i, (course, content) in enumerate(topics[: 3 + seed % 4], start=1):
+        units.append([
+            f"COURSE {i}: {course}", "Course Objectives:",
+            f"To introduce students to the fundamentals of {course.lower()}.",
+            "Course Content:",
+            *[f"Unit {numeral}: {topic.strip()}" for numeral, topic in zip(("I", "II", "III", "IV", "V"), content.split(","))],
+            "Course Outcomes:", f"CO1: Apply {course.lower()} concepts to solve engineering problems.",
+            "Lab Experiments:", f"Implement exercises on {course.lower()} in the laboratory.",
+            "Text Books:", "1. Author A, Title of Book, Publisher, 2019", "2. Author B, Another Title, Publisher, 2020",
+            "Reference Books:", "1. Author C, Reference Title, Publisher, 2018",
+            "Examination Scheme:", "Internal 40 marks, External 60 marks",
+        ])
+    return _paginate(units, SYLLABUS_HEADER, SYLLABUS_FOOTER)
+
+def load_corpus(directory: str):
+    documents = []
+    for path in sorted(Path(directory).glob("*.txt")):
+        kind = "curriculum" if any(word in path.name.lower() for word in ("syllabus", "curriculum")) else "resume"
+        documents.append((path.name, kind, path.read_text(encoding="utf-8", errors="replace")))
+    return documents
+
+def synthetic_corpus():
+    return ([(f"resume_{i}.txt", "resume", synthetic_resume(i)) for i in range(4)]
+            + [(f"syllabus_{i}.txt", "curriculum", synthetic_syllabus(i)) for i in range(4)])
+
+def estimate_tokens(prompt: str) -> int:
+    return max(1, len(prompt) // 4)
+
+class _StubModels:
+    def generate_content(self, model, contents):
+        time.sleep(BASE_LATENCY_SECONDS + estimate_tokens(contents) / 1000 * MS_PER_1K_TOKENS / 1000)
+        return SimpleNamespace(text='["Python", "SQL"]')
+
+def make_stub_service() -> AIService:
+    """AIService wired to a latency-modelling stub, skipping API key setup"""
+    ai_module.USE_NEW_API = True
+    service = AIService.__new__(AIService)
+    service.model_name = "stub-model"
+    service.client = SimpleNamespace(models=_StubModels())
+    return service
+
+def build_prompt(service: AIService, kind: str, text: str, prepass: bool) -> str:
+    document_prep.DOC_PREP_ENABLED = prepass
+    if kind == "curriculum":
+        return service._curriculum_skills_prompt(text)
+    return service._resume_skills_prompt(text)
+
+def measure(service: AIService, kind: str, text: str, prepass: bool, live: bool):
+    """(prompt tokens, pre-pass ms, end-to-end extraction seconds)"""
+    start = time.perf_counter()
+    prompt = build_prompt(service, kind, text, prepass)
+    prep_ms = (time.perf_counter() - start) * 1000
+    if live:
+        tokens = service.client.models.count_tokens(model=service.model_name, contents=prompt).total_tokens
+    else:
+        tokens = estimate_tokens(prompt)
+
+    start = time.perf_counter()
+    if kind == "curriculum":
+        service.extract_skills_from_curriculum(text)
+    else:
+        service.extract_skills_from_resume(text)
+    return tokens, prep_ms, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="directory of .txt resumes and syllabi")
+    parser.add_argument("--live", action="store_true", help="call the real Gemini model")
+    args = parser.parse_args()
+
+    documents = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not documents:
+        print("No documents found")
+        sys.exit(1)
+    service = AIService() if args.live else make_stub_service()
+    mode = "live Gemini" if args.live else (
+        f"stub model ({BASE_LATENCY_SECONDS * 1000:.0f}ms + {MS_PER_1K_TOKENS:.0f}ms/1k tokens, tokens ~ chars/4)"
+    )
+    print(f"{len(documents)} documents, {mode}\n")
+    print(f"{'document':<22} {'chars':>7} {'tokens':>7} {'→ prepped':>10} {'saved':>6} "
+          f"{'prep ms':>8} {'time s':>7} {'→ prepped':>10}")
+
+    totals = [0, 0, 0.0, 0.0]
+    for name, kind, text in documents:
+        base_tokens, _, base_time = measure(service, kind, text, prepass=False, live=args.live)
+        prep_tokens, prep_ms, prep_time = measure(service, kind, text, prepass=True, live=args.live)
+        saved = 1 - prep_tokens / base_tokens
+        print(f"{name[:22]:<22} {len(text):>7} {base_tokens:>7} {prep_tokens:>10} {saved:>6.0%} "
+              f"{prep_ms:>8.1f} {base_time:>7.2f} {prep_time:>10.2f}")
+        totals[0] += base_tokens
+        totals[1] += prep_tokens
+        totals[2] += base_time
+        totals[3] += prep_time
+
+    print(f"\nTotal prompt tokens: {totals[0]} → {totals[1]} ({1 - totals[1] / totals[0]:.0%} fewer)")
+    print(f"Total extraction time: {totals[2]:.2f}s → {totals[3]:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Check that concurrent requests reloading shared in-process state do not hang
+Run from the backend directory: python scripts/check_concurrent_reloads.py
+
+Seeds a throwaway SQLite database, invalidates the in-process skill catalog
+and then has several coroutines on one event loop reload it at the same
+time: directly, through a cold load of every dashboard snapshot, and
+through resume uploads and gap analyses (against a stub AI service). Each
+scenario runs on an event loop in a separate thread, so a deadlock that
+blocks the loop is reported as a failure instead of hanging the script.
+The script exits non-zero if any scenario fails or does not finish within
+TIMEOUT_SECONDS.
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'concurrent_reloads.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+from sqlalchemy import delete, insert
+
+from app.database import AsyncSessionLocal, Base, SessionLocal, engine
+from app.models import AnalyticsSnapshot, Skill, User, UserProfile
+from app.routers.skills import process_resume, run_gap_analysis
+from app.services import registry
+from app.services.analytics_snapshots import ALL_SCOPE, read_snapshot
+from app.services.bulk_resumes import ingest_resumes
+from app.services.skill_gaps import reanalyze_skill_gaps
+from app.services.skill_catalog import get_skill_catalog, get_skill_catalog_async, invalidate_skill_catalog
+
+CONCURRENCY = 5
+TIMEOUT_SECONDS = 20
+CATALOG_SIZE = 200
+
+def seed_database():
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.execute(insert(Skill), [
+            {"name": f"Skill {n}", "domain": "AI" if n % 2 else "Web", "future_demand_score": float(n),
+             "trend_status": "emerging"}
+            for n in range(CATALOG_SIZE)
+        ])
+        db.add(User(id=1, email="student@college.example.edu", hashed_password="!", user_type="student"))
+        db.add(UserProfile(user_id=1, domain="AI", target_role="ML Engineer", current_skills=["Skill 1"]))
+        db.commit()
+
+class _StubAIService:
+    """Answers instantly, so the scenarios exercise only the database paths"""
+
+    @staticmethod
+    def _analysis(required_skills):
+        return {"missing_skills": required_skills[:3], "priority_skills_short_term": required_skills[:1],
+                "gap_score": 0.5, "recommendations": "Stub analysis"}
+
+    async def extract_skills_from_resume_async(self, resume_text):
+        return ["Skill 1", "Skill 3"]
+
+    async def extract_skills_from_resumes_batch_async(self, resume_texts, on_batch_done=None):
+        return [["Skill 1", "Skill 2"] for _ in resume_texts]
+
+    async def analyze_skill_gaps_async(self, current_skills, required_skills, target_role):
+        return self._analysis(required_skills)
+
+    async def analyze_skill_gaps_batch_async(self, profiles, required_skills, on_batch_done=None):
+        return [self._analysis(required_skills) for _ in profiles]
+
+async def catalog_reloads():
+    """Request handlers reloading the catalog after an invalidation"""
+    invalidate_skill_catalog()
+    catalogs = await asyncio.gather(*(get_skill_catalog_async() for _ in range(CONCURRENCY)))
+    assert all(len(catalog) == CATALOG_SIZE for catalog in catalogs)
+
+async def verified_catalog_reloads():
+    """The same with verify=True, which always checks the stored version"""
+    catalogs = await asyncio.gather(*(get_skill_catalog_async(verify=True) for _ in range(CONCURRENCY)))
+    assert all(len(catalog) == CATALOG_SIZE for catalog in catalogs)
+
+async def run_sync_reloads():
+    """Sync helpers inside AsyncSession.run_sync reloading through their sessions"""
+    async def reload():
+        async with AsyncSessionLocal() as session:
+            return await session.run_sync(lambda db: get_skill_catalog(db, verify=True))
+
+    invalidate_skill_catalog()
+    catalogs = await asyncio.gather(*(reload() for _ in range(CONCURRENCY)))
+    assert all(len(catalog) == CATALOG_SIZE for catalog in catalogs)
+
+async def cold_dashboard_load():
+    """Every dashboard snapshot recomputed at once, one session per request"""
+    with SessionLocal() as db:
+        db.execute(delete(AnalyticsSnapshot))
+        db.commit()
+    invalidate_skill_catalog()
+
+    async def read(kind: str, scope: str):
+        async with AsyncSessionLocal() as session:
+            return await read_snapshot(session, kind, scope)
+
+    payloads = await asyncio.gather(
+        read("skill_heatmap", ALL_SCOPE), read("skill_heatmap", "AI"),
+        read("trend_growth", ALL_SCOPE), read("trend_growth", "Web"),
+        read("employability_readiness", "1"), read("institution_readiness", "1")
+    )
+    assert len(payloads[0]["skills"]) == CATALOG_SIZE
+
+async def uploads_and_gap_analyses():
+    """Resume uploads, bulk ingest and gap analyses running at the same time"""
+    stub = registry._instances["ai"] = _StubAIService()
+    invalidate_skill_catalog()
+
+    async def in_session(fn, *args):
+        async with AsyncSessionLocal() as session:
+            return await fn(session, *args)
+
+    documents = [{"filename": f"resume_{n}.txt", "text": f"student{n}@college.example.edu Skill 2"}
+                 for n in range(CONCURRENCY)]
+    await asyncio.gather(
+        in_session(process_resume, "Skill 1 and Skill 3", "AI", "ML Engineer"),
+        *(in_session(run_gap_analysis) for _ in range(CONCURRENCY)),
+        in_session(ingest_resumes, stub, documents, "Web", "Web Developer"),
+        in_session(reanalyze_skill_gaps, stub)
+    )
+
+SCENARIOS = [catalog_reloads, verified_catalog_reloads, run_sync_reloads, cold_dashboard_load, uploads_and_gap_analyses]
+
+def run_with_timeout(scenario) -> str:
+    """None when the scenario passed, otherwise what went wrong"""
+    outcome = {}
+
+    def target():
+        try:
+            asyncio.run(scenario())
+            outcome["error"] = None
+        except Exception as e:
+            outcome["error"] = f"{type(e).__name__}: {e}"
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(TIMEOUT_SECONDS)
+    if thread.is_alive():
+        return f"still running after {TIMEOUT_SECONDS}s (deadlock)"
+    return outcome["error"]
+
+def main():
+    seed_database()
+    failures = 0
+    for scenario in SCENARIOS:
+        started = time.perf_counter()
+        error = run_with_timeout(scenario)
+        elapsed = (time.perf_counter() - started) * 1000
+        if error:
+            failures += 1
+            print(f"✗ {scenario.__name__}: {error}")
+            if "deadlock" in error:
+                break  # the stuck loop keeps its locks, so later scenarios would hang too
+        else:
+            print(f"✓ {scenario.__name__}: finished in {elapsed:.0f}ms")
+
+    if failures:
+        print(f"\n{failures} scenarios failed")
+        os._exit(1)  # a deadlocked thread would otherwise keep the process alive
+    print(f"\nAll {len(SCENARIOS)} scenarios passed")
+
+if __name__ == "__main__":
+    main()
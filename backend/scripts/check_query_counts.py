@@ -0,0 +1,137 @@
+"""
+Verify that the gap analysis endpoints run a constant number of SQL statements
+Run from the backend directory: python scripts/check_query_counts.py
+
+Seeds a throwaway SQLite database and calls POST /api/skills/analyze-gaps
+and POST /api/skills/analyze-gaps/batch against a stub AI service whose
+analyses report a growing number of missing skills (and, for the batch
+endpoint, cover a growing number of profiles). Statements are counted with
+a before_cursor_execute listener on both engines. The script exits non-zero
+if an endpoint's count changes with the gap or profile count.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'query_counts.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["AI_CACHE_ENABLED"] = "false"
+# Keep the periodic skill catalog version check out of the counts
+os.environ["SKILL_CATALOG_REFRESH_SECONDS"] = "3600"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+
+from app.database import Base, SessionLocal, async_engine, engine
+from app.models import Skill, User, UserProfile
+from app.services import registry
+from app.services.profile_skills import sync_profile_skills_many
+from app.services.skill_catalog import get_skill_catalog
+
+import main
+
+DOMAIN = "AI"
+CATALOG_SIZE = 60
+GAP_COUNTS = [1, 10, 50]
+PROFILE_COUNTS = [1, 10, 50]
+
+class _StubAIService:
+    """Reports the first `missing` required skills as gaps for every profile"""
+
+    def __init__(self):
+        self.missing = 1
+
+    def _analysis(self, required_skills):
+        missing = required_skills[:self.missing]
+        return {
+            "missing_skills": missing,
+            "priority_skills_short_term": missing[:len(missing) // 2],
+            "priority_skills_long_term": missing[len(missing) // 2:],
+            "gap_score": round(len(missing) / len(required_skills), 2),
+            "recommendations": "Stub analysis"
+        }
+
+    async def analyze_skill_gaps_async(self, current_skills, required_skills, target_role):
+        return self._analysis(required_skills)
+
+    async def analyze_skill_gaps_batch_async(self, profiles, required_skills, on_batch_done=None):
+        return [self._analysis(required_skills) for _ in profiles]
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+def seed_database(profiles: int):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        db.execute(insert(Skill), [
+            {"name": f"Skill {n}", "domain": DOMAIN, "future_demand_score": float(n)}
+            for n in range(CATALOG_SIZE)
+        ])
+        user_ids = db.execute(insert(User).returning(User.id), [
+            {"email": f"student{n}@college.example.edu", "hashed_password": "!", "user_type": "student"}
+            for n in range(profiles)
+        ]).scalars().all()
+        profile_ids = db.execute(insert(UserProfile).returning(UserProfile.id), [
+            {"user_id": user_id, "domain": DOMAIN, "target_role": "ML Engineer",
+             "current_skills": ["Skill 59", "Communication"]}
+            for user_id in user_ids
+        ]).scalars().all()
+        sync_profile_skills_many(db, {profile_id: ["Skill 59"] for profile_id in profile_ids}, get_skill_catalog(db))
+        db.commit()
+    finally:
+        db.close()
+
+def count_statements(client: TestClient, counter: StatementCounter, path: str, body=None) -> int:
+    # The first call warms the in-process skill catalog; the second is counted
+    for _ in range(2):
+        counter.count = 0
+        response = client.post(path, json=body)
+        response.raise_for_status()
+    return counter.count
+
+def main_check():
+    stub = registry._instances["ai"] = _StubAIService()
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    # Without a context manager the app's lifespan (and its background threads) does not start
+    client = TestClient(main.app)
+
+    counts = {"analyze-gaps by gap count": {}, "analyze-gaps/batch by profile and gap count": {}}
+    for profiles in PROFILE_COUNTS:
+        seed_database(profiles)
+        for missing in GAP_COUNTS:
+            stub.missing = missing
+            if profiles == PROFILE_COUNTS[0]:
+                counts["analyze-gaps by gap count"][missing] = count_statements(
+                    client, counter, "/api/skills/analyze-gaps"
+                )
+            counts["analyze-gaps/batch by profile and gap count"][(profiles, missing)] = count_statements(
+                client, counter, "/api/skills/analyze-gaps/batch", {}
+            )
+
+    failures = []
+    for name, by_size in counts.items():
+        constant = len(set(by_size.values())) == 1
+        print(f"{'✓' if constant else '✗'} {name}: " + ", ".join(
+            f"{size}={statements}" for size, statements in by_size.items()
+        ))
+        if not constant:
+            failures.append(name)
+
+    if failures:
+        print(f"\n{len(failures)} endpoints run more statements as the work grows")
+        sys.exit(1)
+    print("\nStatement counts are constant")
+
+if __name__ == "__main__":
+    main_check()
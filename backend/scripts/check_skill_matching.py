@@ -0,0 +1,91 @@
+"""
+Check the skill matcher and the document pre-pass against known resume and
+syllabus phrasings
+Run from the backend directory: python scripts/check_skill_matching.py
+
+Uses the built-in terms and aliases only, so no database is needed. The
+script exits non-zero if any phrase yields skills other than expected, or if
+the pre-pass keeps a contact line or drops a content line.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.document_prep import prepare_document
+from app.services.skill_matcher import DEFAULT_SKILLS, SKILL_ALIASES, SkillMatcher
+
+MATCHER_CASES = [
+    # Slash-separated lists
+    ("HTML/CSS/JavaScript", ["HTML", "CSS", "JavaScript"]),
+    ("Python/Django/Flask", ["Python", "Django", "Flask"]),
+    ("TensorFlow/PyTorch", ["TensorFlow", "PyTorch"]),
+    ("Java/Spring", ["Java"]),
+    ("Frontend (React/Vue)", ["React", "Vue"]),
+    ("AI/ML engineer", ["AI", "Machine Learning"]),
+    ("ReactJS/NodeJS", ["React", "Node.js"]),
+    ("C/C++ and C#", ["C++", "C#"]),
+    # Multi-part terms stay whole
+    ("Built CI/CD pipelines", ["CI/CD"]),
+    ("Node.js and Express", ["Node.js", "Express"]),
+    ("REST APIs with FastAPI", ["REST API", "FastAPI"]),
+    # Token boundaries
+    ("JavaScript developer", ["JavaScript"]),
+    ("Google ads, maintain servers", []),
+    ("Go and Rust", ["Go", "Rust"]),
+    ("Let's go", []),
+]
+
+# (line, whether the pre-pass treats it as contact details, candidate skills)
+PREP_CASES = [
+    ("Jane Doe | jane.doe@gmail.com | +91 98765 43210", True, []),
+    ("Phone: +1 (555) 123-4567", True, []),
+    ("Email: jane@python.org", True, []),
+    ("LinkedIn: linkedin.com/in/janedoe", True, []),
+    ("Portfolio: https://janedoe.github.io/projects", True, []),
+    # Year ranges, dates and tool names are not contact details
+    ("Software Engineer, Acme Corp (2019 - 2023): built Kafka pipelines in Scala", False, []),
+    ("Data Analyst, 06.2019 - 05.2023, Globex Corporation", False, []),
+    ("Built realtime chat with Socket.io and Redis", False, ["Redis"]),
+    ("Dashboards in Chart.js backed by ASP.NET services", False, []),
+    ("Contributed docs to python.org with Python and Git", False, ["Python", "Git"]),
+]
+
+def check_matcher(matcher: SkillMatcher) -> int:
+    failures = 0
+    for text, expected in MATCHER_CASES:
+        found = matcher.find(text)
+        ok = found == expected
+        print(f"{'✓' if ok else '✗'} {text!r}: {found}")
+        if not ok:
+            print(f"    expected {expected}")
+            failures += 1
+    return failures
+
+def check_prep(matcher: SkillMatcher) -> int:
+    failures = 0
+    for line, contact, expected in PREP_CASES:
+        prepared = prepare_document(line, matcher, min_chars=0)
+        dropped = line not in prepared.excerpt
+        ok = dropped == contact and prepared.candidates == expected
+        print(f"{'✓' if ok else '✗'} {line!r}: {'dropped' if dropped else 'kept'}, {prepared.candidates}")
+        if not ok:
+            print(f"    expected {'dropped' if contact else 'kept'}, {expected}")
+            failures += 1
+    return failures
+
+def main():
+    matcher = SkillMatcher(DEFAULT_SKILLS, SKILL_ALIASES)
+    print("Skill matcher:")
+    failures = check_matcher(matcher)
+    print("\nDocument pre-pass:")
+    failures += check_prep(matcher)
+
+    total = len(MATCHER_CASES) + len(PREP_CASES)
+    if failures:
+        print(f"\n{failures} of {total} cases failed")
+        sys.exit(1)
+    print(f"\nAll {total} cases passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Verify that the routers' hot queries can use an index on PostgreSQL
+Run against a migrated database: python scripts/explain_hot_queries.py
+
+Each query is EXPLAINed with sequential scans disabled, so the planner picks
+an index whenever one is usable even on small tables. The script exits
+non-zero if any plan still contains a sequential scan.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.database import engine
+from app.models import Curriculum, ProfileSkill, Roadmap, Skill, SkillGap, SkillTrend, UserProfile
+
+HOT_QUERIES = {
+    "trending (all domains)": select(Skill).order_by(Skill.future_demand_score.desc()).limit(20),
+    "trending by domain": select(Skill).where(Skill.domain == "AI")
+        .order_by(Skill.future_demand_score.desc()).limit(20),
+    "skills by trend status": select(Skill).where(Skill.trend_status.in_(["emerging", "high-growth"]))
+        .order_by(Skill.future_demand_score.desc()).limit(20),
+    "skills by domain": select(Skill).where(Skill.domain == "AI"),
+    "profile by user": select(UserProfile).where(UserProfile.user_id == 1).limit(1),
+    "gaps by profile": select(SkillGap).where(SkillGap.profile_id == 1),
+    "roadmaps by user": select(Roadmap).where(Roadmap.user_id == 1).order_by(Roadmap.id),
+    "curricula by institution": select(Curriculum).where(Curriculum.institution_id == 1)
+        .order_by(Curriculum.id),
+    "profiles with skill": select(ProfileSkill.profile_id).where(ProfileSkill.skill_id == 1),
+    "trend history range": select(SkillTrend).where(
+        SkillTrend.skill_id == 1,
+        SkillTrend.date >= datetime.now(timezone.utc) - timedelta(days=365)
+    ).order_by(SkillTrend.date),
+    "supply per skill": select(ProfileSkill.skill_id, func.count(ProfileSkill.profile_id))
+        .group_by(ProfileSkill.skill_id),
+}
+
+def main():
+    if engine.dialect.name != "postgresql":
+        print("This check needs PostgreSQL; set DATABASE_URL to a migrated database.")
+        sys.exit(2)
+
+    failures = []
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        for name, query in HOT_QUERIES.items():
+            sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            plan = "\n".join(row[0] for row in conn.execute(text(f"EXPLAIN {sql}")))
+            uses_index = "Seq Scan" not in plan
+            print(f"{'✓' if uses_index else '✗'} {name}")
+            if not uses_index:
+                failures.append(name)
+                print("    " + plan.replace("\n", "\n    "))
+
+    if failures:
+        print(f"\n{len(failures)} queries fall back to sequential scans")
+        sys.exit(1)
+    print("\nAll hot queries use an index")
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal, engine, Base
 from app.models import User, Skill
+# Mark dashboard snapshots and HTTP validators stale when this script changes their rows
+import app.services.analytics_snapshots  # noqa: F401
+import app.services.table_versions  # noqa: F401
+from app.migrations import run_migrations
 
 def init_database():
     """Initialize the database with required data"""
-    # Create all tables
+    # Create all tables and apply pending migrations
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     
     db = SessionLocal()
     
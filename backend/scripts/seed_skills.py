@@ -9,6 +9,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal
 from app.models import Skill
+# Mark dashboard snapshots and HTTP validators stale when this script changes their rows
+import app.services.analytics_snapshots  # noqa: F401
+import app.services.table_versions  # noqa: F401
 from app.services.trends_service import TrendsService
 
 def seed_skills():
@@ -77,30 +80,27 @@ def seed_skills():
     all_skills = db.query(Skill).all()
     skill_names = [s.name for s in all_skills]
     
-    # Get trends for all skills (in batches to avoid rate limits)
-    batch_size = 5
-    for i in range(0, len(skill_names), batch_size):
-        batch = skill_names[i:i+batch_size]
-        print(f"Processing batch {i//batch_size + 1}...")
+    # Fetch trends for the whole catalog; the service packs several skills into
+    # each payload and throttles requests itself
+    try:
+        trend_analyses = trends_service.analyze_multiple_skills(skill_names)
+        skills_by_name = {s.name: s for s in all_skills}
         
-        try:
-            trend_analyses = trends_service.analyze_multiple_skills(batch)
-            
-            for analysis in trend_analyses:
-                skill = db.query(Skill).filter(Skill.name == analysis["skill"]).first()
-                if skill:
-                    skill.current_demand_score = analysis["current_demand"]
-                    skill.future_demand_score = analysis["forecasts"]["forecast_1y"]
-                    skill.trend_status = analysis["trend_status"]
-                    skill.google_trends_score = analysis["current_demand"]
-                    skill.forecast_6m = analysis["forecasts"]["forecast_6m"]
-                    skill.forecast_1y = analysis["forecasts"]["forecast_1y"]
-                    skill.forecast_3y = analysis["forecasts"]["forecast_3y"]
-            
-            db.commit()
-        except Exception as e:
-            print(f"Error processing batch: {e}")
-            continue
+        for analysis in trend_analyses:
+            skill = skills_by_name.get(analysis["skill"])
+            if skill:
+                skill.current_demand_score = analysis["current_demand"]
+                skill.future_demand_score = analysis["forecasts"]["forecast_1y"]
+                skill.trend_status = analysis["trend_status"]
+                skill.google_trends_score = analysis["current_demand"]
+                skill.forecast_6m = analysis["forecasts"]["forecast_6m"]
+                skill.forecast_1y = analysis["forecasts"]["forecast_1y"]
+                skill.forecast_3y = analysis["forecasts"]["forecast_3y"]
+        
+        db.commit()
+    except Exception as e:
+        print(f"Error updating trend data: {e}")
+        db.rollback()
     
     print("Trend data updated!")
     db.close()
@@ -17,6 +17,50 @@ export default api
 
 // Auth API removed for now
 
+// Jobs API - long AI analyses run as background jobs that are polled until done
+export const jobsAPI = {
+  get: (jobId: string) => api.get(`/api/jobs/${jobId}`),
+  eventsUrl: (jobId: string) => `${API_URL}/api/jobs/${jobId}/events`,
+}
+
+// Job polling starts fast and backs off for long jobs (e.g. bulk cohort uploads)
+const JOB_POLL_INITIAL_MS = 1000
+const JOB_POLL_MAX_INTERVAL_MS = 10000
+const JOB_MAX_WAIT_MS = 30 * 60 * 1000
+
+// Submit a request with ?background=true and resolve with the job result in
+// place of the response body, so callers keep using response.data
+const runAsJob = async (request: Promise<any>) => {
+  const { data: job } = await request
+  const deadline = Date.now() + JOB_MAX_WAIT_MS
+  let interval = JOB_POLL_INITIAL_MS
+  while (true) {
+    const { data } = await jobsAPI.get(job.job_id)
+    if (data.status === 'succeeded') return { data: data.result }
+    if (data.status === 'failed') {
+      throw { response: { data: { detail: data.error || 'Job failed' } } }
+    }
+    if (Date.now() + interval > deadline) {
+      throw { response: { data: { detail: 'Job is taking too long; check back later' } } }
+    }
+    await new Promise((resolve) => setTimeout(resolve, interval))
+    interval = Math.min(interval * 1.5, JOB_POLL_MAX_INTERVAL_MS)
+  }
+}
+
+// Fetch every page of a keyset-paginated list endpoint by following the
+// X-Next-Cursor header, resolving with all items as response.data
+const getAllPages = async (url: string, params: Record<string, any> = {}) => {
+  const items: any[] = []
+  let cursor: string | undefined
+  do {
+    const response = await api.get(url, { params: { ...params, cursor } })
+    items.push(...response.data)
+    cursor = response.headers['x-next-cursor']
+  } while (cursor)
+  return { data: items }
+}
+
 // Skills API
 export const skillsAPI = {
   uploadResume: (file: File, domain?: string, target_role?: string) => {
@@ -24,11 +68,20 @@ export const skillsAPI = {
     formData.append('file', file)
     if (domain) formData.append('domain', domain)
     if (target_role) formData.append('target_role', target_role)
-    return api.post('/api/skills/upload-resume', formData, {
+    return runAsJob(api.post('/api/skills/upload-resume', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+      params: { background: true },
+    }))
+  },
+  uploadResumes: (files: File[], domain?: string, target_role?: string) => {
+    const formData = new FormData()
+    files.forEach((file) => formData.append('files', file))
+    return runAsJob(api.post('/api/skills/upload-resumes', formData, {
       headers: { 'Content-Type': 'multipart/form-data' },
-    })
+      params: { domain, target_role, background: true },
+    }))
   },
-  analyzeGaps: () => api.post('/api/skills/analyze-gaps'),
+  analyzeGaps: () => runAsJob(api.post('/api/skills/analyze-gaps', null, { params: { background: true } })),
   getTrending: (domain?: string, limit?: number) =>
     api.get('/api/skills/trending', { params: { domain, limit } }),
   getForecast: (skillName: string) =>
@@ -38,8 +91,8 @@ export const skillsAPI = {
 // Roadmaps API
 export const roadmapsAPI = {
   generate: (data: { target_role: string; target_timeline_months: number; domain?: string }) =>
-    api.post('/api/roadmaps/generate', data),
-  getAll: () => api.get('/api/roadmaps/'),
+    runAsJob(api.post('/api/roadmaps/generate', data, { params: { background: true } })),
+  getAll: () => getAllPages('/api/roadmaps/'),
   getById: (id: number) => api.get(`/api/roadmaps/${id}`),
 }
 
@@ -51,11 +104,12 @@ export const curriculumAPI = {
     if (program) formData.append('program', program)
     if (file) formData.append('file', file)
     if (curriculum_text) formData.append('curriculum_text', curriculum_text)
-    return api.post('/api/curriculum/upload', formData, {
+    return runAsJob(api.post('/api/curriculum/upload', formData, {
       headers: { 'Content-Type': 'multipart/form-data' },
-    })
+      params: { background: true },
+    }))
   },
-  getAll: () => api.get('/api/curriculum/'),
+  getAll: () => getAllPages('/api/curriculum/'),
   getById: (id: number) => api.get(`/api/curriculum/${id}`),
   analyze: (id: number) => api.post(`/api/curriculum/${id}/analyze`),
 }